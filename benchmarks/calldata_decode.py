@@ -0,0 +1,115 @@
+"""
+Compares the throughput of calldata.decode with the previous recursive,
+reslicing implementation.
+
+Run with: python benchmarks/calldata_decode.py
+"""
+
+import time
+from genlayer_py.abi import calldata
+from genlayer_py.abi.calldata import consts
+from genlayer_py.types import CalldataAddress
+from genlayer_py.exceptions import GenLayerError
+
+
+def legacy_decode(mem0):
+    mem = memoryview(mem0)
+
+    def read_uleb128():
+        nonlocal mem
+        ret = 0
+        off = 0
+        while True:
+            m = mem[0]
+            ret = ret | ((m & 0x7F) << off)
+            off += 7
+            mem = mem[1:]
+            if (m & 0x80) == 0:
+                break
+        return ret
+
+    def impl():
+        nonlocal mem
+        code = read_uleb128()
+        typ = code & 0x7
+        if typ == consts.TYPE_SPECIAL:
+            if code == consts.SPECIAL_NULL:
+                return None
+            if code == consts.SPECIAL_FALSE:
+                return False
+            if code == consts.SPECIAL_TRUE:
+                return True
+            if code == consts.SPECIAL_ADDR:
+                ret_addr = mem[: CalldataAddress.SIZE]
+                mem = mem[CalldataAddress.SIZE :]
+                return CalldataAddress(ret_addr)
+            raise GenLayerError(f"Unknown special {bin(code)} {hex(code)}")
+        code = code >> 3
+        if typ == consts.TYPE_PINT:
+            return code
+        elif typ == consts.TYPE_NINT:
+            return -code - 1
+        elif typ == consts.TYPE_BYTES:
+            ret_bytes = mem[:code]
+            mem = mem[code:]
+            return ret_bytes
+        elif typ == consts.TYPE_STR:
+            ret_str = mem[:code]
+            mem = mem[code:]
+            return str(ret_str, encoding="utf-8")
+        elif typ == consts.TYPE_ARR:
+            return [impl() for _i in range(code)]
+        elif typ == consts.TYPE_MAP:
+            ret_dict = {}
+            for _i in range(code):
+                le = read_uleb128()
+                key = str(mem[:le], encoding="utf-8")
+                mem = mem[le:]
+                ret_dict[key] = impl()
+            return ret_dict
+        raise GenLayerError(f"invalid type {typ}")
+
+    res = impl()
+    if len(mem) != 0:
+        raise GenLayerError("unparsed end")
+    return res
+
+
+def make_receipt_like_payload(entries: int):
+    return {
+        "eq_outputs": {
+            f"{i:05}": {
+                "status": "return",
+                "payload": "x" * 64,
+                "raw": b"\x01" * 48,
+                "votes": [i, -i, 2**70 + i, True, None],
+            }
+            for i in range(entries)
+        },
+        "validators": [CalldataAddress(bytes([i % 256]) * 20) for i in range(entries)],
+    }
+
+
+def measure(fn, data: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - start)
+    return len(data) / best / 1e6
+
+
+def main():
+    for entries in (100, 1_000, 5_000):
+        data = calldata.encode(make_receipt_like_payload(entries))
+        assert calldata.decode(data) == legacy_decode(data)
+        legacy = measure(legacy_decode, data, repeat=5)
+        current = measure(calldata.decode, data, repeat=5)
+        print(
+            f"{len(data) / 1024:9.1f} KiB  legacy {legacy:7.2f} MB/s  "
+            f"current {current:7.2f} MB/s  x{current / legacy:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
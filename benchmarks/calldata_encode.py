@@ -0,0 +1,147 @@
+"""
+Compares calldata.encode with the previous isinstance-chain encoder on
+method-call objects built by make_calldata_object, and shows encode_into
+reusing one buffer, then compares encoding call envelopes with
+calldata.prepare_call.
+
+Run with: python benchmarks/calldata_encode.py
+"""
+
+import dataclasses
+import timeit
+from collections.abc import Mapping, Sequence
+from genlayer_py.abi import calldata
+from genlayer_py.abi.calldata import consts
+from genlayer_py.contracts.actions import make_calldata_object
+from genlayer_py.types import CalldataAddress
+
+
+def legacy_encode(x) -> bytes:
+    mem = bytearray()
+
+    def append_uleb128(i):
+        if i == 0:
+            mem.append(0)
+        while i > 0:
+            cur = i & 0x7F
+            i = i >> 7
+            if i > 0:
+                cur |= 0x80
+            mem.append(cur)
+
+    def impl_dict(b):
+        keys = list(b.keys())
+        keys.sort()
+        append_uleb128((len(keys) << 3) | consts.TYPE_MAP)
+        for k in keys:
+            bts = k.encode("utf-8")
+            append_uleb128(len(bts))
+            mem.extend(bts)
+            impl(b[k])
+
+    def impl(b):
+        if b is None:
+            mem.append(consts.SPECIAL_NULL)
+        elif b is True:
+            mem.append(consts.SPECIAL_TRUE)
+        elif b is False:
+            mem.append(consts.SPECIAL_FALSE)
+        elif isinstance(b, int):
+            if b >= 0:
+                append_uleb128((b << 3) | consts.TYPE_PINT)
+            else:
+                append_uleb128(((-b - 1) << 3) | consts.TYPE_NINT)
+        elif isinstance(b, CalldataAddress):
+            mem.append(consts.SPECIAL_ADDR)
+            mem.extend(b.as_bytes)
+        elif isinstance(b, bytes):
+            append_uleb128((len(b) << 3) | consts.TYPE_BYTES)
+            mem.extend(b)
+        elif isinstance(b, str):
+            b = b.encode("utf-8")
+            append_uleb128((len(b) << 3) | consts.TYPE_STR)
+            mem.extend(b)
+        elif isinstance(b, Sequence):
+            append_uleb128((len(b) << 3) | consts.TYPE_ARR)
+            for x in b:
+                impl(x)
+        elif isinstance(b, Mapping):
+            impl_dict(b)
+        elif dataclasses.is_dataclass(b):
+            impl_dict(dataclasses.asdict(b))
+
+    impl(x)
+    return bytes(mem)
+
+
+@dataclasses.dataclass
+class Order:
+    owner: CalldataAddress
+    amount: int
+    price: int
+    memo: str
+    tags: list
+
+
+ADDRESS = CalldataAddress(bytes(range(20)))
+
+CASES = {
+    "no args": make_calldata_object(method="get_storage"),
+    "scalars": make_calldata_object(
+        method="transfer", args=[ADDRESS, 10**20], kwargs={"memo": "hello"}
+    ),
+    "dataclasses": make_calldata_object(
+        method="submit_orders",
+        args=[
+            [Order(ADDRESS, i, 2**200 + i, f"order {i}", ["a", "b"]) for i in range(50)]
+        ],
+    ),
+    "large map": make_calldata_object(
+        method="update",
+        args=[{f"key_{i:04}": [i, -i, "v" * 16, b"\x00" * 8] for i in range(1000)}],
+    ),
+}
+
+
+def main():
+    buffer = bytearray(1 << 20)
+    for name, obj in CASES.items():
+        assert calldata.encode(obj) == legacy_encode(obj)
+        number = 20 if name == "large map" else 2_000
+        results = []
+        for fn in (
+            lambda: legacy_encode(obj),
+            lambda: calldata.encode(obj),
+            lambda: calldata.encode_into(obj, buffer),
+        ):
+            results.append(min(timeit.repeat(fn, number=number, repeat=5)) / number)
+        legacy, current, into = results
+        print(
+            f"{name:>12}  legacy {legacy * 1e6:9.2f} us  encode {current * 1e6:9.2f} us"
+            f"  encode_into {into * 1e6:9.2f} us  x{legacy / current:.2f}"
+        )
+
+    calls = [("transfer", [ADDRESS, 10**20], {"memo": "hello"}), ("get", [1], None)]
+    for method, args, kwargs in calls:
+        plain = min(
+            timeit.repeat(
+                lambda: calldata.encode(make_calldata_object(method, args, kwargs)),
+                number=20_000,
+                repeat=5,
+            )
+        )
+        prepared = min(
+            timeit.repeat(
+                lambda: calldata.prepare_call(method).encode(args, kwargs),
+                number=20_000,
+                repeat=5,
+            )
+        )
+        print(
+            f"{method:>12}  envelope {plain / 20_000 * 1e6:7.2f} us"
+            f"  prepared {prepared / 20_000 * 1e6:7.2f} us  x{plain / prepared:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compares encoding and decoding large integer arrays as python lists with
+the vectorized paths for array.array and numpy arrays.
+
+Run with: python benchmarks/calldata_numpy.py
+"""
+
+import array
+import random
+import timeit
+from genlayer_py.abi import calldata
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def make_series(size: int, bits: int) -> list:
+    rng = random.Random(size + bits)
+    return [rng.randrange(-(1 << bits), 1 << bits) for _ in range(size)]
+
+
+CASES = {
+    "ids (7 bit)": make_series(100_000, 3),
+    "prices (40 bit)": make_series(100_000, 40),
+}
+
+
+def best(fn, number: int = 5) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main():
+    for name, values in CASES.items():
+        encoded = calldata.encode(values)
+        arr = array.array("q", values)
+        assert calldata.encode(arr) == encoded
+        timings = {
+            "list": best(lambda: calldata.encode(values)),
+            "array.array": best(lambda: calldata.encode(arr)),
+        }
+        if np is not None:
+            nd = np.array(values, dtype=np.int64)
+            assert calldata.encode(nd) == encoded
+            timings["numpy"] = best(lambda: calldata.encode(nd))
+        print(
+            f"{name:>16}  encode  "
+            + "  ".join(f"{k} {v * 1e3:8.2f} ms" for k, v in timings.items())
+        )
+        timings = {"list": best(lambda: calldata.decode(encoded))}
+        if np is not None:
+            timings["numpy"] = best(lambda: calldata.decode(encoded, numpy_arrays=True))
+        print(
+            f"{name:>16}  decode  "
+            + "  ".join(f"{k} {v * 1e3:8.2f} ms" for k, v in timings.items())
+        )
+
+
+if __name__ == "__main__":
+    main()
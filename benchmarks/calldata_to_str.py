@@ -0,0 +1,33 @@
+"""
+Compares rendering calldata in the readable notation with decode + to_str
+against the single-pass decode_to_str transcoder.
+
+Run with: python benchmarks/calldata_to_str.py
+"""
+
+import timeit
+from genlayer_py.abi import calldata
+from calldata_decode import make_receipt_like_payload
+
+
+def two_pass(data: bytes) -> str:
+    return calldata.to_str(calldata.decode(data))
+
+
+def main():
+    for entries in (10, 1_000, 5_000):
+        data = calldata.encode(make_receipt_like_payload(entries))
+        assert two_pass(data) == calldata.decode_to_str(data)
+        number = max(1, 20_000 // entries)
+        old = min(timeit.repeat(lambda: two_pass(data), number=number, repeat=5))
+        new = min(
+            timeit.repeat(lambda: calldata.decode_to_str(data), number=number, repeat=5)
+        )
+        print(
+            f"{len(data) / 1024:9.1f} KiB  decode+to_str {old / number * 1e3:8.2f} ms"
+            f"  decode_to_str {new / number * 1e3:8.2f} ms  x{old / new:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Microbenchmark for calldata integer encoding and decoding, comparing the
+chunked ULEB128 implementation with the previous 7-bits-at-a-time loops
+for TYPE_PINT and TYPE_NINT values.
+
+Run with: python benchmarks/calldata_uleb128.py
+"""
+
+import random
+import timeit
+from genlayer_py.abi.calldata import consts
+from genlayer_py.abi.calldata.uleb128 import append_uleb128, read_uleb128
+
+
+def legacy_encode_int(b: int) -> bytes:
+    mem = bytearray()
+    b = (b << 3) | consts.TYPE_PINT if b >= 0 else ((-b - 1) << 3) | consts.TYPE_NINT
+    if b == 0:
+        mem.append(0)
+    while b > 0:
+        cur = b & 0x7F
+        b = b >> 7
+        if b > 0:
+            cur |= 0x80
+        mem.append(cur)
+    return bytes(mem)
+
+
+def legacy_decode_int(mem: bytes) -> int:
+    ret = 0
+    off = 0
+    for m in mem:
+        ret = ret | ((m & 0x7F) << off)
+        off += 7
+        if (m & 0x80) == 0:
+            break
+    code = ret >> 3
+    return code if ret & 0x7 == consts.TYPE_PINT else -code - 1
+
+
+def encode_int(b: int) -> bytes:
+    mem = bytearray()
+    if b >= 0:
+        append_uleb128(mem, (b << 3) | consts.TYPE_PINT)
+    else:
+        append_uleb128(mem, ((-b - 1) << 3) | consts.TYPE_NINT)
+    return bytes(mem)
+
+
+def decode_int(mem: bytes) -> int:
+    ret, _pos = read_uleb128(mem, 0)
+    code = ret >> 3
+    return code if ret & 0x7 == consts.TYPE_PINT else -code - 1
+
+
+CASES = {
+    "small": [random.randrange(0, 1000) for _ in range(100)],
+    "-small": [random.randrange(-1000, 0) for _ in range(100)],
+    "u64": [random.getrandbits(64) for _ in range(100)],
+    "u256": [random.getrandbits(256) for _ in range(100)],
+    "-u256": [-random.getrandbits(256) for _ in range(100)],
+    "4 kbit": [random.getrandbits(4096) for _ in range(10)],
+    "-4 kbit": [-random.getrandbits(4096) for _ in range(10)],
+    "64 kbit": [random.getrandbits(65536) for _ in range(2)],
+}
+
+
+def bench(fn, values, number: int) -> float:
+    return min(
+        timeit.repeat(lambda: [fn(v) for v in values], number=number, repeat=5)
+    ) / (number * len(values))
+
+
+def main():
+    for name, values in CASES.items():
+        encoded = [encode_int(v) for v in values]
+        assert encoded == [legacy_encode_int(v) for v in values]
+        assert [decode_int(e) for e in encoded] == values
+        number = 200 if name != "64 kbit" else 2
+        enc_old = bench(legacy_encode_int, values, number)
+        enc_new = bench(encode_int, values, number)
+        dec_old = bench(legacy_decode_int, encoded, number)
+        dec_new = bench(decode_int, encoded, number)
+        print(
+            f"{name:>8}  encode {enc_old * 1e6:9.2f} -> {enc_new * 1e6:9.2f} us"
+            f"  decode {dec_old * 1e6:9.2f} -> {dec_new * 1e6:9.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compares JSON-RPC requests per second against a local keep-alive server
+when every call goes through requests.post, as GenLayerProvider did before,
+and through the pooled GenLayerProvider, from one and from several threads.
+
+Run with: python benchmarks/provider_http.py
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from genlayer_py.config.provider import ProviderConfig
+from genlayer_py.provider import GenLayerProvider
+
+CALLS = 1000
+THREADS = 8
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        data = json.dumps({"jsonrpc": "2.0", "id": payload["id"], "result": "0x1"})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+def legacy_request(url: str, method: str, params: list) -> dict:
+    payload = {
+        "jsonrpc": "2.0",
+        "id": int(time.time() * 1000),
+        "method": method,
+        "params": params,
+    }
+    response = requests.post(
+        url, json=payload, headers={"Content-Type": "application/json"}
+    )
+    return response.json()
+
+
+def rate(call, threads: int) -> float:
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(CALLS):
+            call()
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            for _ in pool.map(lambda _: call(), range(CALLS)):
+                pass
+    return CALLS / (time.perf_counter() - start)
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    provider = GenLayerProvider(
+        url,
+        ProviderConfig(
+            pool_size=THREADS, keep_alive=True, connect_timeout=5, read_timeout=5
+        ),
+    )
+    for threads in (1, THREADS):
+        legacy = rate(lambda: legacy_request(url, "eth_blockNumber", []), threads)
+        pooled = rate(lambda: provider.make_request("eth_blockNumber", []), threads)
+        print(
+            f"{threads:>2} thread(s)  requests.post {legacy:8.0f} req/s"
+            f"  pooled {pooled:8.0f} req/s  x{pooled / legacy:.2f}"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Compares fetching a large transaction receipt, shaped like a localnet
+eth_getTransactionByHash result with several validator receipts in its
+consensus_data, through requests' json= and response.json(), as
+GenLayerProvider did before, and through GenLayerProvider with the
+standard library and the orjson codecs, with and without gzip.
+
+The receipt is generated with a fixed seed rather than recorded, so the
+benchmark does not depend on a running network.
+
+Run with: python benchmarks/provider_json.py
+"""
+
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from genlayer_py.config.provider import ProviderConfig
+from genlayer_py.provider import GenLayerProvider, JsonCodec, OrjsonCodec, has_orjson
+
+CALLS = 20
+VALIDATORS = 100
+
+
+def make_receipt(seed: int = 1) -> dict:
+    rng = random.Random(seed)
+
+    def blob(size: int) -> str:
+        return base64.b64encode(rng.randbytes(size)).decode()
+
+    def hex_string(size: int) -> str:
+        return "0x" + rng.randbytes(size).hex()
+
+    def receipt() -> dict:
+        return {
+            "calldata": blob(2048),
+            "result": blob(4096),
+            "eq_outputs": {str(i): blob(512) for i in range(8)},
+            "gas_used": rng.randrange(1 << 40),
+            "mode": "validator",
+            "vote": rng.choice(["agree", "disagree"]),
+            "node_config": {
+                "address": hex_string(20),
+                "stake": rng.randrange(1 << 60),
+                "model": "gpt-4o",
+                "provider": "openai",
+                "config": {"temperature": 0.75, "max_tokens": 500},
+            },
+            "genvm_result": {
+                "stdout": "".join(rng.choice("abcdef \n") for _ in range(4096)),
+                "stderr": "",
+            },
+        }
+
+    return {
+        "hash": hex_string(32),
+        "status": "FINALIZED",
+        "from_address": hex_string(20),
+        "to_address": hex_string(20),
+        "data": {"calldata": blob(4096)},
+        "consensus_data": {
+            "votes": {hex_string(20): "agree" for _ in range(VALIDATORS)},
+            "leader_receipt": [receipt()],
+            "validators": [receipt() for _ in range(VALIDATORS)],
+        },
+        "created_at": "2025-01-01T00:00:00.000000+00:00",
+    }
+
+
+def make_handler(body: bytes, gzipped: bytes):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            compress = "gzip" in self.headers.get("Accept-Encoding", "")
+            data = gzipped if compress else body
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            if compress:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def legacy_request(session: requests.Session, url: str, compress: bool) -> dict:
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "eth_getTransactionByHash",
+        "params": ["0x01"],
+    }
+    headers = {"Content-Type": "application/json"}
+    if not compress:
+        headers["Accept-Encoding"] = "identity"
+    return session.post(url, json=payload, headers=headers).json()
+
+
+def per_call(call) -> float:
+    call()
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        call()
+    return (time.perf_counter() - start) / CALLS * 1000
+
+
+def main():
+    body = json.dumps({"jsonrpc": "2.0", "id": 1, "result": make_receipt()}).encode()
+    gzipped = gzip.compress(body, 6)
+    print(f"receipt: {len(body) / 1e6:.2f} MB, gzipped {len(gzipped) / 1e6:.2f} MB")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(body, gzipped))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    codecs = [JsonCodec()] + ([OrjsonCodec()] if has_orjson() else [])
+    for codec in codecs:
+        print(
+            f"decode only  {codec.name:<7} {per_call(lambda: codec.loads(body)):7.2f} ms"
+        )
+
+    session = requests.Session()
+    for compress in (False, True):
+        label = "gzip" if compress else "identity"
+        legacy = per_call(lambda: legacy_request(session, url, compress))
+        print(f"{label:<9} requests json=   {legacy:7.2f} ms")
+        for codec in codecs:
+            provider = GenLayerProvider(
+                url,
+                ProviderConfig(
+                    pool_size=1,
+                    keep_alive=True,
+                    connect_timeout=5,
+                    read_timeout=30,
+                    compression=compress,
+                ),
+                codec=codec,
+            )
+            lean = per_call(
+                lambda: provider.make_request("eth_getTransactionByHash", ["0x01"])
+            )
+            print(
+                f"{label:<9} provider {codec.name:<7} {lean:7.2f} ms"
+                f"  x{legacy / lean:.2f}"
+            )
+            provider.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Compares wait_for_transaction_receipt polling every interval, as it did
+before, with polling that starts at poll_interval and backs off up to the
+interval, against a local server whose transactions are accepted at random
+times between 50 ms and 2 s after they are first asked about.
+
+Reports the confirmation latency, from acceptance to the receipt being
+returned, and the polls per transaction.
+
+Run with: python benchmarks/wait_receipt.py
+"""
+
+import dataclasses
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from genlayer_py.chains import localnet
+from genlayer_py.client import GenLayerClient
+from genlayer_py.config import transaction_config
+
+TRANSACTIONS = 40
+INTERVAL = 1000  # ms
+
+
+class Network:
+    def __init__(self, seed: int = 1) -> None:
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.accepted_at = {}
+        self.polls = {}
+
+    def status(self, tx_hash: str) -> str:
+        with self.lock:
+            if tx_hash not in self.accepted_at:
+                delay = self.rng.uniform(0.05, 2.0)
+                self.accepted_at[tx_hash] = time.monotonic() + delay
+            self.polls[tx_hash] = self.polls.get(tx_hash, 0) + 1
+            accepted = time.monotonic() >= self.accepted_at[tx_hash]
+        return "ACCEPTED" if accepted else "PENDING"
+
+
+def make_handler(network: Network):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            tx_hash = payload["params"][0]
+            result = {"hash": tx_hash, "status": network.status(tx_hash)}
+            data = json.dumps({"jsonrpc": "2.0", "id": payload["id"], "result": result})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data.encode())
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def run(label: str, poll_interval: int, poll_backoff: float) -> None:
+    network = Network()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(network))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    chain = dataclasses.replace(
+        localnet,
+        rpc_urls={"default": {"http": [f"http://127.0.0.1:{server.server_port}"]}},
+    )
+    client = GenLayerClient(chain)
+    transaction_config.poll_interval = poll_interval
+    transaction_config.poll_backoff = poll_backoff
+
+    def wait(i: int) -> float:
+        tx_hash = f"0x{i:064x}"
+        client.wait_for_transaction_receipt(tx_hash, interval=INTERVAL, timeout=30)
+        return time.monotonic() - network.accepted_at[tx_hash]
+
+    with ThreadPoolExecutor(TRANSACTIONS) as executor:
+        latencies = sorted(executor.map(wait, range(TRANSACTIONS)))
+    polls = statistics.mean(network.polls.values())
+    print(
+        f"{label:<9} latency p50 {statistics.median(latencies) * 1000:6.0f} ms"
+        f"  p95 {latencies[int(0.95 * len(latencies))] * 1000:6.0f} ms"
+        f"  polls/tx {polls:5.1f}"
+    )
+    client.provider.close()
+    server.shutdown()
+
+
+def main():
+    defaults = (transaction_config.poll_interval, transaction_config.poll_backoff)
+    run("fixed", INTERVAL, 1.0)
+    run("adaptive", *defaults)
+    transaction_config.poll_interval, transaction_config.poll_backoff = defaults
+
+
+if __name__ == "__main__":
+    main()
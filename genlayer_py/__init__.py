@@ -1,3 +1,3 @@
-from genlayer_py.client import create_client
+from genlayer_py.client import create_client, create_async_client
 from genlayer_py.accounts import create_account, generate_private_key
 from genlayer_py.chains import *
@@ -1,3 +1,10 @@
-from .encoder import encode
+from .encoder import encode, encode_into, encoded_size
 from .decoder import decode
-from .string import to_str
+from .string import to_str, decode_to_str
+from .lazy import CalldataView, CalldataMapView, CalldataSequenceView
+from .stream import CalldataEvent, CalldataStreamParser, iter_events, verify
+from .registry import register_type, from_calldata
+from .vector import has_numpy
+from .batch import encode_many, decode_many
+from .prepared import PreparedCall, prepare_call
+from .cache import cache_info, set_cache_size, clear_caches
@@ -0,0 +1,140 @@
+import itertools
+import os
+from collections import deque
+from collections.abc import Buffer
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional
+from genlayer_py.types import CalldataEncodable
+from genlayer_py.exceptions import GenLayerError
+from .encoder import Parts, _encode_value
+from .decoder import _prepare, check_end, decode_at
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def encode_many(
+    values: Iterable[CalldataEncodable],
+    *,
+    processes: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Encodes every value of ``values`` and yields the results in order.
+
+    Without ``processes`` or ``executor`` the values are encoded in the
+    calling process. Otherwise they are sent to a process pool in chunks of
+    ``chunk_size``, only a few chunks are in flight at a time so that large
+    inputs are never held in memory at once. ``processes`` starts a pool for
+    the duration of the iteration, ``executor`` reuses an existing one.
+    """
+    if processes is None and executor is None:
+        return _encode_serial(values)
+    return _run_chunked(_encode_chunk, (), values, processes, executor, chunk_size)
+
+
+def decode_many(
+    buffers: Iterable[Buffer],
+    *,
+    processes: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_depth: Optional[int] = None,
+    max_size: Optional[int] = None,
+) -> Iterator[CalldataEncodable]:
+    """
+    Decodes every buffer of ``buffers`` and yields the results in order, see
+    ``encode_many`` for ``processes``, ``executor`` and ``chunk_size``.
+
+    Results decoded in a process pool hold byte strings as ``bytes`` rather
+    than as views into the input, since views can not be sent between
+    processes.
+    """
+    if processes is None and executor is None:
+        return _decode_serial(buffers, max_depth, max_size)
+    chunks = (b if type(b) is bytes else bytes(b) for b in buffers)
+    return _run_chunked(
+        _decode_chunk, (max_depth, max_size), chunks, processes, executor, chunk_size
+    )
+
+
+def _encode_serial(values: Iterable[CalldataEncodable]) -> Iterator[bytes]:
+    encode_value = _encode_value
+    join = b"".join
+    for x in values:
+        parts: Parts = []
+        encode_value(parts, x)
+        yield join(parts)
+
+
+def _decode_serial(
+    buffers: Iterable[Buffer], max_depth: Optional[int], max_size: Optional[int]
+) -> Iterator[CalldataEncodable]:
+    for b in buffers:
+        mem, data = _prepare(b, max_size)
+        res, pos = decode_at(mem, data, 0, max_depth=max_depth)
+        check_end(mem, pos, res)
+        yield res
+
+
+def _encode_chunk(values: List[CalldataEncodable]) -> List[bytes]:
+    return list(_encode_serial(values))
+
+
+def _decode_chunk(
+    buffers: List[bytes], max_depth: Optional[int], max_size: Optional[int]
+) -> List[CalldataEncodable]:
+    res = []
+    for data in buffers:
+        _prepare(data, max_size)
+        # slicing bytes instead of a memoryview makes byte strings picklable
+        value, pos = decode_at(data, data, 0, max_depth=max_depth)  # type: ignore
+        check_end(data, pos, value)  # type: ignore
+        res.append(value)
+    return res
+
+
+def _run_chunked(
+    fn: Callable[..., List[Any]],
+    args: tuple,
+    items: Iterable[Any],
+    processes: Optional[int],
+    executor: Optional[Executor],
+    chunk_size: int,
+) -> Iterator[Any]:
+    if processes is not None and executor is not None:
+        raise GenLayerError("pass either processes or executor, not both")
+    if chunk_size < 1:
+        raise GenLayerError(f"chunk_size must be positive, got {chunk_size}")
+    return _iter_chunked(fn, args, iter(items), processes, executor, chunk_size)
+
+
+def _iter_chunked(
+    fn: Callable[..., List[Any]],
+    args: tuple,
+    items: Iterator[Any],
+    processes: Optional[int],
+    executor: Optional[Executor],
+    chunk_size: int,
+) -> Iterator[Any]:
+    workers = processes or os.cpu_count() or 1
+    owned = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    pending: Deque[Future] = deque()
+    try:
+        while True:
+            # keep every worker busy with one chunk and one more queued
+            while len(pending) < 2 * workers:
+                chunk = list(itertools.islice(items, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(fn, chunk, *args))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,40 @@
+from functools import lru_cache
+from typing import Any, Dict
+from genlayer_py.config import calldata_config
+from genlayer_py.exceptions import GenLayerError
+from . import encoder, prepared
+
+
+def cache_info() -> Dict[str, Any]:
+    """
+    Returns the hits, misses and sizes of the encoding caches: encoded map
+    keys, prepared method calls and encoded argument values.
+    """
+    return {
+        "keys": encoder._encode_key.cache_info(),
+        "methods": prepared._prepare_call.cache_info(),
+        "values": prepared._encode_argument.cache_info(),
+    }
+
+
+def set_cache_size(max_size: int) -> None:
+    """
+    Replaces the encoding caches with empty ones holding at most ``max_size``
+    entries each, which also resets their counters.
+    """
+    if max_size < 1:
+        raise GenLayerError(f"cache size must be positive, got {max_size}")
+    calldata_config.cache_size = max_size
+    encoder._encode_key = lru_cache(maxsize=max_size)(encoder._encode_key_uncached)
+    prepared._prepare_call = lru_cache(maxsize=max_size)(
+        prepared._prepare_call_uncached
+    )
+    prepared._encode_argument = lru_cache(maxsize=max_size, typed=True)(
+        prepared._encode_argument_uncached
+    )
+
+
+def clear_caches() -> None:
+    encoder._encode_key.cache_clear()
+    prepared._prepare_call.cache_clear()
+    prepared._encode_argument.cache_clear()
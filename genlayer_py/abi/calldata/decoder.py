@@ -1,76 +1,223 @@
 from genlayer_py.types import CalldataAddress, CalldataEncodable
 from collections.abc import Buffer
-from typing import Any
+from typing import Any, Optional, Tuple
 from . import consts
+from .uleb128 import read_uleb128
+from .vector import has_numpy, read_int_array
 from genlayer_py.exceptions import GenLayerError
 
 
-def decode(mem0: Buffer) -> CalldataEncodable:
+def decode(
+    mem0: Buffer,
+    *,
+    max_depth: Optional[int] = None,
+    max_size: Optional[int] = None,
+    lazy: bool = False,
+    into: Any = None,
+    numpy_arrays: bool = False,
+) -> CalldataEncodable:
+    """
+    Decodes calldata into python objects.
+
+    The input is read with an integer cursor and nested arrays and maps are
+    tracked on an explicit stack, so deeply nested payloads do not depend on
+    the interpreter recursion limit. ``max_depth`` bounds the nesting of arrays
+    and maps and ``max_size`` bounds the length of the input in bytes.
+
+    With ``lazy`` set, arrays and maps are returned as read-only views that
+    decode their items on first access, see ``calldata.lazy``. With ``into``
+    set, the decoded value is rebuilt as that type, see ``calldata.registry``.
+
+    With ``numpy_arrays`` set, non-empty arrays whose items are all integers
+    that fit in 60 bits are returned as int64 numpy arrays, read in bulk.
+    It requires numpy and applies to eager decoding only.
+    """
+    if numpy_arrays and not has_numpy():
+        raise GenLayerError("numpy_arrays requires numpy to be installed")
+    mem, data = _prepare(mem0, max_size)
+    if lazy:
+        from .lazy import decode_lazy
+
+        return decode_lazy(mem, data, max_depth=max_depth)
+    res, pos = decode_at(mem, data, 0, max_depth=max_depth, numpy_arrays=numpy_arrays)
+    check_end(mem, pos, res)
+    if into is not None:
+        from .registry import from_calldata
+
+        return from_calldata(into, res)
+    return res
+
+
+def _prepare(mem0: Buffer, max_size: Optional[int]) -> Tuple[memoryview, bytes]:
     mem: memoryview = memoryview(mem0)
+    size = len(mem)
+    if max_size is not None and size > max_size:
+        raise GenLayerError(f"calldata size {size} exceeds limit {max_size}")
+    # indexing bytes is cheaper than indexing a memoryview, byte strings are
+    # still returned as views into the original buffer
+    data = mem0 if type(mem0) is bytes else mem.tobytes()
+    return mem, data
 
-    def read_uleb128() -> int:
-        nonlocal mem
-        ret = 0
-        off = 0
-        while True:
-            m = mem[0]
-            ret = ret | ((m & 0x7F) << off)
-            off += 7
-            mem = mem[1:]
-            if (m & 0x80) == 0:
-                break
-        return ret
 
-    def impl() -> CalldataEncodable:
-        nonlocal mem
-        code = read_uleb128()
+def check_end(mem: memoryview, pos: int, res: Any) -> None:
+    if pos < len(mem):
+        raise GenLayerError(
+            f"unparsed end {bytes(mem[pos:pos + 5])!r}... (decoded {res})"
+        )
+
+
+def decode_at(
+    mem: memoryview,
+    data: bytes,
+    pos: int,
+    max_depth: Optional[int] = None,
+    numpy_arrays: bool = False,
+) -> Tuple[CalldataEncodable, int]:
+    """
+    Decodes the value starting at ``pos``, returns it and the position right
+    after it. ``data`` holds the same bytes as ``mem``.
+    """
+    # each frame is [container, remaining items, is map, last read map key]
+    stack: list[list[Any]] = []
+    res: Any
+    while True:
+        code = data[pos]
+        if code < 0x80:
+            pos += 1
+        else:
+            code, pos = read_uleb128(data, pos)
         typ = code & 0x7
         if typ == consts.TYPE_SPECIAL:
             if code == consts.SPECIAL_NULL:
-                return None
-            if code == consts.SPECIAL_FALSE:
-                return False
-            if code == consts.SPECIAL_TRUE:
-                return True
+                res = None
+            elif code == consts.SPECIAL_FALSE:
+                res = False
+            elif code == consts.SPECIAL_TRUE:
+                res = True
+            elif code == consts.SPECIAL_ADDR:
+                res = CalldataAddress(data[pos : pos + CalldataAddress.SIZE])
+                pos += CalldataAddress.SIZE
+            else:
+                raise GenLayerError(f"Unknown special {bin(code)} {hex(code)}")
+        else:
+            code = code >> 3
+            if typ == consts.TYPE_PINT:
+                res = code
+            elif typ == consts.TYPE_NINT:
+                res = -code - 1
+            elif typ == consts.TYPE_STR:
+                res = str(data[pos : pos + code], encoding="utf-8")
+                pos += code
+            elif typ == consts.TYPE_BYTES:
+                res = mem[pos : pos + code]
+                pos += code
+            elif typ == consts.TYPE_ARR or typ == consts.TYPE_MAP:
+                if max_depth is not None and len(stack) >= max_depth:
+                    raise GenLayerError(f"calldata nesting exceeds limit {max_depth}")
+                if typ == consts.TYPE_ARR:
+                    res = []
+                    if code > 0:
+                        found = numpy_arrays and read_int_array(data, pos, code)
+                        if not found:
+                            stack.append([res, code, False, None])
+                            continue
+                        res, pos = found
+                else:
+                    res = {}
+                    if code > 0:
+                        frame = [res, code, True, None]
+                        stack.append(frame)
+                        pos = _read_key(data, pos, frame)
+                        continue
+            else:
+                raise GenLayerError(f"invalid type {typ}")
+
+        # attach the decoded value to its parent, closing finished containers
+        while stack:
+            frame = stack[-1]
+            if frame[2]:
+                frame[0][frame[3]] = res
+            else:
+                frame[0].append(res)
+            frame[1] -= 1
+            if frame[1] > 0:
+                if frame[2]:
+                    pos = _read_key(data, pos, frame)
+                break
+            stack.pop()
+            res = frame[0]
+        else:
+            return res, pos
+
+
+def _read_key(data: bytes, pos: int, frame: list) -> int:
+    le = data[pos]
+    if le < 0x80:
+        pos += 1
+    else:
+        le, pos = read_uleb128(data, pos)
+    key = str(data[pos : pos + le], encoding="utf-8")
+    prev = frame[3]
+    if prev is not None:
+        assert prev < key
+    assert key not in frame[0]
+    frame[3] = key
+    return pos + le
+
+
+def skip_at(data: bytes, pos: int, max_depth: Optional[int] = None) -> int:
+    """
+    Returns the position right after the value starting at ``pos`` without
+    decoding it. Map keys, strings and byte strings are stepped over.
+    """
+    # each frame is [remaining items, is map]
+    stack: list[list[Any]] = []
+    while True:
+        code = data[pos]
+        if code < 0x80:
+            pos += 1
+        else:
+            code, pos = read_uleb128(data, pos)
+        typ = code & 0x7
+        if typ == consts.TYPE_SPECIAL:
             if code == consts.SPECIAL_ADDR:
-                ret_addr = mem[: CalldataAddress.SIZE]
-                mem = mem[CalldataAddress.SIZE :]
-                return CalldataAddress(ret_addr)
-            raise GenLayerError(f"Unknown special {bin(code)} {hex(code)}")
-        code = code >> 3
-        if typ == consts.TYPE_PINT:
-            return code
-        elif typ == consts.TYPE_NINT:
-            return -code - 1
-        elif typ == consts.TYPE_BYTES:
-            ret_bytes = mem[:code]
-            mem = mem[code:]
-            return ret_bytes
-        elif typ == consts.TYPE_STR:
-            ret_str = mem[:code]
-            mem = mem[code:]
-            return str(ret_str, encoding="utf-8")
-        elif typ == consts.TYPE_ARR:
-            ret_arr = []
-            for _i in range(code):
-                ret_arr.append(impl())
-            return ret_arr
-        elif typ == consts.TYPE_MAP:
-            ret_dict: dict[str, CalldataEncodable] = {}
-            prev = None
-            for _i in range(code):
-                le = read_uleb128()
-                key = str(mem[:le], encoding="utf-8")
-                mem = mem[le:]
-                if prev is not None:
-                    assert prev < key
-                prev = key
-                assert key not in ret_dict
-                ret_dict[key] = impl()
-            return ret_dict
-        raise GenLayerError(f"invalid type {typ}")
-
-    res = impl()
-    if len(mem) != 0:
-        raise GenLayerError(f"unparsed end {bytes(mem[:5])!r}... (decoded {res})")
-    return res
+                pos += CalldataAddress.SIZE
+            elif code not in (
+                consts.SPECIAL_NULL,
+                consts.SPECIAL_FALSE,
+                consts.SPECIAL_TRUE,
+            ):
+                raise GenLayerError(f"Unknown special {bin(code)} {hex(code)}")
+        elif typ == consts.TYPE_PINT or typ == consts.TYPE_NINT:
+            pass
+        elif typ == consts.TYPE_STR or typ == consts.TYPE_BYTES:
+            pos += code >> 3
+        elif typ == consts.TYPE_ARR or typ == consts.TYPE_MAP:
+            if max_depth is not None and len(stack) >= max_depth:
+                raise GenLayerError(f"calldata nesting exceeds limit {max_depth}")
+            if code >> 3 > 0:
+                stack.append([code >> 3, typ == consts.TYPE_MAP])
+                if typ == consts.TYPE_MAP:
+                    pos = _skip_key(data, pos)
+                continue
+        else:
+            raise GenLayerError(f"invalid type {typ}")
+
+        while stack:
+            frame = stack[-1]
+            frame[0] -= 1
+            if frame[0] > 0:
+                if frame[1]:
+                    pos = _skip_key(data, pos)
+                break
+            stack.pop()
+        else:
+            return pos
+
+
+def _skip_key(data: bytes, pos: int) -> int:
+    le = data[pos]
+    if le < 0x80:
+        return pos + 1 + le
+    le, pos = read_uleb128(data, pos)
+    return pos + le
@@ -1,81 +1,338 @@
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Union
 from . import consts
+from .uleb128 import append_uleb128, uleb128_size
+from .vector import np, encode_int_array, is_int_array
 from genlayer_py.types import CalldataAddress, CalldataEncodable
 from genlayer_py.exceptions import GenLayerError
-from collections.abc import Sequence, Mapping
+from genlayer_py.config import calldata_config
+from collections.abc import Buffer, Sequence, Mapping
+import array
 import dataclasses
 
+# encoders append the encoded pieces of a value to a list, the pieces are
+# then joined or written into a buffer whose size is known up front
+Parts = List[Union[bytes, bytearray]]
+Encoder = Callable[[Parts, Any], None]
+
+_SINGLE_BYTES = [bytes([i]) for i in range(0x80)]
+_NULL = _SINGLE_BYTES[consts.SPECIAL_NULL]
+_TRUE = _SINGLE_BYTES[consts.SPECIAL_TRUE]
+_FALSE = _SINGLE_BYTES[consts.SPECIAL_FALSE]
+_ADDR = _SINGLE_BYTES[consts.SPECIAL_ADDR]
+
+# parts at least this long are copied into the buffer of encode_into as is
+_DIRECT_WRITE = 1024
+
 
 def encode(x: CalldataEncodable) -> bytes:
-    mem = bytearray()
+    parts: Parts = []
+    _encode_value(parts, x)
+    return b"".join(parts)
+
+
+def encode_into(x: CalldataEncodable, buffer: Buffer, offset: int = 0) -> int:
+    """
+    Writes the encoding of ``x`` into ``buffer`` starting at ``offset`` and
+    returns the offset right after it, so that one buffer can be reused for
+    many values. Raises ``GenLayerError`` if the buffer is too small.
+    """
+    parts: Parts = []
+    _encode_value(parts, x)
+    size = sum(map(len, parts))
+    with memoryview(buffer) as mem, mem.cast("B") as out:
+        if offset < 0 or offset + size > len(out):
+            raise GenLayerError(
+                f"buffer of {len(out)} bytes can not hold {size} bytes at {offset}"
+            )
+        start = 0
+        for i, part in enumerate(parts):
+            if len(part) < _DIRECT_WRITE:
+                continue
+            # large parts are written where they go, the small ones before
+            # them are joined first since one copy each costs less there
+            if start < i:
+                small = b"".join(parts[start:i])
+                out[offset : offset + len(small)] = small
+                offset += len(small)
+            out[offset : offset + len(part)] = part
+            offset += len(part)
+            start = i + 1
+        if start < len(parts):
+            small = b"".join(parts[start:])
+            out[offset : offset + len(small)] = small
+            offset += len(small)
+    return offset
+
+
+def encoded_size(x: CalldataEncodable) -> int:
+    """
+    Returns the length of the encoding of ``x`` without building it, but for
+    the values of custom encoders, which are encoded to be measured.
+    """
+    return _size_value(x)
+
+
+def _header(parts: Parts, i: int) -> None:
+    if i < 0x80:
+        parts.append(_SINGLE_BYTES[i])
+    else:
+        mem = bytearray()
+        append_uleb128(mem, i)
+        parts.append(mem)
+
+
+def _encode_value(parts: Parts, b: Any) -> None:
+    enc = _ENCODERS.get(type(b))
+    if enc is None:
+        enc = _resolve_encoder(type(b))
+    enc(parts, b)
+
+
+def _encode_none(parts: Parts, b: None) -> None:
+    parts.append(_NULL)
+
+
+def _encode_bool(parts: Parts, b: bool) -> None:
+    parts.append(_TRUE if b else _FALSE)
 
-    def append_uleb128(i):
-        assert i >= 0
-        if i == 0:
-            mem.append(0)
-        while i > 0:
-            cur = i & 0x7F
-            i = i >> 7
-            if i > 0:
-                cur |= 0x80
-            mem.append(cur)
-
-    def impl_dict(b: Mapping):
-        keys = list(b.keys())
-        keys.sort()
-        le = len(keys)
-        le = (le << 3) | consts.TYPE_MAP
-        append_uleb128(le)
-        for k in keys:
-            if not isinstance(k, str):
-                raise GenLayerError(f"key is not string {type(k)}")
-            bts = k.encode("utf-8")
-            append_uleb128(len(bts))
-            mem.extend(bts)
-            impl(b[k])
-
-    def impl(b: Any):
-        if b is None:
-            mem.append(consts.SPECIAL_NULL)
-        elif b is True:
-            mem.append(consts.SPECIAL_TRUE)
-        elif b is False:
-            mem.append(consts.SPECIAL_FALSE)
-        elif isinstance(b, int):
-            if b >= 0:
-                b = (b << 3) | consts.TYPE_PINT
-                append_uleb128(b)
-            else:
-                b = -b - 1
-                b = (b << 3) | consts.TYPE_NINT
-                append_uleb128(b)
-        elif isinstance(b, CalldataAddress):
-            mem.append(consts.SPECIAL_ADDR)
-            mem.extend(b.as_bytes)
-        elif isinstance(b, bytes):
-            lb = len(b)
-            lb = (lb << 3) | consts.TYPE_BYTES
-            append_uleb128(lb)
-            mem.extend(b)
-        elif isinstance(b, str):
-            b = b.encode("utf-8")
-            lb = len(b)
-            lb = (lb << 3) | consts.TYPE_STR
-            append_uleb128(lb)
-            mem.extend(b)
-        elif isinstance(b, Sequence):
-            lb = len(b)
-            lb = (lb << 3) | consts.TYPE_ARR
-            append_uleb128(lb)
-            for x in b:
-                impl(x)
-        elif isinstance(b, Mapping):
-            impl_dict(b)
-        elif dataclasses.is_dataclass(b):
-            assert not isinstance(b, type)
-            impl_dict(dataclasses.asdict(b))
-        else:
-            raise GenLayerError(f"invalid type {type(b)}")
-
-    impl(x)
+
+def _encode_int(parts: Parts, b: int) -> None:
+    if b >= 0:
+        b = (b << 3) | consts.TYPE_PINT
+    else:
+        b = ((-b - 1) << 3) | consts.TYPE_NINT
+    if b < 0x80:
+        parts.append(_SINGLE_BYTES[b])
+    else:
+        _header(parts, b)
+
+
+def _encode_address(parts: Parts, b: CalldataAddress) -> None:
+    parts.append(_ADDR)
+    parts.append(b.as_bytes)
+
+
+def _encode_bytes(parts: Parts, b: bytes) -> None:
+    le = (len(b) << 3) | consts.TYPE_BYTES
+    if le < 0x80:
+        parts.append(_SINGLE_BYTES[le])
+    else:
+        _header(parts, le)
+    parts.append(b)
+
+
+def _encode_str(parts: Parts, b: str) -> None:
+    b = b.encode("utf-8")
+    le = (len(b) << 3) | consts.TYPE_STR
+    if le < 0x80:
+        parts.append(_SINGLE_BYTES[le])
+    else:
+        _header(parts, le)
+    parts.append(b)
+
+
+def _encode_sequence(parts: Parts, b: Sequence) -> None:
+    _header(parts, (len(b) << 3) | consts.TYPE_ARR)
+    get = _ENCODERS.get
+    for x in b:
+        enc = get(type(x))
+        if enc is None:
+            enc = _resolve_encoder(type(x))
+        enc(parts, x)
+
+
+def _encode_array(parts: Parts, b: Any) -> None:
+    if is_int_array(b):
+        _header(parts, (len(b) << 3) | consts.TYPE_ARR)
+        parts.append(encode_int_array(b))
+    else:
+        _encode_value(parts, b.tolist())
+
+
+def _encode_numpy_int(parts: Parts, b: Any) -> None:
+    _encode_int(parts, int(b))
+
+
+def _encode_key_uncached(k: str) -> bytes:
+    if not isinstance(k, str):
+        raise GenLayerError(f"key is not string {type(k)}")
+    raw = k.encode("utf-8")
+    mem = bytearray()
+    append_uleb128(mem, len(raw))
+    mem.extend(raw)
     return bytes(mem)
+
+
+# encoded map keys, an LRU cache so that arbitrary user keys can not grow it
+# forever, resized by calldata.set_cache_size
+_encode_key = lru_cache(maxsize=calldata_config.cache_size)(_encode_key_uncached)
+
+
+def _encode_mapping(parts: Parts, b: Mapping) -> None:
+    keys = list(b.keys())
+    keys.sort()
+    _header(parts, (len(keys) << 3) | consts.TYPE_MAP)
+    get = _ENCODERS.get
+    for k in keys:
+        parts.append(_encode_key(k))
+        x = b[k]
+        enc = get(type(x))
+        if enc is None:
+            enc = _resolve_encoder(type(x))
+        enc(parts, x)
+
+
+def _size_value(b: Any) -> int:
+    enc = _ENCODERS.get(type(b))
+    if enc is None:
+        enc = _resolve_encoder(type(b))
+    size = _SIZES.get(enc)
+    if size is not None:
+        return size(b)
+    parts: Parts = []
+    enc(parts, b)
+    return sum(map(len, parts))
+
+
+def _size_int(b: int) -> int:
+    if b >= 0:
+        return uleb128_size((b << 3) | consts.TYPE_PINT)
+    return uleb128_size(((-b - 1) << 3) | consts.TYPE_NINT)
+
+
+def _size_bytes(b: bytes) -> int:
+    return uleb128_size((len(b) << 3) | consts.TYPE_BYTES) + len(b)
+
+
+def _size_str(b: str) -> int:
+    le = len(b) if b.isascii() else len(b.encode("utf-8"))
+    return uleb128_size((le << 3) | consts.TYPE_STR) + le
+
+
+def _size_sequence(b: Sequence) -> int:
+    size = uleb128_size((len(b) << 3) | consts.TYPE_ARR)
+    for x in b:
+        size += _size_value(x)
+    return size
+
+
+def _size_array(b: Any) -> int:
+    if is_int_array(b):
+        # the items are encoded in one vectorized pass, cheaper than sizing
+        # them one by one
+        size = len(encode_int_array(b))
+        return uleb128_size((len(b) << 3) | consts.TYPE_ARR) + size
+    return _size_value(b.tolist())
+
+
+def _size_mapping(b: Mapping) -> int:
+    size = uleb128_size((len(b) << 3) | consts.TYPE_MAP)
+    for k, x in b.items():
+        size += len(_encode_key(k)) + _size_value(x)
+    return size
+
+
+# sizes of the values of the built-in encoders, by encoder
+_SIZES: Dict[Encoder, Callable[[Any], int]] = {
+    _encode_none: lambda b: 1,
+    _encode_bool: lambda b: 1,
+    _encode_int: _size_int,
+    _encode_numpy_int: lambda b: _size_int(int(b)),
+    _encode_address: lambda b: 1 + len(b.as_bytes),
+    _encode_bytes: _size_bytes,
+    _encode_str: _size_str,
+    _encode_sequence: _size_sequence,
+    _encode_array: _size_array,
+    _encode_mapping: _size_mapping,
+}
+
+
+def make_class_encoder(field_names: Sequence[str]) -> Encoder:
+    """
+    Compiles an encoder that writes objects as a map of the given attributes.
+    The map header and the encoded keys are computed once, encoding an object
+    only emits its attribute values.
+    """
+    names = sorted(field_names)
+    header: Parts = []
+    _header(header, (len(names) << 3) | consts.TYPE_MAP)
+    map_header = bytes(header[0])
+    fields = [(name, _encode_key(name)) for name in names]
+
+    def encode_object(parts: Parts, b: Any) -> None:
+        parts.append(map_header)
+        get = _ENCODERS.get
+        for name, key in fields:
+            parts.append(key)
+            x = getattr(b, name)
+            enc = get(type(x))
+            if enc is None:
+                enc = _resolve_encoder(type(x))
+            enc(parts, x)
+
+    return encode_object
+
+
+def register_encoder(t: type, enc: Encoder) -> None:
+    """
+    Makes ``enc`` the encoder of ``t`` and of its subclasses without an
+    encoder of their own.
+    """
+    _REGISTERED[t] = enc
+    _ENCODERS[t] = enc
+    # drop encoders that subclasses inherited from the previous resolution
+    for other in list(_ENCODERS):
+        if other is not t and issubclass(other, t) and other not in _REGISTERED:
+            del _ENCODERS[other]
+
+
+_ENCODERS: Dict[type, Encoder] = {
+    type(None): _encode_none,
+    bool: _encode_bool,
+    int: _encode_int,
+    CalldataAddress: _encode_address,
+    bytes: _encode_bytes,
+    str: _encode_str,
+    list: _encode_sequence,
+    tuple: _encode_sequence,
+    dict: _encode_mapping,
+    array.array: _encode_array,
+}
+if np is not None:
+    _ENCODERS[np.ndarray] = _encode_array
+
+# encoders registered explicitly, inherited by subclasses
+_REGISTERED: Dict[type, Encoder] = {}
+
+
+def _resolve_encoder(t: type) -> Encoder:
+    """
+    Finds the encoder for a type that has no exact entry, checking in the same
+    order as ``isinstance`` dispatch would, and remembers it for that type.
+    """
+    registered = next((_REGISTERED[c] for c in t.__mro__ if c in _REGISTERED), None)
+    if registered is not None:
+        enc = registered
+    elif issubclass(t, array.array) or (np is not None and issubclass(t, np.ndarray)):
+        enc = _encode_array
+    elif issubclass(t, int):
+        enc = _encode_int
+    elif np is not None and issubclass(t, np.integer):
+        enc = _encode_numpy_int
+    elif issubclass(t, CalldataAddress):
+        enc = _encode_address
+    elif issubclass(t, bytes):
+        enc = _encode_bytes
+    elif issubclass(t, str):
+        enc = _encode_str
+    elif issubclass(t, Sequence):
+        enc = _encode_sequence
+    elif issubclass(t, Mapping):
+        enc = _encode_mapping
+    elif dataclasses.is_dataclass(t):
+        enc = make_class_encoder([f.name for f in dataclasses.fields(t)])
+    else:
+        raise GenLayerError(f"invalid type {t}")
+    _ENCODERS[t] = enc
+    return enc
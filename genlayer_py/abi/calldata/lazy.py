@@ -0,0 +1,164 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional
+from genlayer_py.types import CalldataEncodable
+from . import consts
+from .decoder import check_end, decode_at, skip_at
+from .uleb128 import read_uleb128
+
+
+class CalldataView:
+    """
+    Base of the read-only views returned by ``calldata.decode(..., lazy=True)``.
+
+    A view keeps a reference to the original buffer and the position of its
+    container. Item offsets are indexed only as far as accesses require and
+    items are decoded on first access, nested arrays and maps become views
+    themselves.
+    """
+
+    __slots__ = ("_mem", "_data", "_start", "_count", "_next", "_cache")
+
+    def __init__(
+        self, mem: memoryview, data: bytes, start: int, count: int, body: int
+    ) -> None:
+        self._mem = mem
+        self._data = data
+        self._start = start
+        self._count = count
+        # position of the first item that is not indexed yet
+        self._next = body
+        self._cache: Dict[Any, CalldataEncodable] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_eager(self) -> CalldataEncodable:
+        """
+        Decodes the whole container into plain dicts and lists.
+        """
+        return decode_at(self._mem, self._data, self._start)[0]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_eager()!r})"
+
+
+class CalldataMapView(CalldataView, Mapping):
+    __slots__ = ("_keys", "_offsets")
+
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self._keys: List[str] = []
+        self._offsets: Dict[str, int] = {}
+
+    def _index_next(self) -> str:
+        data = self._data
+        pos = self._next
+        le, pos = read_uleb128(data, pos)
+        key = str(data[pos : pos + le], encoding="utf-8")
+        if self._keys:
+            assert self._keys[-1] < key
+        pos += le
+        self._keys.append(key)
+        self._offsets[key] = pos
+        if len(self._keys) < self._count:
+            self._next = skip_at(data, pos)
+        return key
+
+    def _find(self, key: str) -> Optional[int]:
+        offset = self._offsets.get(key)
+        if offset is not None:
+            return offset
+        # keys are sorted, so indexing can stop at the first greater key
+        if self._keys and self._keys[-1] > key:
+            return None
+        while len(self._keys) < self._count:
+            last = self._index_next()
+            if last == key:
+                return self._offsets[key]
+            if last > key:
+                return None
+        return None
+
+    def __getitem__(self, key: str) -> CalldataEncodable:
+        if not isinstance(key, str):
+            raise KeyError(key)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        offset = self._find(key)
+        if offset is None:
+            raise KeyError(key)
+        value = _value_at(self._mem, self._data, offset)
+        self._cache[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        i = 0
+        while i < self._count:
+            if i == len(self._keys):
+                self._index_next()
+            yield self._keys[i]
+            i += 1
+
+
+class CalldataSequenceView(CalldataView, Sequence):
+    __slots__ = ("_offsets",)
+
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self._offsets: List[int] = []
+
+    def _offset(self, i: int) -> int:
+        while len(self._offsets) <= i:
+            pos = self._next
+            self._offsets.append(pos)
+            if len(self._offsets) < self._count:
+                self._next = skip_at(self._data, pos)
+        return self._offsets[i]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("calldata sequence index out of range")
+        try:
+            return self._cache[i]
+        except KeyError:
+            pass
+        value = _value_at(self._mem, self._data, self._offset(i))
+        self._cache[i] = value
+        return value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (str, bytes)) or not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+def _value_at(mem: memoryview, data: bytes, pos: int) -> CalldataEncodable:
+    code, body = read_uleb128(data, pos)
+    typ = code & 0x7
+    if typ == consts.TYPE_ARR:
+        return CalldataSequenceView(mem, data, pos, code >> 3, body)
+    if typ == consts.TYPE_MAP:
+        return CalldataMapView(mem, data, pos, code >> 3, body)
+    return decode_at(mem, data, pos)[0]
+
+
+def decode_lazy(
+    mem: memoryview, data: bytes, max_depth: Optional[int] = None
+) -> CalldataEncodable:
+    # the structure is walked once up front so that nesting and trailing
+    # bytes are reported at decode time, like the eager decoder does
+    end = skip_at(data, 0, max_depth=max_depth)
+    res = _value_at(mem, data, 0)
+    check_end(mem, end, res)
+    return res
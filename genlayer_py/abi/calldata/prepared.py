@@ -0,0 +1,89 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from genlayer_py.types import CalldataAddress, CalldataEncodable
+from genlayer_py.config import calldata_config
+from . import consts
+from .encoder import Parts, _encode_key, _encode_value, _header
+
+# argument values whose encoding is cached, longer ones are encoded each time
+_CACHED_TYPES = (str, bytes, CalldataAddress)
+_CACHED_MAX_LEN = 256
+
+_ARGS_KEY = _encode_key("args")
+_KWARGS_KEY = _encode_key("kwargs")
+_METHOD_KEY = _encode_key("method")
+
+
+class PreparedCall:
+    """
+    The encoding of a ``{"method": ..., "args": ..., "kwargs": ...}`` call
+    envelope with a fixed method, as built by ``make_calldata_object``.
+
+    Keys are sorted, so the method always comes last: its encoding is kept
+    and ``encode`` only writes the map header and the arguments in front of
+    it. Use ``prepare_call`` to get a cached instance.
+    """
+
+    __slots__ = ("method", "_suffix")
+
+    def __init__(self, method: Optional[str]) -> None:
+        self.method = method
+        if method is None:
+            self._suffix = b""
+        else:
+            parts: Parts = [_METHOD_KEY]
+            _encode_value(parts, method)
+            self._suffix = b"".join(parts)
+
+    def __repr__(self) -> str:
+        return f"PreparedCall({self.method!r})"
+
+    def encode(
+        self,
+        args: Optional[List[CalldataEncodable]] = None,
+        kwargs: Optional[Dict[str, CalldataEncodable]] = None,
+    ) -> bytes:
+        has_args = args is not None and len(args) > 0
+        has_kwargs = kwargs is not None and isinstance(kwargs, dict) and bool(kwargs)
+        count = has_args + has_kwargs + (self.method is not None)
+        parts: Parts = []
+        _header(parts, (count << 3) | consts.TYPE_MAP)
+        if has_args:
+            parts.append(_ARGS_KEY)
+            _header(parts, (len(args) << 3) | consts.TYPE_ARR)
+            for x in args:
+                if type(x) in _CACHED_TYPES and (
+                    type(x) is CalldataAddress or len(x) <= _CACHED_MAX_LEN
+                ):
+                    parts.append(_encode_argument(x))
+                else:
+                    _encode_value(parts, x)
+        if has_kwargs:
+            parts.append(_KWARGS_KEY)
+            _encode_value(parts, kwargs)
+        parts.append(self._suffix)
+        return b"".join(parts)
+
+
+def _encode_argument_uncached(x: Any) -> bytes:
+    parts: Parts = []
+    _encode_value(parts, x)
+    return b"".join(parts)
+
+
+def _prepare_call_uncached(method: Optional[str]) -> PreparedCall:
+    return PreparedCall(method)
+
+
+# both are LRU caches resized by calldata.set_cache_size
+_encode_argument = lru_cache(maxsize=calldata_config.cache_size, typed=True)(
+    _encode_argument_uncached
+)
+_prepare_call = lru_cache(maxsize=calldata_config.cache_size)(_prepare_call_uncached)
+
+
+def prepare_call(method: Optional[str]) -> PreparedCall:
+    """
+    Returns the cached ``PreparedCall`` for ``method``.
+    """
+    return _prepare_call(method)
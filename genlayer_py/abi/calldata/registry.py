@@ -0,0 +1,131 @@
+import dataclasses
+import types
+import typing
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Dict, Optional, Type, TypeVar
+from genlayer_py.types import CalldataEncodable
+from genlayer_py.exceptions import GenLayerError
+from .encoder import make_class_encoder, register_encoder, _encode_value
+
+T = TypeVar("T")
+
+Decoder = Callable[[CalldataEncodable], Any]
+
+# decoders given to register_type, and the ones compiled from type hints
+_DECODERS: Dict[type, Decoder] = {}
+_COMPILED: Dict[Any, Decoder] = {}
+
+_UNION_TYPES = (typing.Union, getattr(types, "UnionType", typing.Union))
+
+
+def _is_named_tuple(cls: type) -> bool:
+    return issubclass(cls, tuple) and hasattr(cls, "_fields")
+
+
+def register_type(
+    cls: Type[T],
+    *,
+    encode: Optional[Callable[[T], CalldataEncodable]] = None,
+    decode: Optional[Callable[[CalldataEncodable], T]] = None,
+) -> None:
+    """
+    Registers how instances of ``cls`` are written to and rebuilt from calldata.
+
+    ``encode`` turns an instance into an encodable value and ``decode`` turns
+    the decoded value back into an instance. Without them, dataclasses and
+    NamedTuples are written as a map of their fields through a compiled plan
+    and rebuilt field by field using their type hints. Dataclasses use the
+    same plan without registration, NamedTuples are written as arrays unless
+    registered.
+    """
+    if encode is not None:
+        register_encoder(cls, lambda parts, b: _encode_value(parts, encode(b)))
+    elif dataclasses.is_dataclass(cls):
+        register_encoder(
+            cls, make_class_encoder([f.name for f in dataclasses.fields(cls)])
+        )
+    elif _is_named_tuple(cls):
+        register_encoder(cls, make_class_encoder(cls._fields))
+    else:
+        raise GenLayerError(f"no encoder given for {cls}")
+    if decode is not None:
+        _DECODERS[cls] = decode
+    else:
+        _DECODERS.pop(cls, None)
+    _COMPILED.pop(cls, None)
+
+
+def from_calldata(cls: Any, value: CalldataEncodable) -> Any:
+    """
+    Rebuilds a value of type ``cls`` from decoded calldata. ``cls`` may be a
+    registered type, a dataclass, a NamedTuple or a typing construct such as
+    ``List[Point]`` or ``Optional[Point]``; other types are returned as is.
+    """
+    decoder = _DECODERS.get(cls)
+    if decoder is None:
+        decoder = _COMPILED.get(cls)
+        if decoder is None:
+            decoder = _compile_decoder(cls)
+            _COMPILED[cls] = decoder
+    return decoder(value)
+
+
+def _compile_decoder(cls: Any) -> Decoder:
+    origin = typing.get_origin(cls)
+    args = typing.get_args(cls)
+    if origin in _UNION_TYPES:
+        options = [a for a in args if a is not type(None)]
+
+        def decode_union(value):
+            if value is None:
+                return None
+            return from_calldata(options[0], value) if len(options) == 1 else value
+
+        return decode_union
+    if origin in (list, Sequence, typing.Sequence) or cls in (list, Sequence):
+        item = args[0] if args else Any
+        return lambda value: [from_calldata(item, v) for v in value]
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return lambda value: tuple(from_calldata(args[0], v) for v in value)
+        return lambda value: tuple(from_calldata(a, v) for a, v in zip(args, value))
+    if origin in (dict, Mapping, typing.Mapping) or cls in (dict, Mapping):
+        item = args[1] if len(args) == 2 else Any
+        return lambda value: {k: from_calldata(item, v) for k, v in value.items()}
+    if not isinstance(cls, type):
+        return lambda value: value
+    if cls is bytes:
+        return lambda value: value if value is None else bytes(value)
+    if dataclasses.is_dataclass(cls) or _is_named_tuple(cls):
+        return _compile_class_decoder(cls)
+    return lambda value: value
+
+
+def _compile_class_decoder(cls: type) -> Decoder:
+    hints = typing.get_type_hints(cls)
+    if dataclasses.is_dataclass(cls):
+        names = [f.name for f in dataclasses.fields(cls) if f.init]
+    else:
+        names = list(cls._fields)
+    field_types = [(name, hints.get(name, Any)) for name in names]
+
+    def decode_object(value: CalldataEncodable) -> Any:
+        if isinstance(value, Mapping):
+            return cls(
+                **{
+                    name: from_calldata(hint, value[name])
+                    for name, hint in field_types
+                    if name in value
+                }
+            )
+        if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+            # NamedTuples that are not registered are written as arrays
+            return cls(
+                *(
+                    from_calldata(hint, v)
+                    for (_name, hint), v in zip(field_types, value)
+                )
+            )
+        raise GenLayerError(f"can not build {cls} from {type(value)}")
+
+    return decode_object
@@ -0,0 +1,272 @@
+import codecs
+from collections.abc import Buffer
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+from genlayer_py.types import CalldataAddress
+from genlayer_py.exceptions import GenLayerError
+from . import consts
+from .uleb128 import read_uleb128
+
+
+class CalldataEvent(str, Enum):
+    START_MAP = "start_map"
+    KEY = "key"
+    END_MAP = "end_map"
+    START_ARRAY = "start_array"
+    END_ARRAY = "end_array"
+    VALUE = "value"
+
+
+CalldataEventHandler = Callable[[CalldataEvent, Any], None]
+
+_HEADER = 0
+_KEY = 1
+_PAYLOAD = 2
+
+
+class CalldataStreamParser:
+    """
+    A push parser for calldata that accepts the input in chunks.
+
+    Every decoded item is reported to ``handler`` as an event: ``START_MAP`` and
+    ``START_ARRAY`` carry the number of items, ``KEY`` carries a map key,
+    ``VALUE`` carries a scalar and ``END_MAP``/``END_ARRAY`` carry ``None``.
+    Only the bytes of the token being parsed are kept in memory.
+
+    The same checks as ``calldata.decode`` are applied: unknown specials and
+    types, sorted and unique map keys, UTF-8 strings and trailing bytes.
+    Input that ends in the middle of a value is reported by ``close``.
+
+    With ``verify_only`` no events are emitted and no values are built, byte
+    strings are stepped over as they arrive. Map keys are compared as raw
+    bytes, UTF-8 byte order being code point order, and text is checked to
+    be UTF-8 without being decoded.
+    """
+
+    def __init__(
+        self,
+        handler: Optional[CalldataEventHandler] = None,
+        *,
+        verify_only: bool = False,
+        max_depth: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ) -> None:
+        if handler is None and not verify_only:
+            raise GenLayerError("an event handler is required unless verify_only")
+        self._handler = handler
+        self._verify_only = verify_only
+        self._max_depth = max_depth
+        self._max_size = max_size
+        self._buf = bytearray()
+        self._size = 0
+        self._state = _HEADER
+        self._payload_type = 0
+        self._payload_left = 0
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        # each frame is [remaining items, is map, last map key], the key being
+        # raw bytes with verify_only
+        self._stack: List[List[Any]] = []
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: Buffer) -> None:
+        chunk = memoryview(chunk)
+        self._size += len(chunk)
+        if self._max_size is not None and self._size > self._max_size:
+            raise GenLayerError(
+                f"calldata size {self._size} exceeds limit {self._max_size}"
+            )
+        if self._done:
+            self._check_end(chunk)
+            return
+        self._buf += chunk
+        pos = self._process(self._buf)
+        del self._buf[:pos]
+        if self._done:
+            self._check_end(self._buf)
+
+    def close(self) -> None:
+        if not self._done:
+            raise GenLayerError("unexpected end of calldata")
+
+    def _check_end(self, rest: Buffer) -> None:
+        if len(rest) != 0:
+            raise GenLayerError(f"unparsed end {bytes(rest[:5])!r}...")
+
+    def _emit(self, event: CalldataEvent, value: Any = None) -> None:
+        if not self._verify_only:
+            self._handler(event, value)
+
+    def _process(self, buf: bytearray) -> int:
+        pos = 0
+        while not self._done:
+            if self._state == _PAYLOAD:
+                pos, complete = self._read_payload(buf, pos)
+                if not complete:
+                    break
+                continue
+            try:
+                code, end = read_uleb128(buf, pos)
+            except IndexError:
+                break
+            if self._state == _KEY:
+                if len(buf) - end < code:
+                    break
+                pos = end + code
+                if self._verify_only:
+                    key = bytes(buf[end:pos])
+                    self._check_utf8(key, final=True)
+                    self._read_key(key)
+                else:
+                    self._read_key(str(buf[end:pos], encoding="utf-8"))
+                continue
+            pos = end
+            self._read_header(code)
+        return pos
+
+    def _read_header(self, code: int) -> None:
+        typ = code & 0x7
+        if typ == consts.TYPE_SPECIAL:
+            if code == consts.SPECIAL_NULL:
+                self._value(None)
+            elif code == consts.SPECIAL_FALSE:
+                self._value(False)
+            elif code == consts.SPECIAL_TRUE:
+                self._value(True)
+            elif code == consts.SPECIAL_ADDR:
+                self._start_payload(consts.TYPE_SPECIAL, CalldataAddress.SIZE)
+            else:
+                raise GenLayerError(f"Unknown special {bin(code)} {hex(code)}")
+            return
+        code = code >> 3
+        if typ == consts.TYPE_PINT:
+            self._value(code)
+        elif typ == consts.TYPE_NINT:
+            self._value(-code - 1)
+        elif typ == consts.TYPE_BYTES or typ == consts.TYPE_STR:
+            self._start_payload(typ, code)
+        elif typ == consts.TYPE_ARR or typ == consts.TYPE_MAP:
+            if self._max_depth is not None and len(self._stack) >= self._max_depth:
+                raise GenLayerError(f"calldata nesting exceeds limit {self._max_depth}")
+            is_map = typ == consts.TYPE_MAP
+            self._emit(
+                CalldataEvent.START_MAP if is_map else CalldataEvent.START_ARRAY, code
+            )
+            if code == 0:
+                self._emit(CalldataEvent.END_MAP if is_map else CalldataEvent.END_ARRAY)
+                self._item_done()
+            else:
+                self._stack.append([code, is_map, None])
+                if is_map:
+                    self._state = _KEY
+        else:
+            raise GenLayerError(f"invalid type {typ}")
+
+    def _read_key(self, key: Union[str, bytes]) -> None:
+        frame = self._stack[-1]
+        prev = frame[2]
+        if prev is not None:
+            assert prev < key
+        frame[2] = key
+        self._state = _HEADER
+        self._emit(CalldataEvent.KEY, key)
+
+    def _start_payload(self, typ: int, length: int) -> None:
+        self._state = _PAYLOAD
+        self._payload_type = typ
+        self._payload_left = length
+
+    def _read_payload(self, buf: bytearray, pos: int) -> Tuple[int, bool]:
+        typ = self._payload_type
+        left = self._payload_left
+        if self._verify_only and typ != consts.TYPE_SPECIAL:
+            # step over the payload as it arrives, only strings are looked at
+            take = min(left, len(buf) - pos)
+            self._payload_left = left - take
+            if typ == consts.TYPE_STR:
+                self._check_utf8(buf[pos : pos + take], self._payload_left == 0)
+            pos += take
+            if self._payload_left > 0:
+                return pos, False
+            self._state = _HEADER
+            self._value(None)
+            return pos, True
+        if len(buf) - pos < left:
+            return pos, False
+        raw = bytes(buf[pos : pos + left])
+        self._state = _HEADER
+        if typ == consts.TYPE_STR:
+            self._value(str(raw, encoding="utf-8"))
+        elif typ == consts.TYPE_BYTES:
+            self._value(raw)
+        else:
+            self._value(None if self._verify_only else CalldataAddress(raw))
+        return pos + left, True
+
+    def _check_utf8(self, data: bytes, final: bool) -> None:
+        # ASCII, the usual text, is valid on its own; anything else or the
+        # rest of a split character goes through the decoder, whose output is
+        # dropped
+        if self._utf8.getstate()[0] or not data.isascii():
+            self._utf8.decode(data, final)
+        if final:
+            self._utf8.reset()
+
+    def _value(self, value: Any) -> None:
+        self._emit(CalldataEvent.VALUE, value)
+        self._item_done()
+
+    def _item_done(self) -> None:
+        stack = self._stack
+        while stack:
+            frame = stack[-1]
+            frame[0] -= 1
+            if frame[0] > 0:
+                if frame[1]:
+                    self._state = _KEY
+                return
+            stack.pop()
+            self._emit(CalldataEvent.END_MAP if frame[1] else CalldataEvent.END_ARRAY)
+        self._done = True
+
+
+def iter_events(
+    chunks: Iterable[Buffer],
+    *,
+    max_depth: Optional[int] = None,
+    max_size: Optional[int] = None,
+) -> Iterator[Tuple[CalldataEvent, Any]]:
+    """
+    Parses calldata arriving as ``chunks`` and yields ``(event, value)`` pairs.
+    """
+    events: List[Tuple[CalldataEvent, Any]] = []
+    parser = CalldataStreamParser(
+        lambda event, value: events.append((event, value)),
+        max_depth=max_depth,
+        max_size=max_size,
+    )
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from events
+        events.clear()
+    parser.close()
+
+
+def verify(
+    chunks: Iterable[Buffer],
+    *,
+    max_depth: Optional[int] = None,
+    max_size: Optional[int] = None,
+) -> None:
+    """
+    Checks that ``chunks`` form exactly one well-formed calldata value.
+    """
+    parser = CalldataStreamParser(
+        verify_only=True, max_depth=max_depth, max_size=max_size
+    )
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
@@ -1,5 +1,10 @@
 from genlayer_py.exceptions import GenLayerError
 from genlayer_py.types import CalldataAddress, CalldataEncodable
+from collections.abc import Buffer
+from json.encoder import encode_basestring_ascii
+from typing import Any
+from . import consts
+from .uleb128 import read_uleb128
 import json
 
 
@@ -15,7 +20,7 @@ def to_str(d: CalldataEncodable) -> str:
             buf.append("false")
         elif isinstance(d, str):
             buf.append(json.dumps(d))
-        elif isinstance(d, bytes):
+        elif isinstance(d, (bytes, memoryview)):
             buf.append("b#")
             buf.append(d.hex())
         elif isinstance(d, int):
@@ -48,3 +53,108 @@ def to_str(d: CalldataEncodable) -> str:
 
     impl(d)
     return "".join(buf)
+
+
+def decode_to_str(mem0: Buffer) -> str:
+    """
+    Renders calldata in the ``to_str`` notation straight from its encoding,
+    without building the decoded objects. ``decode_to_str(x)`` is equal to
+    ``to_str(decode(x))`` and fails on the same malformed input.
+    """
+    mem = memoryview(mem0)
+    data = mem0 if type(mem0) is bytes else mem.tobytes()
+    buf: list[str] = []
+    append = buf.append
+    pos = 0
+
+    def read_key(frame: list) -> None:
+        nonlocal pos
+        le = data[pos]
+        if le < 0x80:
+            pos += 1
+        else:
+            le, pos = read_uleb128(data, pos)
+        key = str(data[pos : pos + le], encoding="utf-8")
+        pos += le
+        prev = frame[2]
+        if prev is not None:
+            assert prev < key
+        frame[2] = key
+        append(encode_basestring_ascii(key))
+        append(":")
+
+    # each frame is [remaining items, is map, last map key]
+    stack: list[list[Any]] = []
+    while True:
+        code = data[pos]
+        if code < 0x80:
+            pos += 1
+        else:
+            code, pos = read_uleb128(data, pos)
+        typ = code & 0x7
+        if typ == consts.TYPE_SPECIAL:
+            if code == consts.SPECIAL_NULL:
+                append("null")
+            elif code == consts.SPECIAL_FALSE:
+                append("false")
+            elif code == consts.SPECIAL_TRUE:
+                append("true")
+            elif code == consts.SPECIAL_ADDR:
+                addr = data[pos : pos + CalldataAddress.SIZE]
+                if len(addr) != CalldataAddress.SIZE:
+                    CalldataAddress(addr)
+                pos += CalldataAddress.SIZE
+                append("addr#")
+                append(addr.hex())
+            else:
+                raise GenLayerError(f"Unknown special {bin(code)} {hex(code)}")
+        else:
+            code = code >> 3
+            if typ == consts.TYPE_PINT:
+                append(str(code))
+            elif typ == consts.TYPE_NINT:
+                append(str(-code - 1))
+            elif typ == consts.TYPE_STR:
+                append(
+                    encode_basestring_ascii(
+                        str(data[pos : pos + code], encoding="utf-8")
+                    )
+                )
+                pos += code
+            elif typ == consts.TYPE_BYTES:
+                append("b#")
+                append(data[pos : pos + code].hex())
+                pos += code
+            elif typ == consts.TYPE_ARR:
+                if code > 0:
+                    append("[")
+                    stack.append([code, False, None])
+                    continue
+                append("[]")
+            elif typ == consts.TYPE_MAP:
+                if code > 0:
+                    append("{")
+                    frame = [code, True, None]
+                    stack.append(frame)
+                    read_key(frame)
+                    continue
+                append("{}")
+            else:
+                raise GenLayerError(f"invalid type {typ}")
+
+        while stack:
+            frame = stack[-1]
+            frame[0] -= 1
+            if frame[0] > 0:
+                append(",")
+                if frame[1]:
+                    read_key(frame)
+                break
+            stack.pop()
+            append("}" if frame[1] else "]")
+        else:
+            break
+
+    if pos < len(mem):
+        raise GenLayerError(f"unparsed end {bytes(mem[pos:pos + 5])!r}...")
+    return "".join(buf)
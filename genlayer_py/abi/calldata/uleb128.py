@@ -0,0 +1,112 @@
+import functools
+import re
+from typing import Tuple
+
+# integers up to this many bits are encoded 7 bits at a time, and encodings
+# up to this many bytes are decoded byte by byte; larger ones are converted
+# with whole-number mask operations in 56-bit chunks so that the work stays
+# linear in their size
+_SMALL_BITS = 192
+_SMALL_BYTES = 64
+
+# per 64-bit word: the masks selecting each 7-bit group once it is spread
+# over a whole byte, and the continuation bits of all eight bytes
+_GROUP_MASKS = tuple((0x7F << (8 * k)).to_bytes(8, "little") for k in range(8))
+_CONTINUATION = b"\x80" * 8
+
+_LAST_BYTE = re.compile(b"[\x00-\x7f]")
+
+
+@functools.lru_cache(maxsize=64)
+def _masks(chunks: int) -> Tuple[Tuple[int, ...], int]:
+    def repeat(word: bytes) -> int:
+        return int.from_bytes(word * chunks, "little")
+
+    return tuple(repeat(m) for m in _GROUP_MASKS), repeat(_CONTINUATION)
+
+
+def append_uleb128(mem: bytearray, i: int) -> None:
+    """
+    Appends the unsigned LEB128 encoding of ``i`` to ``mem``.
+    """
+    assert i >= 0
+    if i < 0x80:
+        mem.append(i)
+        return
+    if i.bit_length() > _SMALL_BITS:
+        mem.extend(_encode_big(i))
+        return
+    while i > 0:
+        cur = i & 0x7F
+        i = i >> 7
+        if i > 0:
+            cur |= 0x80
+        mem.append(cur)
+
+
+def uleb128_size(i: int) -> int:
+    """
+    Returns the length of the unsigned LEB128 encoding of ``i``.
+    """
+    return max(1, (i.bit_length() + 6) // 7)
+
+
+def _encode_big(i: int) -> bytearray:
+    groups = (i.bit_length() + 6) // 7
+    chunks = (groups + 7) // 8
+    raw = i.to_bytes(chunks * 7, "little")
+    # give every 56-bit chunk its own 64-bit word
+    words = bytearray(chunks * 8)
+    for k in range(7):
+        words[k::8] = raw[k::7]
+    w = int.from_bytes(words, "little")
+    # move the k-th 7-bit group of each word into the k-th byte
+    group_masks, continuation = _masks(chunks)
+    spread = continuation
+    for k, mask in enumerate(group_masks):
+        spread |= (w << k) & mask
+    out = bytearray(spread.to_bytes(chunks * 8, "little"))
+    del out[groups:]
+    out[-1] &= 0x7F
+    return out
+
+
+def read_uleb128(data: bytes, pos: int) -> Tuple[int, int]:
+    """
+    Reads an unsigned LEB128 integer starting at ``pos``, returns the integer
+    and the position right after it.
+    """
+    ret = 0
+    off = 0
+    while off < 70:
+        m = data[pos]
+        pos += 1
+        ret = ret | ((m & 0x7F) << off)
+        off += 7
+        if (m & 0x80) == 0:
+            return ret, pos
+    last = _LAST_BYTE.search(data, pos)
+    if last is None:
+        raise IndexError("index out of range")
+    end = last.end()
+    if end - pos > _SMALL_BYTES:
+        return ret | (_decode_big(data, pos, end) << off), end
+    for m in data[pos:end]:
+        ret = ret | ((m & 0x7F) << off)
+        off += 7
+    return ret, end
+
+
+def _decode_big(data: bytes, pos: int, end: int) -> int:
+    chunks = (end - pos + 7) // 8
+    w = int.from_bytes(data[pos:end], "little")
+    # gather the eight 7-bit groups of each word back into 56 contiguous bits
+    group_masks, _continuation = _masks(chunks)
+    packed_words = 0
+    for k, mask in enumerate(group_masks):
+        packed_words |= (w & mask) >> k
+    words = packed_words.to_bytes(chunks * 8, "little")
+    packed = bytearray(chunks * 7)
+    for k in range(7):
+        packed[k::7] = words[k::8]
+    return int.from_bytes(packed, "little")
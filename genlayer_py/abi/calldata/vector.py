@@ -0,0 +1,122 @@
+import array
+from typing import Any, List, Optional, Tuple, Union
+from . import consts
+from .uleb128 import append_uleb128
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+# integer typecodes of array.array, numpy understands the same codes
+_INT_TYPECODES = frozenset("bBhHiIlLqQ")
+
+# below this many items the per-call overhead of numpy outweighs its gains
+_NUMPY_MIN_ITEMS = 32
+
+# largest magnitude whose header still fits in 63 bits, which keeps the
+# vectorized paths within uint64 and int64
+_MAX_MAGNITUDE = 1 << 60
+
+# ULEB128 needs at most 9 bytes for 63 bits
+_MAX_ITEM_BYTES = 9
+
+
+def has_numpy() -> bool:
+    return np is not None
+
+
+def is_int_array(b: Any) -> bool:
+    if isinstance(b, array.array):
+        return b.typecode in _INT_TYPECODES
+    return np is not None and (
+        isinstance(b, np.ndarray) and b.ndim == 1 and b.dtype.kind in "iu"
+    )
+
+
+def encode_int_array(b: Union[array.array, Any]) -> bytes:
+    """
+    Encodes the items of a one dimensional integer ``array.array`` or numpy
+    array, without the array header. The output is the same as encoding each
+    item as a python ``int``.
+    """
+    if np is not None and len(b) >= _NUMPY_MIN_ITEMS:
+        items = b if isinstance(b, np.ndarray) else np.frombuffer(b, b.typecode)
+        if len(items) > 0 and (
+            int(items.max()) < _MAX_MAGNITUDE and int(items.min()) >= -_MAX_MAGNITUDE
+        ):
+            return _encode_numpy(items)
+    return _encode_python(b.tolist())
+
+
+def _encode_python(items: List[int]) -> bytes:
+    out = bytearray()
+    for i in items:
+        if i >= 0:
+            i = (i << 3) | consts.TYPE_PINT
+        else:
+            i = ((-i - 1) << 3) | consts.TYPE_NINT
+        if i < 0x80:
+            out.append(i)
+        else:
+            append_uleb128(out, i)
+    return bytes(out)
+
+
+def _encode_numpy(items: Any) -> bytes:
+    items = items.astype(np.int64, copy=False)
+    neg = items < 0
+    magnitude = np.where(neg, ~items, items).astype(np.uint64)
+    codes = (magnitude << np.uint64(3)) | np.where(
+        neg, np.uint64(consts.TYPE_NINT), np.uint64(consts.TYPE_PINT)
+    )
+    if int(codes.max()) < 0x80:
+        return codes.astype(np.uint8).tobytes()
+    # one row per item holding its 7 bit groups, continuation bits are set on
+    # all but the last group and unused groups are dropped by the mask
+    lengths = np.ones(len(codes), dtype=np.int64)
+    for k in range(1, _MAX_ITEM_BYTES):
+        lengths += codes >= np.uint64(1 << (7 * k))
+    width = int(lengths.max())
+    columns = np.arange(width)
+    shifts = np.arange(0, 7 * width, 7, dtype=np.uint64)
+    groups = (codes[:, None] >> shifts) & np.uint64(0x7F)
+    groups[columns < (lengths - 1)[:, None]] |= np.uint64(0x80)
+    return groups.astype(np.uint8)[columns < lengths[:, None]].tobytes()
+
+
+def read_int_array(data: bytes, pos: int, count: int) -> Optional[Tuple[Any, int]]:
+    """
+    Reads ``count`` array items starting at ``pos`` as an int64 numpy array.
+    Returns the array and the position right after it, or ``None`` if the
+    items are not all integers that fit in 60 bits, in which case nothing is
+    consumed and the caller decodes the array item by item.
+    """
+    if pos >= len(data):
+        return None
+    window = np.frombuffer(
+        data,
+        dtype=np.uint8,
+        count=min(len(data) - pos, count * _MAX_ITEM_BYTES),
+        offset=pos,
+    )
+    ends = np.flatnonzero(window < 0x80)
+    if len(ends) < count:
+        return None
+    ends = ends[:count]
+    starts = np.empty(count, dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    if int(lengths.max()) > _MAX_ITEM_BYTES:
+        return None
+    tags = window[starts] & 0x7
+    if not np.all((tags == consts.TYPE_PINT) | (tags == consts.TYPE_NINT)):
+        return None
+    end = int(ends[-1]) + 1
+    groups = window[:end].astype(np.uint64) & np.uint64(0x7F)
+    shifts = (np.arange(end) - np.repeat(starts, lengths)).astype(np.uint64)
+    codes = np.add.reduceat(groups << (np.uint64(7) * shifts), starts)
+    magnitude = (codes >> np.uint64(3)).astype(np.int64)
+    values = np.where(tags == consts.TYPE_NINT, ~magnitude, magnitude)
+    return values, pos + end
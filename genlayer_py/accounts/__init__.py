@@ -1 +1,2 @@
 from .account import generate_private_key, create_account
+from .nonce import NonceManager, AsyncNonceManager
@@ -0,0 +1,138 @@
+import asyncio
+import heapq
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+# JSON-RPC error messages of nodes meaning the nonce was not the expected one
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "already known",
+    "replacement transaction underpriced",
+)
+
+
+def is_nonce_error(message: str) -> bool:
+    message = message.lower()
+    return any(error in message for error in NONCE_ERRORS)
+
+
+class _Account:
+    __slots__ = ("next", "gaps", "issued", "generation")
+
+    def __init__(self) -> None:
+        self.next: Optional[int] = None
+        # nonces handed out but never sent, reused lowest first
+        self.gaps: List[int] = []
+        self.issued = 0
+        # bumped by each reset, nonces of earlier generations are stale
+        self.generation = 0
+
+    def take(self) -> Tuple[int, int]:
+        self.issued += 1
+        if self.gaps:
+            return heapq.heappop(self.gaps), self.generation
+        nonce = self.next
+        self.next += 1
+        return nonce, self.generation
+
+    def release(self, nonce: int, generation: int) -> None:
+        if (
+            generation == self.generation
+            and self.next is not None
+            and nonce < self.next
+            and nonce not in self.gaps
+        ):
+            heapq.heappush(self.gaps, nonce)
+
+    def reset(self) -> None:
+        self.next = None
+        self.gaps = []
+        self.generation += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "next": self.next,
+            "gaps": sorted(self.gaps),
+            "issued": self.issued,
+            "generation": self.generation,
+        }
+
+
+class NonceManager:
+    """
+    Hands out the nonces of each account locally so that one account can
+    have many transactions in flight. The nonce is fetched once per account,
+    with ``fetch``, and again after ``reset``. A nonce whose transaction was
+    never sent is given back with ``release`` and reused by the next send.
+
+    ``acquire`` returns the nonce with its generation, which ``reset``
+    bumps. A nonce of an earlier generation may have been handed out again
+    since, so its release is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._accounts: Dict[str, _Account] = {}
+        self._account_locks: Dict[str, threading.Lock] = {}
+
+    def acquire(self, address: str, fetch: Callable[[str], int]) -> Tuple[int, int]:
+        key = address.lower()
+        with self._lock:
+            account = self._accounts.setdefault(key, _Account())
+            lock = self._account_locks.setdefault(key, threading.Lock())
+        # only the account waiting for its nonce blocks
+        with lock:
+            with self._lock:
+                if account.next is not None:
+                    return account.take()
+            next_nonce = fetch(address)
+            with self._lock:
+                if account.next is None:
+                    account.next = next_nonce
+                return account.take()
+
+    def release(self, address: str, nonce: int, generation: int) -> None:
+        with self._lock:
+            account = self._accounts.get(address.lower())
+            if account is not None:
+                account.release(nonce, generation)
+
+    def reset(self, address: str) -> None:
+        """
+        Forgets the nonces of ``address``, the next ``acquire`` fetches it.
+        """
+        with self._lock:
+            account = self._accounts.get(address.lower())
+            if account is not None:
+                account.reset()
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """
+        Returns the next nonce, the gaps, the nonces issued and the
+        generation per account.
+        """
+        with self._lock:
+            return {key: a.snapshot() for key, a in self._accounts.items()}
+
+
+class AsyncNonceManager(NonceManager):
+    """
+    ``NonceManager`` for coroutines, ``fetch`` being awaited.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._fetches: Dict[str, asyncio.Lock] = {}
+
+    async def acquire(
+        self, address: str, fetch: Callable[[str], Awaitable[int]]
+    ) -> Tuple[int, int]:
+        key = address.lower()
+        account = self._accounts.setdefault(key, _Account())
+        lock = self._fetches.setdefault(key, asyncio.Lock())
+        async with lock:
+            if account.next is None:
+                account.next = await fetch(address)
+            return account.take()
@@ -17,6 +17,8 @@ def initialize_consensus_smart_contract(
 
     if not force_reset and self.chain.consensus_main_contract is not None:
         return
+    if force_reset and self.provider.cache is not None:
+        self.provider.cache.invalidate("sim_getConsensusContract")
 
     response = self.provider.make_request(
         method="sim_getConsensusContract", params=["ConsensusMain"]
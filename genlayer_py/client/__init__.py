@@ -1,4 +1,10 @@
 from .genlayer_client import GenLayerClient
-from .client import create_client
+from .async_genlayer_client import AsyncGenLayerClient
+from .client import create_client, create_async_client
 
-__all__ = ["GenLayerClient", "create_client"]
+__all__ = [
+    "GenLayerClient",
+    "AsyncGenLayerClient",
+    "create_client",
+    "create_async_client",
+]
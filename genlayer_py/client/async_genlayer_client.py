@@ -0,0 +1,286 @@
+from web3.eth import AsyncEth
+from web3 import AsyncWeb3
+from web3.types import Nonce, BlockIdentifier, ENS, _Hash32
+from eth_typing import Address, ChecksumAddress, HexStr
+from eth_account.signers.local import LocalAccount
+from hexbytes import HexBytes
+from typing import AnyStr
+from genlayer_py.types import (
+    GenLayerChain,
+    TransactionStatus,
+    CalldataEncodable,
+    GenLayerTransaction,
+    ContractRead,
+    ContractSchema,
+    TransactionHashVariant,
+)
+from genlayer_py.provider import (
+    AsyncGenLayerProvider,
+    AsyncMultiEndpointProvider,
+    Metrics,
+    RequestHooks,
+    ResponseCache,
+)
+from typing import Optional, Union, List, Dict
+from genlayer_py.accounts.nonce import AsyncNonceManager
+from genlayer_py.accounts.async_actions import get_current_nonce, fund_account
+from genlayer_py.contracts.async_actions import (
+    read_contract,
+    read_contracts,
+    write_contract,
+    deploy_contract,
+    appeal_transaction,
+    get_contract_schema,
+    get_contract_schema_for_code,
+)
+from genlayer_py.chains.async_actions import initialize_consensus_smart_contract
+from genlayer_py.transactions.async_actions import (
+    wait_for_transaction_receipt,
+    get_transaction,
+)
+from genlayer_py.transactions.polling import AsyncClock, StatusCallback
+from genlayer_py.config import transaction_config
+from genlayer_py.config.provider import (
+    ProviderConfig,
+    RateLimitConfig,
+    RetryConfig,
+)
+
+
+class AsyncGenLayerClient(AsyncEth):
+    """
+    The asyncio client to interact with GenLayer Network, every action of
+    ``GenLayerClient`` is available as a coroutine.
+    """
+
+    def __init__(
+        self,
+        chain_config: GenLayerChain,
+        account: Optional[LocalAccount] = None,
+        provider_config: Optional[ProviderConfig] = None,
+        retry_config: Optional[RetryConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        hooks: Optional[RequestHooks] = None,
+        rate_limit: Optional[RateLimitConfig] = None,
+        nonce_manager: Optional[AsyncNonceManager] = None,
+    ):
+        self.chain = chain_config
+        self.local_account = account
+        self.nonce_manager = nonce_manager
+        urls = chain_config.rpc_urls["default"]["http"]
+        metrics = Metrics(hooks)
+        if len(urls) > 1:
+            self.provider = AsyncMultiEndpointProvider(
+                urls,
+                provider_config,
+                retry=retry_config,
+                cache=cache,
+                metrics=metrics,
+                rate_limit=rate_limit,
+            )
+        else:
+            self.provider = AsyncGenLayerProvider(
+                urls[0],
+                provider_config,
+                retry_config,
+                cache,
+                metrics=metrics,
+                rate_limit=rate_limit,
+            )
+        web3 = AsyncWeb3(provider=self.provider)
+
+        super().__init__(web3)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the metrics of each RPC method and action, see
+        ``GenLayerClient.metrics``.
+        """
+        return self.provider.metrics.snapshot()
+
+    def rate_limits(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Returns the requests queued and in flight, and the time spent in
+        line, per endpoint and method class, see ``GenLayerClient.rate_limits``.
+        """
+        return self.provider.rate_limits()
+
+    async def close(self) -> None:
+        await self.provider.disconnect()
+
+    async def __aenter__(self) -> "AsyncGenLayerClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    ## Account actions
+    async def fund_account(
+        self, address: Union[Address, ChecksumAddress, ENS], amount: int
+    ) -> HexBytes:
+        return await fund_account(self, address, amount)
+
+    async def get_current_nonce(
+        self,
+        address: Optional[Union[Address, ChecksumAddress, ENS]] = None,
+        block_identifier: Optional[BlockIdentifier] = None,
+    ) -> Nonce:
+        return await get_current_nonce(self, address, block_identifier)
+
+    # Chain actions
+    async def initialize_consensus_smart_contract(
+        self,
+        force_reset: bool = False,
+    ) -> None:
+        return await initialize_consensus_smart_contract(
+            self=self, force_reset=force_reset
+        )
+
+    # Contract actions
+    async def read_contract(
+        self,
+        address: Union[Address, ChecksumAddress],
+        function_name: str,
+        args: Optional[List[CalldataEncodable]] = None,
+        kwargs: Optional[Dict[str, CalldataEncodable]] = None,
+        account: Optional[LocalAccount] = None,
+        raw_return: bool = False,
+        transaction_hash_variant: TransactionHashVariant = TransactionHashVariant.LATEST_FINAL,
+        lazy: bool = False,
+    ):
+        return await read_contract(
+            self=self,
+            address=address,
+            function_name=function_name,
+            args=args,
+            kwargs=kwargs,
+            account=account,
+            raw_return=raw_return,
+            transaction_hash_variant=transaction_hash_variant,
+            lazy=lazy,
+        )
+
+    async def read_contracts(
+        self,
+        reads: List[ContractRead],
+        account: Optional[LocalAccount] = None,
+        raw_return: bool = False,
+        transaction_hash_variant: TransactionHashVariant = TransactionHashVariant.LATEST_FINAL,
+        lazy: bool = False,
+        batch_size: int = 100,
+        return_exceptions: bool = False,
+    ):
+        return await read_contracts(
+            self=self,
+            reads=reads,
+            account=account,
+            raw_return=raw_return,
+            transaction_hash_variant=transaction_hash_variant,
+            lazy=lazy,
+            batch_size=batch_size,
+            return_exceptions=return_exceptions,
+        )
+
+    async def write_contract(
+        self,
+        address: Union[Address, ChecksumAddress],
+        function_name: str,
+        account: Optional[LocalAccount] = None,
+        consensus_max_rotations: Optional[int] = None,
+        value: int = 0,
+        leader_only: bool = False,
+        args: Optional[List[CalldataEncodable]] = None,
+        kwargs: Optional[Dict[str, CalldataEncodable]] = None,
+    ):
+        return await write_contract(
+            self=self,
+            address=address,
+            function_name=function_name,
+            account=account,
+            consensus_max_rotations=consensus_max_rotations,
+            value=value,
+            leader_only=leader_only,
+            args=args,
+            kwargs=kwargs,
+        )
+
+    async def deploy_contract(
+        self,
+        code: Union[str, bytes],
+        account: Optional[LocalAccount] = None,
+        args: Optional[List[CalldataEncodable]] = None,
+        kwargs: Optional[Dict[str, CalldataEncodable]] = None,
+        consensus_max_rotations: Optional[int] = None,
+        leader_only: bool = False,
+    ):
+        return await deploy_contract(
+            self=self,
+            code=code,
+            account=account,
+            args=args,
+            kwargs=kwargs,
+            consensus_max_rotations=consensus_max_rotations,
+            leader_only=leader_only,
+        )
+
+    async def get_contract_schema(
+        self,
+        address: Union[Address, ChecksumAddress],
+    ) -> ContractSchema:
+        return await get_contract_schema(
+            self=self,
+            address=address,
+        )
+
+    async def get_contract_schema_for_code(
+        self,
+        contract_code: AnyStr,
+    ) -> ContractSchema:
+        return await get_contract_schema_for_code(
+            self=self,
+            contract_code=contract_code,
+        )
+
+    # Transaction actions
+    async def wait_for_transaction_receipt(
+        self,
+        transaction_hash: _Hash32,
+        status: TransactionStatus = TransactionStatus.ACCEPTED,
+        interval: int = transaction_config.wait_interval,
+        retries: int = transaction_config.retries,
+        timeout: Optional[float] = None,
+        on_status: Optional[StatusCallback] = None,
+        clock: Optional[AsyncClock] = None,
+    ) -> GenLayerTransaction:
+        return await wait_for_transaction_receipt(
+            self=self,
+            transaction_hash=transaction_hash,
+            status=status,
+            interval=interval,
+            retries=retries,
+            timeout=timeout,
+            on_status=on_status,
+            clock=clock,
+        )
+
+    async def get_transaction(
+        self,
+        transaction_hash: _Hash32,
+        lazy_calldata: bool = False,
+    ) -> GenLayerTransaction:
+        return await get_transaction(
+            self=self, transaction_hash=transaction_hash, lazy_calldata=lazy_calldata
+        )
+
+    async def appeal_transaction(
+        self,
+        transaction_id: HexStr,
+        account: Optional[LocalAccount] = None,
+        value: int = 0,
+    ):
+        return await appeal_transaction(
+            self=self,
+            transaction_id=transaction_id,
+            account=account,
+            value=value,
+        )
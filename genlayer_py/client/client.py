@@ -2,17 +2,64 @@ from typing import Optional
 from genlayer_py.types import GenLayerChain
 from genlayer_py.chains import localnet
 from .genlayer_client import GenLayerClient
+from .async_genlayer_client import AsyncGenLayerClient
 from eth_account.signers.local import LocalAccount
+from genlayer_py.config.provider import ProviderConfig, RateLimitConfig, RetryConfig
+from genlayer_py.provider import RequestHooks, ResponseCache
+from genlayer_py.accounts.nonce import AsyncNonceManager, NonceManager
 
 
 def create_client(
     chain: GenLayerChain = localnet,
     endpoint: Optional[str] = None,
     account: Optional[LocalAccount] = None,
+    provider_config: Optional[ProviderConfig] = None,
+    retry_config: Optional[RetryConfig] = None,
+    cache: Optional[ResponseCache] = None,
+    hooks: Optional[RequestHooks] = None,
+    rate_limit: Optional[RateLimitConfig] = None,
+    nonce_manager: Optional[NonceManager] = None,
 ) -> GenLayerClient:
     chain_config = chain or localnet
     if endpoint is not None:
         chain_config.rpc_urls["default"]["http"] = [endpoint]
-    client = GenLayerClient(chain_config, account)
+    client = GenLayerClient(
+        chain_config,
+        account,
+        provider_config,
+        retry_config,
+        cache,
+        hooks,
+        rate_limit,
+        nonce_manager,
+    )
     client.initialize_consensus_smart_contract()
     return client
+
+
+async def create_async_client(
+    chain: GenLayerChain = localnet,
+    endpoint: Optional[str] = None,
+    account: Optional[LocalAccount] = None,
+    provider_config: Optional[ProviderConfig] = None,
+    retry_config: Optional[RetryConfig] = None,
+    cache: Optional[ResponseCache] = None,
+    hooks: Optional[RequestHooks] = None,
+    rate_limit: Optional[RateLimitConfig] = None,
+    nonce_manager: Optional[AsyncNonceManager] = None,
+) -> AsyncGenLayerClient:
+    chain_config = chain or localnet
+    if endpoint is not None:
+        chain_config.rpc_urls["default"]["http"] = [endpoint]
+    client = AsyncGenLayerClient(
+        chain_config,
+        account,
+        provider_config,
+        retry_config,
+        cache,
+        hooks,
+        rate_limit,
+        nonce_manager,
+    )
+    await client.initialize_consensus_smart_contract()
+    return client
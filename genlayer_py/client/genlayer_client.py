@@ -10,14 +10,25 @@ from genlayer_py.types import (
     TransactionStatus,
     CalldataEncodable,
     GenLayerTransaction,
+    ContractRead,
     ContractSchema,
     TransactionHashVariant,
 )
-from genlayer_py.provider import GenLayerProvider
-from typing import Optional, Union, List, Dict
+from genlayer_py.provider import (
+    GenLayerProvider,
+    Metrics,
+    MultiEndpointProvider,
+    RequestHooks,
+    ResponseCache,
+    WebSocketProvider,
+)
+from typing import Optional, Union, List, Dict, Iterable
+from concurrent.futures import Future
+from genlayer_py.accounts.nonce import NonceManager
 from genlayer_py.accounts.actions import get_current_nonce, fund_account
 from genlayer_py.contracts.actions import (
     read_contract,
+    read_contracts,
     write_contract,
     deploy_contract,
     appeal_transaction,
@@ -29,7 +40,16 @@ from genlayer_py.transactions.actions import (
     wait_for_transaction_receipt,
     get_transaction,
 )
+from genlayer_py.transactions.watcher import TransactionWatcher, transaction_watcher
+from genlayer_py.contracts.pending import PendingTransaction, close_resolver
+from genlayer_py.transactions.polling import Clock, StatusCallback
 from genlayer_py.config import transaction_config
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.config.provider import (
+    ProviderConfig,
+    RateLimitConfig,
+    RetryConfig,
+)
 
 
 class GenLayerClient(Eth):
@@ -38,16 +58,79 @@ class GenLayerClient(Eth):
     """
 
     def __init__(
-        self, chain_config: GenLayerChain, account: Optional[LocalAccount] = None
+        self,
+        chain_config: GenLayerChain,
+        account: Optional[LocalAccount] = None,
+        provider_config: Optional[ProviderConfig] = None,
+        retry_config: Optional[RetryConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        hooks: Optional[RequestHooks] = None,
+        rate_limit: Optional[RateLimitConfig] = None,
+        nonce_manager: Optional[NonceManager] = None,
     ):
         self.chain = chain_config
         self.local_account = account
-        url = chain_config.rpc_urls["default"]["http"][0]
-        self.provider = GenLayerProvider(url)
+        self.nonce_manager = nonce_manager
+        urls = chain_config.rpc_urls["default"]["http"]
+        metrics = Metrics(hooks)
+        if urls[0].startswith(("ws://", "wss://")):
+            if len(urls) > 1:
+                raise GenLayerError("a WebSocket endpoint can not be combined")
+            self.provider = WebSocketProvider(
+                urls[0],
+                provider_config,
+                retry_config,
+                cache,
+                metrics=metrics,
+                rate_limit=rate_limit,
+            )
+        elif len(urls) > 1:
+            self.provider = MultiEndpointProvider(
+                urls,
+                provider_config,
+                retry=retry_config,
+                cache=cache,
+                metrics=metrics,
+                rate_limit=rate_limit,
+            )
+        else:
+            self.provider = GenLayerProvider(
+                urls[0],
+                provider_config,
+                retry_config,
+                cache,
+                metrics=metrics,
+                rate_limit=rate_limit,
+            )
         web3 = Web3(provider=self.provider)
 
         super().__init__(web3)
 
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the call count, errors, latency percentiles and byte sizes of
+        each RPC method and action called so far, see ``Metrics.snapshot``.
+        """
+        return self.provider.metrics.snapshot()
+
+    def rate_limits(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Returns the requests queued and in flight, and the time spent in
+        line, per endpoint and method class, see ``RateLimiter.snapshot``.
+        Empty when the client was created without ``rate_limit``.
+        """
+        return self.provider.rate_limits()
+
+    def close(self) -> None:
+        """
+        Stops the transaction watchers and the threads resolving pending
+        transactions, then closes the provider.
+        """
+        for watcher in self.__dict__.pop("_transaction_watchers", {}).values():
+            watcher.close()
+        close_resolver(self)
+        self.provider.close()
+
     ## Account actions
     def fund_account(
         self, address: Union[Address, ChecksumAddress, ENS], amount: int
@@ -78,6 +161,7 @@ class GenLayerClient(Eth):
         account: Optional[LocalAccount] = None,
         raw_return: bool = False,
         transaction_hash_variant: TransactionHashVariant = TransactionHashVariant.LATEST_FINAL,
+        lazy: bool = False,
     ):
         return read_contract(
             self=self,
@@ -88,6 +172,28 @@ class GenLayerClient(Eth):
             account=account,
             raw_return=raw_return,
             transaction_hash_variant=transaction_hash_variant,
+            lazy=lazy,
+        )
+
+    def read_contracts(
+        self,
+        reads: List[ContractRead],
+        account: Optional[LocalAccount] = None,
+        raw_return: bool = False,
+        transaction_hash_variant: TransactionHashVariant = TransactionHashVariant.LATEST_FINAL,
+        lazy: bool = False,
+        batch_size: int = 100,
+        return_exceptions: bool = False,
+    ):
+        return read_contracts(
+            self=self,
+            reads=reads,
+            account=account,
+            raw_return=raw_return,
+            transaction_hash_variant=transaction_hash_variant,
+            lazy=lazy,
+            batch_size=batch_size,
+            return_exceptions=return_exceptions,
         )
 
     def write_contract(
@@ -100,7 +206,8 @@ class GenLayerClient(Eth):
         leader_only: bool = False,
         args: Optional[List[CalldataEncodable]] = None,
         kwargs: Optional[Dict[str, CalldataEncodable]] = None,
-    ):
+        wait_for_receipt: bool = True,
+    ) -> Union[HexStr, PendingTransaction]:
         return write_contract(
             self=self,
             address=address,
@@ -111,6 +218,7 @@ class GenLayerClient(Eth):
             leader_only=leader_only,
             args=args,
             kwargs=kwargs,
+            wait_for_receipt=wait_for_receipt,
         )
 
     def deploy_contract(
@@ -121,7 +229,8 @@ class GenLayerClient(Eth):
         kwargs: Optional[Dict[str, CalldataEncodable]] = None,
         consensus_max_rotations: Optional[int] = None,
         leader_only: bool = False,
-    ):
+        wait_for_receipt: bool = True,
+    ) -> Union[HexStr, PendingTransaction]:
         return deploy_contract(
             self=self,
             code=code,
@@ -130,6 +239,7 @@ class GenLayerClient(Eth):
             kwargs=kwargs,
             consensus_max_rotations=consensus_max_rotations,
             leader_only=leader_only,
+            wait_for_receipt=wait_for_receipt,
         )
 
     def get_contract_schema(
@@ -157,6 +267,9 @@ class GenLayerClient(Eth):
         status: TransactionStatus = TransactionStatus.ACCEPTED,
         interval: int = transaction_config.wait_interval,
         retries: int = transaction_config.retries,
+        timeout: Optional[float] = None,
+        on_status: Optional[StatusCallback] = None,
+        clock: Optional[Clock] = None,
     ) -> GenLayerTransaction:
         return wait_for_transaction_receipt(
             self=self,
@@ -164,13 +277,39 @@ class GenLayerClient(Eth):
             status=status,
             interval=interval,
             retries=retries,
+            timeout=timeout,
+            on_status=on_status,
+            clock=clock,
+        )
+
+    def transaction_watcher(self, logs: bool = False) -> TransactionWatcher:
+        return transaction_watcher(self, logs=logs)
+
+    def watch_transactions(
+        self,
+        transaction_hashes: Iterable[_Hash32],
+        status: TransactionStatus = TransactionStatus.ACCEPTED,
+        timeout: Optional[float] = None,
+        logs: bool = False,
+    ) -> List[Future]:
+        """
+        Returns a future per transaction, resolved once it reaches
+        ``status``, see ``TransactionWatcher``. With ``logs``, transactions
+        are confirmed from the consensus events, see
+        ``LogTransactionWatcher``.
+        """
+        return transaction_watcher(self, logs=logs).watch_many(
+            transaction_hashes, status=status, timeout=timeout
         )
 
     def get_transaction(
         self,
         transaction_hash: _Hash32,
+        lazy_calldata: bool = False,
     ) -> GenLayerTransaction:
-        return get_transaction(self=self, transaction_hash=transaction_hash)
+        return get_transaction(
+            self=self, transaction_hash=transaction_hash, lazy_calldata=lazy_calldata
+        )
 
     def appeal_transaction(
         self,
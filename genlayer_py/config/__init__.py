@@ -1 +1,9 @@
 from .transactions import transaction_config
+from .calldata import calldata_config
+from .provider import (
+    provider_config,
+    routing_config,
+    retry_config,
+    cache_config,
+    rate_limit_config,
+)
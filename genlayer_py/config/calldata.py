@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class CalldataConfig:
+    cache_size: int  # Entries per encoding cache
+
+
+calldata_config = CalldataConfig(
+    cache_size=4096,
+)
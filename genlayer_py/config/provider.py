@@ -0,0 +1,126 @@
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional
+
+
+@dataclass
+class ProviderConfig:
+    pool_size: int  # Connections kept open per host
+    keep_alive: bool
+    connect_timeout: Optional[float]  # Timeout in seconds, None waits forever
+    read_timeout: Optional[float]  # Timeout in seconds, None waits forever
+    proxies: Optional[Dict[str, str]] = None  # Same format as requests proxies
+    compression: bool = True  # Accept gzip or deflate compressed responses
+
+
+provider_config = ProviderConfig(
+    pool_size=10,
+    keep_alive=True,
+    connect_timeout=10.0,
+    read_timeout=None,
+)
+
+
+@dataclass
+class RoutingConfig:
+    failure_threshold: int  # Consecutive failures that eject an endpoint
+    cooldown: float  # Seconds before an ejected endpoint is probed again
+    latency_smoothing: float  # Weight of the newest sample in the averages
+
+
+routing_config = RoutingConfig(
+    failure_threshold=3,
+    cooldown=30.0,
+    latency_smoothing=0.3,
+)
+
+
+@dataclass
+class RetryConfig:
+    max_attempts: int  # Attempts for idempotent methods, 1 disables retries
+    base_delay: float  # Seconds before the first retry, doubled for each retry
+    max_delay: float  # Upper bound of a retry delay in seconds
+    hedge: bool  # Duplicate idempotent requests that are slower than usual
+    hedge_quantile: float  # Latency quantile after which a request is duplicated
+    hedge_min_samples: int  # Latencies of a method needed before hedging it
+    idempotent_methods: FrozenSet[str] = frozenset(
+        {
+            "gen_call",
+            "gen_getContractSchema",
+            "gen_getContractSchemaForCode",
+            "sim_getConsensusContract",
+            "eth_blockNumber",
+            "eth_call",
+            "eth_chainId",
+            "eth_estimateGas",
+            "eth_getBalance",
+            "eth_getBlockByHash",
+            "eth_getBlockByNumber",
+            "eth_getCode",
+            "eth_getLogs",
+            "eth_getTransactionByHash",
+            "eth_getTransactionCount",
+            "eth_getTransactionReceipt",
+        }
+    )
+
+
+retry_config = RetryConfig(
+    max_attempts=3,
+    base_delay=0.1,
+    max_delay=2.0,
+    hedge=False,
+    hedge_quantile=0.95,
+    hedge_min_samples=20,
+)
+
+
+@dataclass
+class CacheConfig:
+    max_bytes: int  # Size of the cached responses, least recently used go first
+    ttls: Dict[str, Optional[float]]  # Seconds a method is cached, None for ever
+    path: Optional[str] = None  # File the cache is loaded from and saved to
+
+
+cache_config = CacheConfig(
+    max_bytes=16 * 1024 * 1024,
+    ttls={
+        "eth_chainId": None,
+        "eth_getTransactionByHash": None,  # once finalized only
+        "gen_getContractSchema": 300.0,
+        "gen_getContractSchemaForCode": None,
+        "sim_getConsensusContract": 3600.0,
+    },
+)
+
+
+@dataclass
+class RateLimit:
+    rate: Optional[float]  # Requests per second, None for no limit
+    burst: int  # Requests that can be sent at once after a quiet period
+    max_in_flight: Optional[int]  # Requests awaiting an answer, None for no limit
+
+
+@dataclass
+class RateLimitConfig:
+    limits: Dict[str, RateLimit]  # Limit of each method class
+    method_classes: Dict[str, str]  # Class of a method, others are "read"
+    # Limits of each method class for the endpoint URLs that differ
+    endpoints: Dict[str, Dict[str, RateLimit]] = field(default_factory=dict)
+
+
+rate_limit_config = RateLimitConfig(
+    limits={
+        "read": RateLimit(rate=50.0, burst=50, max_in_flight=20),
+        "write": RateLimit(rate=10.0, burst=10, max_in_flight=5),
+        "poll": RateLimit(rate=10.0, burst=10, max_in_flight=10),
+    },
+    method_classes={
+        "eth_sendRawTransaction": "write",
+        "eth_sendTransaction": "write",
+        "sim_fundAccount": "write",
+        "eth_blockNumber": "poll",
+        "eth_getLogs": "poll",
+        "eth_getTransactionByHash": "poll",
+        "eth_getTransactionReceipt": "poll",
+    },
+)
@@ -3,8 +3,11 @@ from dataclasses import dataclass
 
 @dataclass
 class TransactionConfig:
-    wait_interval: int  # Interval in ms
-    retries: int
+    wait_interval: int  # Longest interval between polls in ms
+    retries: int  # Polls that make up the default timeout, with wait_interval
+    poll_interval: int = 50  # First interval between polls in ms
+    poll_backoff: float = 1.5  # Growth of the interval after each poll
+    watcher_batch_rate: float = 10.0  # Most batches a watcher sends per second
 
 
 transaction_config = TransactionConfig(
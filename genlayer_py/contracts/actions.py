@@ -2,19 +2,23 @@ from __future__ import annotations
 from eth_account.signers.local import LocalAccount
 import eth_utils
 from eth_abi import encode as abi_encode
-from typing import TYPE_CHECKING, Optional, Union, List, Dict, AnyStr, Any
+from typing import TYPE_CHECKING, Optional, Union, List, Dict, AnyStr, Any, Tuple
 from eth_typing import Address, ChecksumAddress, HexStr
 from genlayer_py.types import (
     CalldataEncodable,
+    ContractRead,
     ContractSchema,
     TransactionHashVariant,
 )
 from genlayer_py.exceptions import GenLayerError
+from genlayer_py.provider.metrics import instrumented
 from genlayer_py.abi import calldata
 from genlayer_py.abi.transactions import serialize
 from genlayer_py.chains import localnet
 from web3.constants import ADDRESS_ZERO
 from web3.logs import DISCARD
+from genlayer_py.accounts.nonce import is_nonce_error
+from .pending import PendingTransaction
 
 if TYPE_CHECKING:
     from genlayer_py.client import GenLayerClient
@@ -35,6 +39,7 @@ def make_calldata_object(
     return ret
 
 
+@instrumented
 def get_contract_schema(
     self: GenLayerClient,
     address: Union[Address, ChecksumAddress],
@@ -48,6 +53,7 @@ def get_contract_schema(
     return response["result"]
 
 
+@instrumented
 def get_contract_schema_for_code(
     self: GenLayerClient,
     contract_code: AnyStr,
@@ -62,6 +68,7 @@ def get_contract_schema_for_code(
     return response["result"]
 
 
+@instrumented
 def read_contract(
     self: GenLayerClient,
     address: Union[Address, ChecksumAddress],
@@ -71,36 +78,148 @@ def read_contract(
     account: Optional[LocalAccount] = None,
     raw_return: bool = False,
     transaction_hash_variant: TransactionHashVariant = TransactionHashVariant.LATEST_FINAL,
+    lazy: bool = False,
 ) -> CalldataEncodable:
     if account is None and self.local_account is None:
         raise GenLayerError("No account provided and no account is connected")
     sender_address = self.local_account.address
+    request_params = _make_read_params(
+        address=address,
+        function_name=function_name,
+        args=args,
+        kwargs=kwargs,
+        sender_address=sender_address,
+        transaction_hash_variant=transaction_hash_variant,
+    )
+    response = self.provider.make_request(
+        method="gen_call",
+        params=[request_params],
+    )
+    return _decode_read_result(response["result"], raw_return=raw_return, lazy=lazy)
+
+
+@instrumented
+def read_contracts(
+    self: GenLayerClient,
+    reads: List[ContractRead],
+    account: Optional[LocalAccount] = None,
+    raw_return: bool = False,
+    transaction_hash_variant: TransactionHashVariant = TransactionHashVariant.LATEST_FINAL,
+    lazy: bool = False,
+    batch_size: int = 100,
+    return_exceptions: bool = False,
+) -> List[Union[CalldataEncodable, GenLayerError]]:
+    """
+    Runs many ``read_contract`` calls as JSON-RPC batches of ``batch_size``
+    calls, one round trip per batch, and returns the results in order.
+
+    A failed read raises ``GenLayerError`` unless ``return_exceptions`` is
+    set, in which case its error takes its place in the results.
+    """
+    calls = _make_read_calls(self, reads, account, transaction_hash_variant, batch_size)
+    results: List[Union[CalldataEncodable, GenLayerError]] = []
+    for start in range(0, len(calls), batch_size):
+        responses = self.provider.make_batch_request(calls[start : start + batch_size])
+        results.extend(
+            _decode_read_responses(
+                reads[start : start + batch_size],
+                responses,
+                raw_return=raw_return,
+                lazy=lazy,
+                return_exceptions=return_exceptions,
+            )
+        )
+    return results
+
+
+def _make_read_calls(
+    self: GenLayerClient,
+    reads: List[ContractRead],
+    account: Optional[LocalAccount],
+    transaction_hash_variant: TransactionHashVariant,
+    batch_size: int,
+) -> List[Tuple[str, List[Any]]]:
+    sender_account = account if account is not None else self.local_account
+    if sender_account is None:
+        raise GenLayerError("No account provided and no account is connected")
+    if batch_size < 1:
+        raise GenLayerError(f"batch_size must be positive, got {batch_size}")
+    return [
+        (
+            "gen_call",
+            [
+                _make_read_params(
+                    address=read["address"],
+                    function_name=read["function_name"],
+                    args=read.get("args"),
+                    kwargs=read.get("kwargs"),
+                    sender_address=sender_account.address,
+                    transaction_hash_variant=transaction_hash_variant,
+                )
+            ],
+        )
+        for read in reads
+    ]
+
+
+def _decode_read_responses(
+    reads: List[ContractRead],
+    responses: List[Dict[str, Any]],
+    raw_return: bool,
+    lazy: bool,
+    return_exceptions: bool,
+) -> List[Union[CalldataEncodable, GenLayerError]]:
+    results: List[Union[CalldataEncodable, GenLayerError]] = []
+    for read, response in zip(reads, responses):
+        try:
+            if response.get("error") is not None:
+                raise GenLayerError(
+                    f"{read['function_name']} failed: "
+                    f"{response['error'].get('message')}"
+                )
+            results.append(
+                _decode_read_result(
+                    response["result"], raw_return=raw_return, lazy=lazy
+                )
+            )
+        except GenLayerError as err:
+            if not return_exceptions:
+                raise
+            results.append(err)
+    return results
+
+
+def _make_read_params(
+    address: Union[Address, ChecksumAddress],
+    function_name: str,
+    args: Optional[List[CalldataEncodable]],
+    kwargs: Optional[Dict[str, CalldataEncodable]],
+    sender_address: Union[Address, ChecksumAddress],
+    transaction_hash_variant: TransactionHashVariant,
+) -> Dict[str, Any]:
     data = [
-        calldata.encode(
-            make_calldata_object(method=function_name, args=args, kwargs=kwargs)
-        ),
+        calldata.prepare_call(function_name).encode(args=args, kwargs=kwargs),
         b"\x00",
     ]
-    serialized_data = serialize(data)
-    request_params = {
+    return {
         "type": "read",
         "to": address,
         "from": sender_address,
-        "data": serialized_data,
+        "data": serialize(data),
         "transaction_hash_variant": transaction_hash_variant.value,
     }
-    response = self.provider.make_request(
-        method="gen_call",
-        params=[request_params],
-    )
-    enc_result = response["result"]
+
+
+def _decode_read_result(
+    enc_result: str, raw_return: bool, lazy: bool
+) -> CalldataEncodable:
     prefixed_result = "0x" + enc_result
     if raw_return:
         return prefixed_result
-    result = calldata.decode(eth_utils.hexadecimal.decode_hex(prefixed_result))
-    return result
+    return calldata.decode(eth_utils.hexadecimal.decode_hex(prefixed_result), lazy=lazy)
 
 
+@instrumented
 def write_contract(
     self: GenLayerClient,
     address: Union[Address, ChecksumAddress],
@@ -111,17 +230,17 @@ def write_contract(
     leader_only: bool = False,
     args: Optional[List[CalldataEncodable]] = None,
     kwargs: Optional[Dict[str, CalldataEncodable]] = None,
-):
+    wait_for_receipt: bool = True,
+) -> Union[HexStr, PendingTransaction]:
+    """
+    Sends a transaction calling ``function_name`` and returns its GenLayer
+    transaction id once mined. With ``wait_for_receipt`` unset, returns a
+    ``PendingTransaction`` right after the broadcast instead.
+    """
     if consensus_max_rotations is None:
         consensus_max_rotations = self.chain.default_consensus_max_rotations
-    data = [
-        calldata.encode(
-            make_calldata_object(method=function_name, args=args, kwargs=kwargs)
-        ),
-        leader_only,
-    ]
     sender_account = account if account is not None else self.local_account
-    serialized_data = serialize(data)
+    serialized_data = _make_write_data(function_name, args, kwargs, leader_only)
     encoded_data = _encode_add_transaction_data(
         self=self,
         sender_account=sender_account,
@@ -134,9 +253,11 @@ def write_contract(
         encoded_data=encoded_data,
         sender_account=sender_account,
         value=value,
+        wait_for_receipt=wait_for_receipt,
     )
 
 
+@instrumented
 def deploy_contract(
     self: GenLayerClient,
     code: Union[str, bytes],
@@ -145,15 +266,14 @@ def deploy_contract(
     kwargs: Optional[Dict[str, CalldataEncodable]] = None,
     consensus_max_rotations: Optional[int] = None,
     leader_only: bool = False,
-):
+    wait_for_receipt: bool = True,
+) -> Union[HexStr, PendingTransaction]:
+    """
+    Sends a transaction deploying ``code``, see ``write_contract``.
+    """
     if consensus_max_rotations is None:
         consensus_max_rotations = self.chain.default_consensus_max_rotations
-    data = [
-        code,
-        calldata.encode(make_calldata_object(method=None, args=args, kwargs=kwargs)),
-        leader_only,
-    ]
-    serialized_data = serialize(data)
+    serialized_data = _make_deploy_data(code, args, kwargs, leader_only)
     sender_account = account if account is not None else self.local_account
 
     encoded_data = _encode_add_transaction_data(
@@ -167,9 +287,38 @@ def deploy_contract(
         self=self,
         encoded_data=encoded_data,
         sender_account=sender_account,
+        wait_for_receipt=wait_for_receipt,
     )
 
 
+def _make_write_data(
+    function_name: str,
+    args: Optional[List[CalldataEncodable]],
+    kwargs: Optional[Dict[str, CalldataEncodable]],
+    leader_only: bool,
+) -> HexStr:
+    data = [
+        calldata.prepare_call(function_name).encode(args=args, kwargs=kwargs),
+        leader_only,
+    ]
+    return serialize(data)
+
+
+def _make_deploy_data(
+    code: Union[str, bytes],
+    args: Optional[List[CalldataEncodable]],
+    kwargs: Optional[Dict[str, CalldataEncodable]],
+    leader_only: bool,
+) -> HexStr:
+    data = [
+        code,
+        calldata.prepare_call(None).encode(args=args, kwargs=kwargs),
+        leader_only,
+    ]
+    return serialize(data)
+
+
+@instrumented
 def appeal_transaction(
     self: GenLayerClient,
     transaction_id: HexStr,
@@ -240,12 +389,47 @@ def _prepare_transaction(
     recipient: Union[Address, ChecksumAddress],
     data: HexStr,
     value: int = 0,
-) -> Dict[str, Any]:
+) -> Tuple[Dict[str, Any], Optional[int]]:
+    generation = None
+    if self.nonce_manager is None:
+        nonce = self.get_current_nonce(address=sender)
+    else:
+        nonce, generation = self.nonce_manager.acquire(
+            sender, lambda address: self.get_current_nonce(address, "pending")
+        )
+    try:
+        latest_block = None
+        if self.chain.id != localnet.id:
+            latest_block = self.w3.eth.get_block("latest")
+        transaction = _make_transaction(
+            self=self,
+            sender=sender,
+            recipient=recipient,
+            data=data,
+            value=value,
+            nonce=nonce,
+            latest_block=latest_block,
+        )
+        estimated_gas_response = self.provider.make_request(
+            "eth_estimateGas", params=[transaction]
+        )
+        return _with_gas_estimate(transaction, estimated_gas_response), generation
+    except Exception:
+        if self.nonce_manager is not None:
+            self.nonce_manager.release(sender, nonce, generation)
+        raise
 
-    nonce = self.get_current_nonce(address=sender)
 
-    if self.chain.id != localnet.id:
-        latest_block = self.w3.eth.get_block("latest")
+def _make_transaction(
+    self: GenLayerClient,
+    sender: Union[Address, ChecksumAddress],
+    recipient: Union[Address, ChecksumAddress],
+    data: HexStr,
+    value: int,
+    nonce: int,
+    latest_block: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    if latest_block is not None:
         base_fee = latest_block["baseFeePerGas"]
         priority_fee = self.w3.to_wei(2, "gwei")
         max_fee = base_fee + priority_fee
@@ -258,7 +442,7 @@ def _prepare_transaction(
             "gasPrice": 0,
         }
 
-    transaction = {
+    return {
         "from": sender,
         "nonce": hex(nonce),
         "data": data,
@@ -267,9 +451,11 @@ def _prepare_transaction(
         **fee_data,
         "chainId": self.chain.id,
     }
-    estimated_gas_response = self.provider.make_request(
-        "eth_estimateGas", params=[transaction]
-    )
+
+
+def _with_gas_estimate(
+    transaction: Dict[str, Any], estimated_gas_response: Dict[str, Any]
+) -> Dict[str, Any]:
     if estimated_gas_response.get("error") is not None:
         raise GenLayerError(
             f"Error eth_estimateGas endpoint: {estimated_gas_response['error']['message']}"
@@ -283,7 +469,65 @@ def _send_transaction(
     encoded_data: HexStr,
     sender_account: Optional[LocalAccount] = None,
     value: int = 0,
-):
+    wait_for_receipt: bool = True,
+) -> Union[HexStr, PendingTransaction]:
+    _check_can_send(self, sender_account)
+    transaction, generation = _prepare_transaction(
+        self=self,
+        sender=sender_account.address,
+        recipient=self.chain.consensus_main_contract["address"],
+        data=encoded_data,
+        value=value,
+    )
+    try:
+        signed_transaction = sender_account.sign_transaction(transaction)
+    except Exception:
+        if self.nonce_manager is not None:
+            self.nonce_manager.release(
+                sender_account.address, int(transaction["nonce"], 16), generation
+            )
+        raise
+    serialized_transaction = self.w3.to_hex(signed_transaction.raw_transaction)
+
+    try:
+        response = self.provider.make_request(
+            method="eth_sendRawTransaction", params=[serialized_transaction]
+        )
+    except Exception:
+        # the node may have the transaction or not, ask it again
+        if self.nonce_manager is not None:
+            self.nonce_manager.reset(sender_account.address)
+        raise
+    tx_hash = _sent_transaction_hash(
+        self, sender_account.address, transaction["nonce"], generation, response
+    )
+    if not wait_for_receipt:
+        return PendingTransaction(self, tx_hash)
+    tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+    return _transaction_id_from_receipt(self, tx_receipt)
+
+
+def _sent_transaction_hash(
+    self: GenLayerClient,
+    sender: Union[Address, ChecksumAddress],
+    nonce: str,
+    generation: Optional[int],
+    response: Dict[str, Any],
+) -> HexStr:
+    error = response.get("error")
+    if error is None:
+        return response["result"]
+    if self.nonce_manager is not None:
+        if is_nonce_error(error.get("message", "")):
+            self.nonce_manager.reset(sender)
+        else:
+            self.nonce_manager.release(sender, int(nonce, 16), generation)
+    raise GenLayerError(f"Error eth_sendRawTransaction endpoint: {error['message']}")
+
+
+def _check_can_send(
+    self: GenLayerClient, sender_account: Optional[LocalAccount]
+) -> None:
     if sender_account is None:
         raise GenLayerError(
             "No account set. Configure the client with an account or pass an account to this function."
@@ -294,21 +538,8 @@ def _send_transaction(
             "Consensus main contract not initialized. Please ensure client is properly initialized.",
         )
 
-    transaction = _prepare_transaction(
-        self=self,
-        sender=sender_account.address,
-        recipient=self.chain.consensus_main_contract["address"],
-        data=encoded_data,
-        value=value,
-    )
-    signed_transaction = sender_account.sign_transaction(transaction)
-    serialized_transaction = self.w3.to_hex(signed_transaction.raw_transaction)
-
-    tx_hash = self.provider.make_request(
-        method="eth_sendRawTransaction", params=[serialized_transaction]
-    )["result"]
-    tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
 
+def _transaction_id_from_receipt(self: GenLayerClient, tx_receipt: Any) -> HexStr:
     if tx_receipt.status != 1:
         raise GenLayerError("Transaction failed")
 
@@ -0,0 +1,287 @@
+from __future__ import annotations
+import asyncio
+from eth_account.signers.local import LocalAccount
+import eth_utils
+from typing import TYPE_CHECKING, Optional, Union, List, Dict, AnyStr, Any, Tuple
+from eth_typing import Address, ChecksumAddress, HexStr
+from genlayer_py.types import (
+    CalldataEncodable,
+    ContractRead,
+    ContractSchema,
+    TransactionHashVariant,
+)
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.provider.metrics import instrumented
+from genlayer_py.chains import localnet
+from web3.constants import ADDRESS_ZERO
+from .actions import (
+    _check_can_send,
+    _decode_read_responses,
+    _decode_read_result,
+    _encode_add_transaction_data,
+    _encode_submit_appeal_data,
+    _make_deploy_data,
+    _make_read_calls,
+    _make_read_params,
+    _make_transaction,
+    _make_write_data,
+    _sent_transaction_hash,
+    _transaction_id_from_receipt,
+    _with_gas_estimate,
+)
+
+if TYPE_CHECKING:
+    from genlayer_py.client import AsyncGenLayerClient
+
+
+@instrumented
+async def get_contract_schema(
+    self: AsyncGenLayerClient,
+    address: Union[Address, ChecksumAddress],
+) -> ContractSchema:
+    if self.chain.id != localnet.id:
+        raise GenLayerError("Contract schema is not supported on this network")
+
+    response = await self.provider.make_request(
+        method="gen_getContractSchema", params=[address]
+    )
+    return response["result"]
+
+
+@instrumented
+async def get_contract_schema_for_code(
+    self: AsyncGenLayerClient,
+    contract_code: AnyStr,
+) -> ContractSchema:
+    if self.chain.id != localnet.id:
+        raise GenLayerError("Contract schema is not supported on this network")
+
+    response = await self.provider.make_request(
+        method="gen_getContractSchemaForCode",
+        params=[eth_utils.hexadecimal.encode_hex(contract_code)],
+    )
+    return response["result"]
+
+
+@instrumented
+async def read_contract(
+    self: AsyncGenLayerClient,
+    address: Union[Address, ChecksumAddress],
+    function_name: str,
+    args: Optional[List[CalldataEncodable]] = None,
+    kwargs: Optional[Dict[str, CalldataEncodable]] = None,
+    account: Optional[LocalAccount] = None,
+    raw_return: bool = False,
+    transaction_hash_variant: TransactionHashVariant = TransactionHashVariant.LATEST_FINAL,
+    lazy: bool = False,
+) -> CalldataEncodable:
+    if account is None and self.local_account is None:
+        raise GenLayerError("No account provided and no account is connected")
+    sender_address = self.local_account.address
+    request_params = _make_read_params(
+        address=address,
+        function_name=function_name,
+        args=args,
+        kwargs=kwargs,
+        sender_address=sender_address,
+        transaction_hash_variant=transaction_hash_variant,
+    )
+    response = await self.provider.make_request(
+        method="gen_call",
+        params=[request_params],
+    )
+    return _decode_read_result(response["result"], raw_return=raw_return, lazy=lazy)
+
+
+@instrumented
+async def read_contracts(
+    self: AsyncGenLayerClient,
+    reads: List[ContractRead],
+    account: Optional[LocalAccount] = None,
+    raw_return: bool = False,
+    transaction_hash_variant: TransactionHashVariant = TransactionHashVariant.LATEST_FINAL,
+    lazy: bool = False,
+    batch_size: int = 100,
+    return_exceptions: bool = False,
+) -> List[Union[CalldataEncodable, GenLayerError]]:
+    """
+    The async ``read_contracts``, its batches are sent concurrently.
+    """
+    calls = _make_read_calls(self, reads, account, transaction_hash_variant, batch_size)
+    batches = await asyncio.gather(
+        *(
+            self.provider.make_batch_request(calls[start : start + batch_size])
+            for start in range(0, len(calls), batch_size)
+        )
+    )
+    results: List[Union[CalldataEncodable, GenLayerError]] = []
+    for start, responses in zip(range(0, len(calls), batch_size), batches):
+        results.extend(
+            _decode_read_responses(
+                reads[start : start + batch_size],
+                responses,
+                raw_return=raw_return,
+                lazy=lazy,
+                return_exceptions=return_exceptions,
+            )
+        )
+    return results
+
+
+@instrumented
+async def write_contract(
+    self: AsyncGenLayerClient,
+    address: Union[Address, ChecksumAddress],
+    function_name: str,
+    account: Optional[LocalAccount] = None,
+    consensus_max_rotations: Optional[int] = None,
+    value: int = 0,
+    leader_only: bool = False,
+    args: Optional[List[CalldataEncodable]] = None,
+    kwargs: Optional[Dict[str, CalldataEncodable]] = None,
+):
+    if consensus_max_rotations is None:
+        consensus_max_rotations = self.chain.default_consensus_max_rotations
+    sender_account = account if account is not None else self.local_account
+    serialized_data = _make_write_data(function_name, args, kwargs, leader_only)
+    _check_can_send(self, sender_account)
+    encoded_data = _encode_add_transaction_data(
+        self=self,
+        sender_account=sender_account,
+        recipient=address,
+        consensus_max_rotations=consensus_max_rotations,
+        data=serialized_data,
+    )
+    return await _send_transaction(
+        self=self,
+        encoded_data=encoded_data,
+        sender_account=sender_account,
+        value=value,
+    )
+
+
+@instrumented
+async def deploy_contract(
+    self: AsyncGenLayerClient,
+    code: Union[str, bytes],
+    account: Optional[LocalAccount] = None,
+    args: Optional[List[CalldataEncodable]] = None,
+    kwargs: Optional[Dict[str, CalldataEncodable]] = None,
+    consensus_max_rotations: Optional[int] = None,
+    leader_only: bool = False,
+):
+    if consensus_max_rotations is None:
+        consensus_max_rotations = self.chain.default_consensus_max_rotations
+    serialized_data = _make_deploy_data(code, args, kwargs, leader_only)
+    sender_account = account if account is not None else self.local_account
+    _check_can_send(self, sender_account)
+    encoded_data = _encode_add_transaction_data(
+        self=self,
+        sender_account=sender_account,
+        recipient=ADDRESS_ZERO,
+        consensus_max_rotations=consensus_max_rotations,
+        data=serialized_data,
+    )
+    return await _send_transaction(
+        self=self,
+        encoded_data=encoded_data,
+        sender_account=sender_account,
+    )
+
+
+@instrumented
+async def appeal_transaction(
+    self: AsyncGenLayerClient,
+    transaction_id: HexStr,
+    account: Optional[LocalAccount] = None,
+    value: int = 0,
+):
+    sender_account = account if account is not None else self.local_account
+    _check_can_send(self, sender_account)
+    encoded_data = _encode_submit_appeal_data(self=self, transaction_id=transaction_id)
+    return await _send_transaction(
+        self=self,
+        encoded_data=encoded_data,
+        sender_account=sender_account,
+        value=value,
+    )
+
+
+async def _prepare_transaction(
+    self: AsyncGenLayerClient,
+    sender: Union[Address, ChecksumAddress],
+    recipient: Union[Address, ChecksumAddress],
+    data: HexStr,
+    value: int = 0,
+) -> Tuple[Dict[str, Any], Optional[int]]:
+    latest_block, generation = None, None
+    if self.nonce_manager is not None:
+        nonce, generation = await self.nonce_manager.acquire(
+            sender, lambda address: self.get_current_nonce(address, "pending")
+        )
+    elif self.chain.id != localnet.id:
+        nonce, latest_block = await asyncio.gather(
+            self.get_current_nonce(address=sender), self.get_block("latest")
+        )
+    else:
+        nonce = await self.get_current_nonce(address=sender)
+    try:
+        if latest_block is None and self.chain.id != localnet.id:
+            latest_block = await self.get_block("latest")
+        transaction = _make_transaction(
+            self=self,
+            sender=sender,
+            recipient=recipient,
+            data=data,
+            value=value,
+            nonce=nonce,
+            latest_block=latest_block,
+        )
+        estimated_gas_response = await self.provider.make_request(
+            "eth_estimateGas", params=[transaction]
+        )
+        return _with_gas_estimate(transaction, estimated_gas_response), generation
+    except Exception:
+        if self.nonce_manager is not None:
+            self.nonce_manager.release(sender, nonce, generation)
+        raise
+
+
+async def _send_transaction(
+    self: AsyncGenLayerClient,
+    encoded_data: HexStr,
+    sender_account: Optional[LocalAccount] = None,
+    value: int = 0,
+):
+    _check_can_send(self, sender_account)
+    transaction, generation = await _prepare_transaction(
+        self=self,
+        sender=sender_account.address,
+        recipient=self.chain.consensus_main_contract["address"],
+        data=encoded_data,
+        value=value,
+    )
+    try:
+        signed_transaction = sender_account.sign_transaction(transaction)
+    except Exception:
+        if self.nonce_manager is not None:
+            self.nonce_manager.release(
+                sender_account.address, int(transaction["nonce"], 16), generation
+            )
+        raise
+    serialized_transaction = self.w3.to_hex(signed_transaction.raw_transaction)
+
+    try:
+        response = await self.provider.make_request(
+            method="eth_sendRawTransaction", params=[serialized_transaction]
+        )
+    except Exception:
+        # the node may have the transaction or not, ask it again
+        if self.nonce_manager is not None:
+            self.nonce_manager.reset(sender_account.address)
+        raise
+    tx_hash = _sent_transaction_hash(
+        self, sender_account.address, transaction["nonce"], generation, response
+    )
+    tx_receipt = await self.w3.eth.wait_for_transaction_receipt(tx_hash)
+    return _transaction_id_from_receipt(self, tx_receipt)
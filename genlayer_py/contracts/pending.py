@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+import threading
+import time
+from eth_typing import HexStr
+from web3.exceptions import TimeExhausted
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.config import transaction_config
+from genlayer_py.types import GenLayerTransaction, TransactionStatus
+from genlayer_py.transactions.polling import StatusCallback
+
+if TYPE_CHECKING:
+    from genlayer_py.client import GenLayerClient
+
+# threads resolving transaction ids in the background, per client
+_RESOLVER_THREADS = 4
+_resolver_lock = threading.Lock()
+
+
+class PendingTransaction:
+    """
+    A transaction broadcast to the consensus main contract whose L1 receipt
+    has not been waited for. ``tx_hash`` is its Ethereum transaction hash;
+    its GenLayer ``transaction_id`` is read from the receipt when first
+    asked for, or in the background after ``resolve_in_background``.
+    """
+
+    def __init__(self, client: GenLayerClient, tx_hash: HexStr) -> None:
+        self.client = client
+        self.tx_hash = tx_hash
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+
+    def __repr__(self) -> str:
+        return f"PendingTransaction({self.tx_hash!r})"
+
+    def transaction_id(self, timeout: Optional[float] = None) -> HexStr:
+        """
+        Returns the GenLayer transaction id, waiting up to ``timeout``
+        seconds, by default web3's, for the L1 receipt. Raises
+        ``GenLayerError`` if the transaction failed.
+        """
+        with self._lock:
+            future = self._future
+            if future is None:
+                future = self._future = Future()
+                resolve = True
+            else:
+                resolve = False
+        if resolve:
+            self._resolve(future, timeout)
+        return future.result(timeout)
+
+    def resolve_in_background(self) -> Future:
+        """
+        Starts reading the transaction id on the client's resolver threads
+        and returns its future.
+        """
+        with self._lock:
+            if self._future is None:
+                self._future = Future()
+                _resolver(self.client).submit(self._resolve, self._future, None)
+            return self._future
+
+    def done(self) -> bool:
+        with self._lock:
+            return self._future is not None and self._future.done()
+
+    def wait(
+        self,
+        status: TransactionStatus = TransactionStatus.ACCEPTED,
+        interval: int = transaction_config.wait_interval,
+        retries: int = transaction_config.retries,
+        timeout: Optional[float] = None,
+        on_status: Optional[StatusCallback] = None,
+    ) -> GenLayerTransaction:
+        """
+        Waits for the transaction to reach ``status``, see
+        ``wait_for_transaction_receipt``. ``timeout`` covers the whole wait,
+        the L1 receipt included.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        transaction_id = self.transaction_id(timeout)
+        if deadline is not None:
+            timeout = max(0.0, deadline - time.monotonic())
+        return self.client.wait_for_transaction_receipt(
+            transaction_id,
+            status=status,
+            interval=interval,
+            retries=retries,
+            timeout=timeout,
+            on_status=on_status,
+        )
+
+    def _resolve(self, future: Future, timeout: Optional[float]) -> None:
+        from .actions import _transaction_id_from_receipt
+
+        try:
+            if timeout is None:
+                receipt = self.client.w3.eth.wait_for_transaction_receipt(self.tx_hash)
+            else:
+                receipt = self.client.w3.eth.wait_for_transaction_receipt(
+                    self.tx_hash, timeout=timeout
+                )
+            future.set_result(_transaction_id_from_receipt(self.client, receipt))
+        except TimeExhausted as err:
+            # not mined yet, the next call waits again
+            with self._lock:
+                if self._future is future:
+                    self._future = None
+            future.set_exception(
+                GenLayerError(f"Transaction {self.tx_hash} not mined yet: {err}")
+            )
+        except BaseException as err:
+            future.set_exception(err)
+
+
+def _resolver(client: GenLayerClient) -> ThreadPoolExecutor:
+    with _resolver_lock:
+        executor = client.__dict__.get("_resolver")
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                _RESOLVER_THREADS, thread_name_prefix="genlayer-resolver"
+            )
+            client._resolver = executor
+        return executor
+
+
+def close_resolver(client: GenLayerClient) -> None:
+    """
+    Shuts down the resolver threads of a client, if it has any; receipts
+    being waited for are dropped.
+    """
+    with _resolver_lock:
+        executor = client.__dict__.pop("_resolver", None)
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
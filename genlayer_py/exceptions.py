@@ -2,3 +2,18 @@ class GenLayerError(Exception):
     """
     An error raised by GenLayer.
     """
+
+
+class RpcTransportError(GenLayerError):
+    """
+    An RPC request that got no valid response: the connection failed, timed
+    out or the server answered with an HTTP error status.
+    """
+
+    def __init__(self, message: str, status: "int | None" = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status == 429 or self.status >= 500
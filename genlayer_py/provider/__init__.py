@@ -1 +1,8 @@
 from .provider import GenLayerProvider
+from .async_provider import AsyncGenLayerProvider
+from .routing import MultiEndpointProvider, AsyncMultiEndpointProvider
+from .cache import ResponseCache
+from .codec import JsonCodec, OrjsonCodec, has_orjson
+from .websocket import WebSocketProvider, Subscription
+from .metrics import Metrics, RequestHooks
+from .ratelimit import RateLimiter, AsyncRateLimiter
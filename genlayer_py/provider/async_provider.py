@@ -0,0 +1,171 @@
+from web3.providers import AsyncBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+from typing import Any, Dict, Optional, Sequence, Tuple, Union, List
+from urllib.parse import urlparse
+import asyncio
+import aiohttp
+import itertools
+from genlayer_py.exceptions import GenLayerError, RpcTransportError
+from genlayer_py.config.provider import (
+    ProviderConfig,
+    RateLimitConfig,
+    RetryConfig,
+    provider_config,
+    retry_config,
+)
+from .provider import decode_response, order_batch_responses, rpc_payload
+from .retry import AsyncRetryHandler
+from .cache import ResponseCache
+from .codec import JsonCodec, default_codec
+from .metrics import Metrics
+from .ratelimit import AsyncRateLimiter
+
+
+class AsyncGenLayerProvider(AsyncBaseProvider):
+    """
+    The asyncio counterpart of ``GenLayerProvider``, sending requests through
+    an aiohttp session whose connection pool is set up from ``config``.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        config: Optional[ProviderConfig] = None,
+        retry: Optional[RetryConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[JsonCodec] = None,
+        metrics: Optional[Metrics] = None,
+        rate_limit: Optional[RateLimitConfig] = None,
+    ) -> None:
+        self.url = url
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.rate_limiter = (
+            AsyncRateLimiter(rate_limit, url) if rate_limit is not None else None
+        )
+        self.codec = default_codec(codec)
+        self.config = config if config is not None else provider_config
+        self.retry = AsyncRetryHandler(retry if retry is not None else retry_config)
+        self._timeout = aiohttp.ClientTimeout(
+            sock_connect=self.config.connect_timeout,
+            sock_read=self.config.read_timeout,
+        )
+        self._headers = {
+            "Content-Type": "application/json",
+            "Accept-Encoding": (
+                "gzip, deflate" if self.config.compression else "identity"
+            ),
+        }
+        proxies = self.config.proxies or {}
+        self._proxy = proxies.get(urlparse(url).scheme)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ids = itertools.count(1)
+        super().__init__()
+
+    async def session(self) -> aiohttp.ClientSession:
+        # a session is bound to the event loop it was created in
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.pool_size, force_close=not self.config.keep_alive
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            await self.make_request("web3_clientVersion", [])
+        except GenLayerError:
+            if show_traceback:
+                raise
+            return False
+        return True
+
+    async def disconnect(self) -> None:
+        if self.cache is not None:
+            self.cache.save()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._session_loop = None
+
+    def rate_limits(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        if self.rate_limiter is None:
+            return {}
+        return {self.url: self.rate_limiter.snapshot()}
+
+    async def make_request(
+        self,
+        method: Union[RPCEndpoint, str],
+        params: List[Any],
+    ) -> RPCResponse:
+        def send() -> Any:
+            return self._post(self._payload(method, params))
+
+        if self.cache is None:
+            return await self.retry.call([method], send, send)
+        return await self.cache.async_call(
+            self.url, method, params, lambda: self.retry.call([method], send, send)
+        )
+
+    async def make_batch_request(
+        self,
+        requests: Sequence[Tuple[Union[RPCEndpoint, str], List[Any]]],
+    ) -> List[RPCResponse]:
+        """
+        Sends ``(method, params)`` calls as one JSON-RPC batch, see
+        ``GenLayerProvider.make_batch_request``.
+        """
+        if len(requests) == 0:
+            return []
+        if self.cache is None:
+            return await self._send_batch(requests)
+        return await self.cache.async_call_batch(self.url, requests, self._send_batch)
+
+    async def _send_batch(
+        self, requests: Sequence[Tuple[Union[RPCEndpoint, str], List[Any]]]
+    ) -> List[RPCResponse]:
+        async def send() -> List[RPCResponse]:
+            payload = [self._payload(method, params) for method, params in requests]
+            return order_batch_responses(payload, await self._post(payload))
+
+        return await self.retry.call([method for method, _ in requests], send)
+
+    def _payload(
+        self, method: Union[RPCEndpoint, str], params: List[Any]
+    ) -> Dict[str, Any]:
+        return rpc_payload(next(self._ids), method, params)
+
+    async def _post(self, payload: Any) -> Any:
+        if self.rate_limiter is None:
+            return await self._send(payload)
+        slot = await self.rate_limiter.acquire(payload)
+        try:
+            return await self._send(payload)
+        finally:
+            self.rate_limiter.release(slot)
+
+    async def _send(self, payload: Any) -> Any:
+        session = await self.session()
+        data = self.codec.dumps(payload)
+        with self.metrics.request(payload, len(data)) as timer:
+            try:
+                async with session.post(
+                    self.url,
+                    data=data,
+                    headers=self._headers,
+                    proxy=self._proxy,
+                ) as response:
+                    body = await response.read()
+                    timer.response_bytes = len(body)
+                    if response.status != 200:
+                        raise RpcTransportError(
+                            body.decode("utf-8", "replace"), response.status
+                        )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                raise RpcTransportError(str(err) or type(err).__name__) from err
+            return timer.response(decode_response(self.codec, body))
@@ -0,0 +1,284 @@
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from web3.types import RPCEndpoint, RPCResponse
+import json
+import os
+import threading
+import time
+from genlayer_py.config.provider import CacheConfig, cache_config
+from genlayer_py.types import TransactionStatus, TRANSACTION_STATUS_NAME_TO_NUMBER
+
+# scope, method and canonical params of a cached call
+CacheKey = Tuple[str, str, str]
+
+_FINALIZED = (
+    TransactionStatus.FINALIZED.value,
+    TRANSACTION_STATUS_NAME_TO_NUMBER[TransactionStatus.FINALIZED],
+)
+
+
+def _is_finalized(result: Any) -> bool:
+    # a transaction can change until it is finalized
+    return isinstance(result, dict) and str(result.get("status")) in _FINALIZED
+
+
+# methods whose results are only cached once they can no longer change
+_CACHEABLE: Dict[str, Callable[[Any], bool]] = {
+    "eth_getTransactionByHash": _is_finalized,
+}
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.lower() if value.startswith("0x") else value
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def cache_key(scope: str, method: str, params: Any) -> CacheKey:
+    """
+    Returns the key of a call, the same for params that only differ in the
+    case of hex strings or the order of object members.
+    """
+    canonical = json.dumps(
+        _canonical(params), sort_keys=True, separators=(",", ":"), default=str
+    )
+    return (scope, method, canonical)
+
+
+class ResponseCache:
+    """
+    Caches the responses of RPC methods whose results do not change, or
+    change slowly, as set in ``config``: each method listed in ``ttls`` is
+    kept for its TTL or, for None, until it is evicted. Errors, empty
+    results and transactions that are not finalized are never cached.
+
+    Responses are kept as JSON text, which bounds the cache by size (least
+    recently used ones are evicted first) and gives callers their own copy
+    to modify. With ``path`` set, the cache is loaded from that file and
+    saved to it by ``save``; providers save it when they are closed.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CacheConfig] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.config = config if config is not None else cache_config
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expiry time or None, response JSON)
+        self._entries: "OrderedDict[CacheKey, Tuple[Optional[float], str]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        if self.config.path is not None and os.path.exists(self.config.path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def handles(self, method: str) -> bool:
+        return method in self.config.ttls
+
+    def get(self, key: CacheKey) -> Optional[RPCResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= self._clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return json.loads(entry[1])
+
+    def put(self, key: CacheKey, response: RPCResponse) -> None:
+        method = key[1]
+        if not self.handles(method) or "error" in response:
+            return
+        result = response.get("result")
+        if result is None:
+            return
+        cacheable = _CACHEABLE.get(method)
+        if cacheable is not None and not cacheable(result):
+            return
+        text = json.dumps(response, separators=(",", ":"))
+        if len(text) > self.config.max_bytes:
+            return
+        ttl = self.config.ttls[method]
+        expiry = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expiry, text)
+            self._size += len(text)
+            while self._size > self.config.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def invalidate(self, method: Optional[str] = None) -> None:
+        """
+        Drops the responses of ``method``, or all of them.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if method is None or key[1] == method:
+                    self._remove(key)
+
+    def call(
+        self,
+        scope: str,
+        method: Union[RPCEndpoint, str],
+        params: Any,
+        send: Callable[[], RPCResponse],
+    ) -> RPCResponse:
+        """
+        Returns the cached response of a call, or sends it and caches the
+        response.
+        """
+        if not self.handles(method):
+            return send()
+        key = cache_key(scope, method, params)
+        response = self.get(key)
+        if response is None:
+            response = send()
+            self.put(key, response)
+        return response
+
+    async def async_call(
+        self,
+        scope: str,
+        method: Union[RPCEndpoint, str],
+        params: Any,
+        send: Callable[[], Awaitable[RPCResponse]],
+    ) -> RPCResponse:
+        if not self.handles(method):
+            return await send()
+        key = cache_key(scope, method, params)
+        response = self.get(key)
+        if response is None:
+            response = await send()
+            self.put(key, response)
+        return response
+
+    def call_batch(
+        self,
+        scope: str,
+        requests: Sequence[Tuple[Union[RPCEndpoint, str], Any]],
+        send_batch: Callable[[List[Tuple[Any, Any]]], List[RPCResponse]],
+    ) -> List[RPCResponse]:
+        """
+        Like ``call`` for a batch: only the calls that are not cached are
+        sent, with ``send_batch``.
+        """
+        responses, missing = self._lookup_batch(scope, requests)
+        if missing:
+            sent = send_batch([requests[index] for index in missing])
+            self._fill_batch(scope, requests, responses, missing, sent)
+        return responses
+
+    async def async_call_batch(
+        self,
+        scope: str,
+        requests: Sequence[Tuple[Union[RPCEndpoint, str], Any]],
+        send_batch: Callable[[List[Tuple[Any, Any]]], Awaitable[List[RPCResponse]]],
+    ) -> List[RPCResponse]:
+        responses, missing = self._lookup_batch(scope, requests)
+        if missing:
+            sent = await send_batch([requests[index] for index in missing])
+            self._fill_batch(scope, requests, responses, missing, sent)
+        return responses
+
+    def _lookup_batch(
+        self,
+        scope: str,
+        requests: Sequence[Tuple[Union[RPCEndpoint, str], Any]],
+    ) -> Tuple[List[Any], List[int]]:
+        responses: List[Any] = []
+        missing: List[int] = []
+        for index, (method, params) in enumerate(requests):
+            response = None
+            if self.handles(method):
+                response = self.get(cache_key(scope, method, params))
+            responses.append(response)
+            if response is None:
+                missing.append(index)
+        return responses, missing
+
+    def _fill_batch(
+        self,
+        scope: str,
+        requests: Sequence[Tuple[Union[RPCEndpoint, str], Any]],
+        responses: List[Any],
+        missing: List[int],
+        sent: List[RPCResponse],
+    ) -> None:
+        for index, response in zip(missing, sent):
+            method, params = requests[index]
+            if self.handles(method):
+                self.put(cache_key(scope, method, params), response)
+            responses[index] = response
+
+    def save(self) -> None:
+        """
+        Writes the entries that have not expired to ``config.path``.
+        """
+        if self.config.path is None:
+            return
+        now = self._clock()
+        with self._lock:
+            entries = [
+                [list(key), expiry, text]
+                for key, (expiry, text) in self._entries.items()
+                if expiry is None or expiry > now
+            ]
+        temporary = f"{self.config.path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(entries, file)
+        os.replace(temporary, self.config.path)
+
+    def load(self) -> None:
+        """
+        Adds the entries saved in ``config.path``, ignoring a missing or
+        unreadable file.
+        """
+        try:
+            with open(self.config.path) as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return
+        now = self._clock()
+        with self._lock:
+            for key, expiry, text in entries:
+                key = tuple(key)
+                if key[1] not in self.config.ttls or (
+                    expiry is not None and expiry <= now
+                ):
+                    continue
+                self._remove(key)
+                self._entries[key] = (expiry, text)
+                self._size += len(text)
+            while self._size > self.config.max_bytes:
+                self._remove(next(iter(self._entries)))
@@ -0,0 +1,80 @@
+from typing import Any, Optional
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# orjson reads integers outside of this range as floats
+_MIN_INT = float(-(1 << 63))
+_MAX_INT = float(1 << 64)
+
+
+def _has_wide_int(value: Any) -> bool:
+    # walking the decoded values is much cheaper than scanning the text
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is dict:
+            stack.extend(item.values())
+        elif kind is list:
+            stack.extend(item)
+        elif (
+            kind is float
+            and (item <= _MIN_INT or item >= _MAX_INT)
+            and item.is_integer()
+        ):
+            return True
+    return False
+
+
+class JsonCodec:
+    """
+    Serializes JSON-RPC requests and parses responses for the providers,
+    straight from and to bytes. This one uses the standard library.
+    """
+
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), allow_nan=False).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    A ``JsonCodec`` using orjson, falling back to the standard library for
+    integers wider than 64 bits, which orjson can not write and reads as
+    floats.
+    """
+
+    name = "orjson"
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            return super().dumps(value)
+
+    def loads(self, data: bytes) -> Any:
+        value = orjson.loads(data)
+        if _has_wide_int(value):
+            return super().loads(data)
+        return value
+
+
+def has_orjson() -> bool:
+    return orjson is not None
+
+
+def default_codec(codec: Optional[JsonCodec] = None) -> JsonCodec:
+    """
+    Returns ``codec`` if given, else the fastest codec available.
+    """
+    if codec is not None:
+        return codec
+    return OrjsonCodec() if has_orjson() else JsonCodec()
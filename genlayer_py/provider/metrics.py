@@ -0,0 +1,238 @@
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+import functools
+import inspect
+import threading
+import time
+from genlayer_py.exceptions import GenLayerError
+
+# upper bounds of the latency histogram buckets in seconds, 25% apart from
+# 0.1 ms to about two minutes, so a percentile is off by 25% at most
+_BUCKETS: List[float] = [1e-4 * 1.25**i for i in range(64)]
+_PERCENTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class RequestHooks:
+    """
+    Tracing hooks called around every RPC request and instrumented action,
+    override the methods of interest. ``before_request`` returns a context,
+    such as a span, that is passed back to ``after_request``.
+    """
+
+    def before_request(self, method: str, params: Any) -> Any:
+        return None
+
+    def after_request(
+        self,
+        method: str,
+        context: Any,
+        seconds: float,
+        request_bytes: int,
+        response_bytes: int,
+        error: Optional[BaseException],
+    ) -> None:
+        pass
+
+
+class _Stats:
+    __slots__ = (
+        "count",
+        "errors",
+        "total",
+        "max",
+        "request_bytes",
+        "response_bytes",
+        "buckets",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.buckets = [0] * (len(_BUCKETS) + 1)
+
+    def percentile(self, q: float) -> float:
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                if index == len(_BUCKETS):
+                    return self.max
+                return min(_BUCKETS[index], self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        values: Dict[str, float] = {
+            "count": self.count,
+            "errors": self.errors,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+        for name, q in _PERCENTILES:
+            values[name] = self.percentile(q)
+        return values
+
+
+class Timer:
+    """
+    Times a request or an action as a context manager and records it on
+    exit, see ``Metrics.request``.
+    """
+
+    __slots__ = (
+        "metrics",
+        "name",
+        "context",
+        "start",
+        "request_bytes",
+        "response_bytes",
+        "error",
+    )
+
+    def __init__(
+        self, metrics: "Metrics", name: str, params: Any, request_bytes: int
+    ) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.request_bytes = request_bytes
+        self.response_bytes = 0
+        self.error: Optional[BaseException] = None
+        hooks = metrics.hooks
+        self.context = None if hooks is None else hooks.before_request(name, params)
+        self.start = time.perf_counter()
+
+    def __enter__(self) -> "Timer":
+        return self
+
+    def __exit__(
+        self, kind: Any, error: Optional[BaseException], traceback: Any
+    ) -> None:
+        self.metrics.record(
+            self.name,
+            time.perf_counter() - self.start,
+            self.request_bytes,
+            self.response_bytes,
+            error if error is not None else self.error,
+            self.context,
+        )
+
+    def response(self, response: Any) -> Any:
+        """
+        Returns the decoded ``response``, which counts as failed if it, or
+        a call of a batch, carries a JSON-RPC ``error``.
+        """
+        responses = response if isinstance(response, list) else [response]
+        for item in responses:
+            if isinstance(item, dict) and item.get("error") is not None:
+                self.error = GenLayerError(f"JSON-RPC error: {item['error']}")
+                break
+        return response
+
+
+class Metrics:
+    """
+    Call counts, errors, latency histograms and byte sizes per RPC method
+    and per instrumented action, shared by a client and its provider.
+    ``hooks`` are called around each of them; without hooks, recording only
+    costs a clock read and a few additions.
+    """
+
+    def __init__(self, hooks: Optional[RequestHooks] = None) -> None:
+        self.hooks = hooks
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _Stats] = {}
+
+    def request(self, payload: Any, request_bytes: int = 0) -> Timer:
+        """
+        Returns a ``Timer`` for a JSON-RPC payload; a batch is recorded as
+        ``batch``. Set the timer's ``response_bytes`` once they are known.
+        """
+        if isinstance(payload, list):
+            return Timer(self, "batch", payload, request_bytes)
+        return Timer(self, payload["method"], payload["params"], request_bytes)
+
+    def span(self, name: str, params: Any = None) -> Timer:
+        return Timer(self, name, params, 0)
+
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        error: Optional[BaseException] = None,
+        context: Any = None,
+    ) -> None:
+        index = bisect_left(_BUCKETS, seconds)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _Stats()
+            stats.count += 1
+            stats.total += seconds
+            if seconds > stats.max:
+                stats.max = seconds
+            stats.buckets[index] += 1
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            if error is not None:
+                stats.errors += 1
+        if self.hooks is not None:
+            self.hooks.after_request(
+                name, context, seconds, request_bytes, response_bytes, error
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the metrics of each RPC method and action: ``count``,
+        ``errors``, ``mean``, ``max``, ``p50``, ``p95`` and ``p99`` latency
+        in seconds, and the total ``request_bytes`` and ``response_bytes``.
+        """
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def instrumented(function: F) -> F:
+    """
+    Records the calls of an action, sync or async, under its name in the
+    metrics of the client's provider.
+    """
+    name = function.__name__
+
+    def metrics_of(client: Any) -> Optional[Metrics]:
+        metrics = getattr(getattr(client, "provider", None), "metrics", None)
+        return metrics if isinstance(metrics, Metrics) else None
+
+    if inspect.iscoroutinefunction(function):
+
+        @functools.wraps(function)
+        async def async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            metrics = metrics_of(self)
+            if metrics is None:
+                return await function(self, *args, **kwargs)
+            with metrics.span(name):
+                return await function(self, *args, **kwargs)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(function)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        metrics = metrics_of(self)
+        if metrics is None:
+            return function(self, *args, **kwargs)
+        with metrics.span(name):
+            return function(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
@@ -1,41 +1,222 @@
 from web3.providers import BaseProvider
 from web3.types import RPCEndpoint, RPCResponse
-from typing import Any, Union, List
-from requests import HTTPError
+from typing import Any, Dict, Optional, Sequence, Tuple, Union, List
+from requests import RequestException
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError
 import requests
-from genlayer_py.exceptions import GenLayerError
-import time
+import itertools
+import threading
+from genlayer_py.exceptions import GenLayerError, RpcTransportError
+from genlayer_py.config.provider import (
+    ProviderConfig,
+    RateLimitConfig,
+    RetryConfig,
+    provider_config,
+    retry_config,
+)
+from .retry import RetryHandler
+from .cache import ResponseCache
+from .codec import JsonCodec, default_codec
+from .metrics import Metrics
+from .ratelimit import RateLimiter
 
 
 class GenLayerProvider(BaseProvider):
     """
     A Web3 provider implementation for interacting with GenLayer RPC endpoints, handling JSON-RPC requests and responses.
+
+    Requests go through a pool of keep-alive connections shared by all
+    threads using the provider, sized and timed out as set in ``config``.
+    Idempotent requests that fail to get an answer are retried, and hedged
+    if enabled, as set in ``retry``. Responses of slow-changing methods are
+    served from ``cache`` if one is given.
+
+    Bodies are written and parsed with ``codec``, orjson when it is
+    installed, straight from the bytes received.
+
+    Each POST, retries and hedges included, is recorded in ``metrics`` and
+    passed to its hooks. With ``rate_limit``, requests over its limits wait
+    in line rather than being sent, see ``RateLimiter``.
     """
 
-    def __init__(self, url: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        config: Optional[ProviderConfig] = None,
+        retry: Optional[RetryConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[JsonCodec] = None,
+        metrics: Optional[Metrics] = None,
+        rate_limit: Optional[RateLimitConfig] = None,
+    ) -> None:
         self.url = url
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.rate_limiter = (
+            RateLimiter(rate_limit, url) if rate_limit is not None else None
+        )
+        self.codec = default_codec(codec)
+        self.config = config if config is not None else provider_config
+        self.retry = RetryHandler(
+            retry if retry is not None else retry_config, self.config.pool_size
+        )
+        self._timeout = (self.config.connect_timeout, self.config.read_timeout)
+        self._headers = {
+            "Content-Type": "application/json",
+            "Accept-Encoding": (
+                "gzip, deflate" if self.config.compression else "identity"
+            ),
+        }
+        if not self.config.keep_alive:
+            self._headers["Connection"] = "close"
+        # sessions keep cookies and settings that are not safe to share, so
+        # each thread gets its own session mounted on the one shared pool
+        self._adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.config.pool_size
+        )
+        self._local = threading.local()
+        self._ids = itertools.count(1)
         super().__init__()
 
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            if self.config.proxies is not None:
+                session.proxies.update(self.config.proxies)
+            self._local.session = session
+        return session
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.save()
+        self.retry.close()
+        self._adapter.close()
+
+    def rate_limits(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Returns the ``RateLimiter.snapshot`` of the endpoint by URL, empty
+        without rate limits.
+        """
+        if self.rate_limiter is None:
+            return {}
+        return {self.url: self.rate_limiter.snapshot()}
+
     def make_request(
         self,
         method: Union[RPCEndpoint, str],
         params: List[Any],
     ) -> RPCResponse:
-        payload = {
-            "jsonrpc": "2.0",
-            "id": int(time.time() * 1000),
-            "method": method,
-            "params": params,
-        }
+        def send() -> Any:
+            return self._post(self._payload(method, params))
+
+        if self.cache is None:
+            return self.retry.call([method], send, send)
+        return self.cache.call(
+            self.url, method, params, lambda: self.retry.call([method], send, send)
+        )
+
+    def make_batch_request(
+        self,
+        requests: Sequence[Tuple[Union[RPCEndpoint, str], List[Any]]],
+    ) -> List[RPCResponse]:
+        """
+        Sends ``(method, params)`` calls as one JSON-RPC batch in a single POST
+        and returns their responses in the same order. Calls that failed keep
+        their ``error`` member, the others are not affected by them.
+        """
+        if len(requests) == 0:
+            return []
+        if self.cache is None:
+            return self._send_batch(requests)
+        return self.cache.call_batch(self.url, requests, self._send_batch)
+
+    def _send_batch(
+        self, requests: Sequence[Tuple[Union[RPCEndpoint, str], List[Any]]]
+    ) -> List[RPCResponse]:
+        def send() -> List[RPCResponse]:
+            payload = [self._payload(method, params) for method, params in requests]
+            return order_batch_responses(payload, self._post(payload))
+
+        return self.retry.call([method for method, _ in requests], send)
+
+    def _payload(
+        self, method: Union[RPCEndpoint, str], params: List[Any]
+    ) -> Dict[str, Any]:
+        return rpc_payload(next(self._ids), method, params)
+
+    def _post(self, payload: Any) -> Any:
+        if self.rate_limiter is None:
+            return self._send(payload)
+        slot = self.rate_limiter.acquire(payload)
         try:
-            response = requests.post(
-                self.url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
-        except HTTPError as err:
-            raise GenLayerError(str(err)) from err
+            return self._send(payload)
+        finally:
+            self.rate_limiter.release(slot)
+
+    def _send(self, payload: Any) -> Any:
+        data = self.codec.dumps(payload)
+        with self.metrics.request(payload, len(data)) as timer:
+            try:
+                response = self.session.post(
+                    self.url,
+                    data=data,
+                    headers=self._headers,
+                    timeout=self._timeout,
+                    stream=True,
+                )
+                # the body, decompressed if needed, is read in one go rather
+                # than in the small chunks response.content joins
+                body = response.raw.read(decode_content=True)
+            except (RequestException, HTTPError) as err:
+                raise RpcTransportError(str(err)) from err
+            timer.response_bytes = len(body)
+
+            if response.status_code != 200:
+                raise RpcTransportError(
+                    body.decode("utf-8", "replace"), response.status_code
+                )
+            return timer.response(decode_response(self.codec, body))
+
+
+def rpc_payload(
+    request_id: int, method: Union[RPCEndpoint, str], params: List[Any]
+) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": method,
+        "params": params,
+    }
 
-        if response.status_code != 200:
-            raise GenLayerError(response.text)
-        return response.json()
+
+def decode_response(codec: JsonCodec, body: bytes) -> Any:
+    try:
+        return codec.loads(body)
+    except ValueError as err:
+        raise GenLayerError(f"invalid JSON-RPC response: {err}") from err
+
+
+def order_batch_responses(
+    payload: List[Dict[str, Any]], responses: Any
+) -> List[RPCResponse]:
+    """
+    Matches the responses to a batch with its calls by id, in call order.
+    """
+    if not isinstance(responses, list):
+        # servers answer a batch they can not handle with a single error
+        raise GenLayerError(f"batch request failed: {responses.get('error')}")
+    by_id = {response.get("id"): response for response in responses}
+    ordered = []
+    for call in payload:
+        response = by_id.get(call["id"])
+        if response is None:
+            raise GenLayerError(
+                f"no response to batched call {call['method']} id {call['id']}"
+            )
+        ordered.append(response)
+    return ordered
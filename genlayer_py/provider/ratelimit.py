@@ -0,0 +1,194 @@
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import asyncio
+import threading
+import time
+from genlayer_py.config.provider import RateLimit, RateLimitConfig
+
+
+class _Bucket:
+    """
+    The token bucket, requests in flight and waiting line of one method
+    class of an endpoint. Not thread safe, the limiter locks around it.
+    """
+
+    def __init__(self, limit: RateLimit, clock: Callable[[], float]) -> None:
+        self.limit = limit
+        self.clock = clock
+        self.tokens = float(limit.burst)
+        self.updated = clock()
+        self.in_flight = 0
+        self.queue: Deque[object] = deque()
+        self.requests = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+
+    def try_acquire(self, cost: int) -> Optional[float]:
+        """
+        Takes a slot and ``cost`` tokens and returns 0, or returns the
+        seconds until there are enough tokens, or None while all slots are
+        taken.
+        """
+        limit = self.limit
+        if limit.max_in_flight is not None and self.in_flight >= limit.max_in_flight:
+            return None
+        if limit.rate is not None:
+            now = self.clock()
+            self.tokens = min(
+                float(limit.burst), self.tokens + (now - self.updated) * limit.rate
+            )
+            self.updated = now
+            # a batch larger than the burst would never get through
+            cost = min(cost, limit.burst)
+            if self.tokens < cost:
+                return (cost - self.tokens) / limit.rate
+            self.tokens -= cost
+        self.in_flight += 1
+        return 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.requests += 1
+        self.waited += seconds
+        if seconds > self.max_wait:
+            self.max_wait = seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "queued": len(self.queue),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "mean_wait": self.waited / self.requests if self.requests else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class RateLimiter:
+    """
+    Rate and in-flight limits of the requests to one endpoint, per method
+    class, as set in ``config``. A request over the limits waits its turn:
+    the requests of a class get through in the order they came.
+    """
+
+    def __init__(
+        self,
+        config: RateLimitConfig,
+        url: str,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        limits = dict(config.limits)
+        limits.update(config.endpoints.get(url, {}))
+        self.method_classes = config.method_classes
+        self.clock = clock
+        self._buckets = {name: _Bucket(limit, clock) for name, limit in limits.items()}
+        self._condition = threading.Condition()
+
+    def method_class(self, method: str) -> str:
+        return self.method_classes.get(method, "read")
+
+    def acquire(self, payload: Any) -> Optional[_Bucket]:
+        """
+        Waits until the JSON-RPC ``payload`` may be sent and returns what
+        to pass to ``release`` once it is answered.
+        """
+        bucket, cost = self._bucket_of(payload)
+        if bucket is None:
+            return None
+        ticket = object()
+        start = self.clock()
+        with self._condition:
+            bucket.queue.append(ticket)
+            try:
+                while True:
+                    delay = (
+                        bucket.try_acquire(cost) if bucket.queue[0] is ticket else None
+                    )
+                    if delay == 0.0:
+                        break
+                    self._condition.wait(delay)
+            finally:
+                bucket.queue.remove(ticket)
+                self._condition.notify_all()
+            bucket.record_wait(self.clock() - start)
+        return bucket
+
+    def release(self, bucket: Optional[_Bucket]) -> None:
+        if bucket is None:
+            return
+        with self._condition:
+            bucket.in_flight -= 1
+            self._condition.notify_all()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns, for each method class, the requests ``queued`` and
+        ``in_flight`` now, and the ``requests`` sent so far with their
+        ``mean_wait`` and ``max_wait`` in line in seconds.
+        """
+        with self._condition:
+            return {name: bucket.snapshot() for name, bucket in self._buckets.items()}
+
+    def _bucket_of(self, payload: Any) -> Tuple[Optional[_Bucket], int]:
+        if not isinstance(payload, list):
+            return self._buckets.get(self.method_class(payload["method"])), 1
+        # a batch counts as its calls, in the strictest class among them
+        classes = {self.method_class(call["method"]) for call in payload}
+        for name in ("write", "poll", "read"):
+            if name in classes:
+                return self._buckets.get(name), len(payload)
+        return self._buckets.get(classes.pop()), len(payload)
+
+
+class AsyncRateLimiter(RateLimiter):
+    """
+    The asyncio counterpart of ``RateLimiter``, for requests sent from one
+    event loop at a time.
+    """
+
+    def __init__(
+        self,
+        config: RateLimitConfig,
+        url: str,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(config, url, clock)
+        # done, and replaced, whenever a slot is freed or the line moves
+        self._changed: Optional[asyncio.Future] = None
+
+    async def acquire(self, payload: Any) -> Optional[_Bucket]:  # type: ignore[override]
+        bucket, cost = self._bucket_of(payload)
+        if bucket is None:
+            return None
+        loop = asyncio.get_running_loop()
+        ticket = object()
+        start = self.clock()
+        bucket.queue.append(ticket)
+        try:
+            while True:
+                delay = bucket.try_acquire(cost) if bucket.queue[0] is ticket else None
+                if delay == 0.0:
+                    break
+                if self._changed is None or self._changed.get_loop() is not loop:
+                    self._changed = loop.create_future()
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._changed), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            bucket.queue.remove(ticket)
+            self._notify()
+        bucket.record_wait(self.clock() - start)
+        return bucket
+
+    def release(self, bucket: Optional[_Bucket]) -> None:
+        if bucket is None:
+            return
+        bucket.in_flight -= 1
+        self._notify()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {name: bucket.snapshot() for name, bucket in self._buckets.items()}
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, None
+        if changed is not None and not changed.done():
+            changed.set_result(None)
@@ -0,0 +1,300 @@
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from collections import deque
+import asyncio
+import random
+import threading
+import time
+from genlayer_py.exceptions import RpcTransportError
+from genlayer_py.config.provider import RetryConfig
+
+# latencies kept per method to estimate the hedging delay
+_LATENCY_WINDOW = 256
+
+
+def is_idempotent(config: RetryConfig, methods: Iterable[str]) -> bool:
+    """
+    Tells whether a request made of calls to ``methods`` can be sent twice.
+    """
+    return all(method in config.idempotent_methods for method in methods)
+
+
+def backoff_delay(config: RetryConfig, retry: int) -> float:
+    """
+    Seconds to wait before retry number ``retry`` (from 0): exponential
+    backoff with full jitter, so that clients that failed together do not
+    come back together.
+    """
+    ceiling = min(config.max_delay, config.base_delay * (2**retry))
+    return random.uniform(0.0, ceiling)
+
+
+def _should_retry(err: RpcTransportError, retry: int, attempts: int) -> bool:
+    return err.retryable and retry + 1 < attempts
+
+
+def call_with_retries(
+    config: RetryConfig,
+    methods: Iterable[str],
+    send: Callable[[], Any],
+    sleep: Callable[[float], None] = time.sleep,
+) -> Any:
+    """
+    Calls ``send`` until it does not fail with a retryable
+    ``RpcTransportError``, up to ``max_attempts`` times if the request is
+    idempotent and once otherwise.
+    """
+    attempts = config.max_attempts if is_idempotent(config, methods) else 1
+    retry = 0
+    while True:
+        try:
+            return send()
+        except RpcTransportError as err:
+            if not _should_retry(err, retry, attempts):
+                raise
+        sleep(backoff_delay(config, retry))
+        retry += 1
+
+
+async def async_call_with_retries(
+    config: RetryConfig,
+    methods: Iterable[str],
+    send: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    The asyncio counterpart of ``call_with_retries``.
+    """
+    attempts = config.max_attempts if is_idempotent(config, methods) else 1
+    retry = 0
+    while True:
+        try:
+            return await send()
+        except RpcTransportError as err:
+            if not _should_retry(err, retry, attempts):
+                raise
+        await asyncio.sleep(backoff_delay(config, retry))
+        retry += 1
+
+
+class LatencyTracker:
+    """
+    Recent latencies of each RPC method, from which the delay after which a
+    request is hedged is taken.
+    """
+
+    def __init__(self, config: RetryConfig) -> None:
+        self.config = config
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, method: str, latency: float) -> None:
+        with self._lock:
+            samples = self._samples.get(method)
+            if samples is None:
+                samples = self._samples[method] = deque(maxlen=_LATENCY_WINDOW)
+            samples.append(latency)
+
+    def hedge_delay(self, method: str) -> Optional[float]:
+        """
+        Returns the ``hedge_quantile`` latency of ``method``, or None while
+        there are too few samples to tell a slow request from a usual one.
+        """
+        with self._lock:
+            samples = self._samples.get(method)
+            if samples is None or len(samples) < self.config.hedge_min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(self.config.hedge_quantile * len(ordered)))
+        return ordered[index]
+
+
+def call_hedged(
+    executor: Executor,
+    delay: float,
+    send: Callable[[], Any],
+    send_hedge: Callable[[], Any],
+) -> Tuple[Any, bool]:
+    """
+    Sends a request with ``send`` on the calling thread and, if it has not
+    been answered after ``delay`` seconds, a duplicate with ``send_hedge``
+    from ``executor``. Returns the answer and whether the duplicate was
+    sent; an error is only raised when both failed.
+
+    A blocking HTTP request can not be cancelled, so the caller waits for
+    its own request and the duplicate answers when that one fails. A
+    duplicate still running when the caller is answered is dropped.
+    """
+    answered = threading.Event()
+    lock = threading.Lock()
+    hedged = [False]
+    deadline = time.monotonic() + delay
+
+    def hedge() -> Any:
+        if answered.wait(max(0.0, deadline - time.monotonic())):
+            return None
+        with lock:
+            if answered.is_set():
+                return None
+            hedged[0] = True
+        return send_hedge()
+
+    future = executor.submit(hedge)
+    try:
+        response = send()
+    except Exception as err:
+        with lock:
+            answered.set()
+        if not hedged[0]:
+            raise
+        try:
+            return future.result(), True
+        except Exception:
+            raise err from None
+    except BaseException:
+        answered.set()
+        raise
+    with lock:
+        answered.set()
+    return response, hedged[0]
+
+
+async def async_call_hedged(
+    delay: float,
+    send: Callable[[], Awaitable[Any]],
+    send_hedge: Callable[[], Awaitable[Any]],
+) -> Tuple[Any, bool]:
+    """
+    The asyncio counterpart of ``call_hedged``, whichever request answers
+    first wins and the slower one is cancelled.
+    """
+    pending = {asyncio.ensure_future(send())}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return done.pop().result(), False
+        pending.add(asyncio.ensure_future(send_hedge()))
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    return task.result(), True
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class RetryHandler:
+    """
+    Retries and hedges the requests of a provider as set in ``config``.
+    Requests are sent from the calling thread and their duplicates from a
+    small thread pool, so the duplicate goes out on another pooled
+    connection.
+    """
+
+    def __init__(self, config: RetryConfig, workers: int) -> None:
+        self.config = config
+        self.latencies = LatencyTracker(config)
+        self._workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="genlayer-hedge"
+                )
+            return self._executor
+
+    def call(
+        self,
+        methods: Sequence[str],
+        send: Callable[[], Any],
+        hedge: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """
+        Sends a request made of calls to ``methods`` with ``send``, and its
+        duplicates with ``hedge``; batches are retried but not hedged.
+        """
+        if (
+            hedge is None
+            or not self.config.hedge
+            or len(methods) != 1
+            or not is_idempotent(self.config, methods)
+        ):
+            return call_with_retries(self.config, methods, send)
+        method = methods[0]
+
+        def attempt() -> Any:
+            delay = self.latencies.hedge_delay(method)
+            start = time.monotonic()
+            if delay is None:
+                response, hedged = send(), False
+            else:
+                response, hedged = call_hedged(self._get_executor(), delay, send, hedge)
+            # a hedged answer says little of how long the method takes
+            if not hedged:
+                self.latencies.record(method, time.monotonic() - start)
+            return response
+
+        return call_with_retries(self.config, methods, attempt)
+
+
+class AsyncRetryHandler:
+    """
+    The asyncio counterpart of ``RetryHandler``.
+    """
+
+    def __init__(self, config: RetryConfig) -> None:
+        self.config = config
+        self.latencies = LatencyTracker(config)
+
+    async def call(
+        self,
+        methods: Sequence[str],
+        send: Callable[[], Awaitable[Any]],
+        hedge: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        if (
+            hedge is None
+            or not self.config.hedge
+            or len(methods) != 1
+            or not is_idempotent(self.config, methods)
+        ):
+            return await async_call_with_retries(self.config, methods, send)
+        method = methods[0]
+
+        async def attempt() -> Any:
+            delay = self.latencies.hedge_delay(method)
+            start = time.monotonic()
+            if delay is None:
+                response, hedged = await send(), False
+            else:
+                response, hedged = await async_call_hedged(delay, send, hedge)
+            # a hedged answer says little of how long the method takes
+            if not hedged:
+                self.latencies.record(method, time.monotonic() - start)
+            return response
+
+        return await async_call_with_retries(self.config, methods, attempt)
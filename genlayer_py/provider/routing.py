@@ -0,0 +1,484 @@
+from web3.providers import AsyncBaseProvider, BaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from eth_account import Account
+import dataclasses
+import random
+import threading
+import time
+from genlayer_py.exceptions import GenLayerError, RpcTransportError
+from genlayer_py.config.provider import (
+    ProviderConfig,
+    RateLimitConfig,
+    RetryConfig,
+    RoutingConfig,
+    provider_config,
+    retry_config,
+    routing_config,
+)
+from .provider import GenLayerProvider
+from .async_provider import AsyncGenLayerProvider
+from .retry import AsyncRetryHandler, RetryHandler, is_idempotent
+from .cache import ResponseCache
+from .codec import JsonCodec
+from .metrics import Metrics
+
+# how much a smoothed error rate of 1 inflates the latency score
+_ERROR_PENALTY = 4.0
+
+
+class Endpoint:
+    """
+    Health of one RPC endpoint: smoothed latency and error rate, and a
+    circuit breaker that ejects it after repeated failures.
+    """
+
+    __slots__ = (
+        "url",
+        "latency",
+        "error_rate",
+        "failures",
+        "opened_at",
+        "probing",
+    )
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.failures = 0
+        # set while the circuit is open
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    @property
+    def healthy(self) -> bool:
+        return self.opened_at is None
+
+    def score(self) -> float:
+        # endpoints without samples are tried first
+        if self.latency is None:
+            return 0.0
+        return self.latency * (1.0 + _ERROR_PENALTY * self.error_rate)
+
+    def __repr__(self) -> str:
+        return (
+            f"Endpoint({self.url!r}, latency={self.latency}, "
+            f"error_rate={self.error_rate:.2f}, healthy={self.healthy})"
+        )
+
+
+class EndpointRouter:
+    """
+    Picks the endpoint for each request, shared by the sync and the async
+    multi-endpoint providers.
+
+    Healthy endpoints are picked by the lower score of two random ones, so
+    slow or failing endpoints get less traffic without all clients piling on
+    the fastest one. An endpoint is ejected after ``failure_threshold``
+    consecutive failures and gets a single probe request once ``cooldown``
+    has passed; success closes its circuit again. Nonce-sensitive calls of
+    an account stay on one endpoint as long as it is healthy.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        config: Optional[RoutingConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if len(urls) == 0:
+            raise GenLayerError("at least one RPC endpoint is required")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.config = config if config is not None else routing_config
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sticky: Dict[str, Endpoint] = {}
+
+    def select(
+        self, sticky_key: Optional[str] = None, exclude: Collection[str] = ()
+    ) -> Endpoint:
+        with self._lock:
+            now = self._clock()
+            if sticky_key is not None:
+                pinned = self._sticky.get(sticky_key)
+                if pinned is not None and pinned.healthy and pinned.url not in exclude:
+                    return pinned
+            candidates = []
+            for endpoint in self.endpoints:
+                if endpoint.url in exclude:
+                    continue
+                if endpoint.healthy:
+                    candidates.append(endpoint)
+                elif (
+                    not endpoint.probing
+                    and now - endpoint.opened_at >= self.config.cooldown
+                ):
+                    endpoint.probing = True
+                    return self._pin(sticky_key, endpoint)
+            if not candidates:
+                # everything is ejected, try the one that has rested longest
+                candidates = [e for e in self.endpoints if e.url not in exclude]
+                if not candidates:
+                    raise GenLayerError("no RPC endpoint left to try")
+                return self._pin(
+                    sticky_key, min(candidates, key=lambda e: e.opened_at or 0.0)
+                )
+            if len(candidates) == 1:
+                return self._pin(sticky_key, candidates[0])
+            first, second = random.sample(candidates, 2)
+            best = first if first.score() <= second.score() else second
+            return self._pin(sticky_key, best)
+
+    def _pin(self, sticky_key: Optional[str], endpoint: Endpoint) -> Endpoint:
+        if sticky_key is not None:
+            self._sticky[sticky_key] = endpoint
+        return endpoint
+
+    def record_success(self, endpoint: Endpoint, latency: float) -> None:
+        alpha = self.config.latency_smoothing
+        with self._lock:
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency = alpha * latency + (1 - alpha) * endpoint.latency
+            endpoint.error_rate *= 1 - alpha
+            endpoint.failures = 0
+            endpoint.opened_at = None
+            endpoint.probing = False
+
+    def record_failure(self, endpoint: Endpoint) -> None:
+        alpha = self.config.latency_smoothing
+        with self._lock:
+            endpoint.error_rate = alpha + (1 - alpha) * endpoint.error_rate
+            endpoint.failures += 1
+            if endpoint.probing or endpoint.failures >= self.config.failure_threshold:
+                endpoint.opened_at = self._clock()
+            endpoint.probing = False
+
+    def record_abandoned(self, endpoint: Endpoint) -> None:
+        """
+        Ends a call that was cancelled or interrupted without counting it,
+        so that an ejected endpoint can be probed again.
+        """
+        with self._lock:
+            endpoint.probing = False
+
+    def attempts(self) -> int:
+        return len(self.endpoints)
+
+
+def sticky_key(method: Union[RPCEndpoint, str], params: List[Any]) -> Optional[str]:
+    """
+    Returns the account whose nonce a call depends on, if any.
+    """
+    try:
+        if method == "eth_getTransactionCount":
+            return str(params[0]).lower()
+        if method in ("eth_estimateGas", "eth_sendTransaction"):
+            sender = params[0].get("from")
+            return None if sender is None else str(sender).lower()
+        if method == "eth_sendRawTransaction":
+            return Account.recover_transaction(params[0]).lower()
+    except Exception:
+        return None
+    return None
+
+
+def _single_attempt(retry: RetryConfig) -> RetryConfig:
+    return dataclasses.replace(retry, max_attempts=1, hedge=False)
+
+
+def _all_failed(error: Optional[GenLayerError]) -> GenLayerError:
+    message = f"all RPC endpoints failed, last error: {error}"
+    if isinstance(error, RpcTransportError):
+        return RpcTransportError(message, error.status)
+    return GenLayerError(message)
+
+
+def _rate_limits(providers: Iterable[Any]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    limits: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for provider in providers:
+        limits.update(provider.rate_limits())
+    return limits
+
+
+class MultiEndpointProvider(BaseProvider):
+    """
+    A provider that spreads requests over several GenLayer RPC endpoints,
+    see ``EndpointRouter``. An idempotent request that fails to reach an
+    endpoint is retried on the others; JSON-RPC errors are returned as they
+    are.
+
+    Retries with backoff and hedging are done here rather than by the
+    provider of each endpoint, so a hedged request goes to another endpoint.
+    A ``cache`` and ``metrics`` are shared by all endpoints, while each
+    endpoint gets its own ``rate_limit`` limits.
+
+    Only idempotent methods fail over: a write that failed may have been
+    executed by its endpoint, so it is sent once and its error raised.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        config: Optional[ProviderConfig] = None,
+        routing: Optional[RoutingConfig] = None,
+        retry: Optional[RetryConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[JsonCodec] = None,
+        metrics: Optional[Metrics] = None,
+        rate_limit: Optional[RateLimitConfig] = None,
+    ) -> None:
+        self.router = EndpointRouter(urls, routing)
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else Metrics()
+        # cached responses are shared by the endpoints of one network
+        self._scope = " ".join(urls)
+        retry = retry if retry is not None else retry_config
+        single = _single_attempt(retry)
+        self._providers = {
+            url: GenLayerProvider(
+                url,
+                config,
+                single,
+                codec=codec,
+                metrics=self.metrics,
+                rate_limit=rate_limit,
+            )
+            for url in urls
+        }
+        pool_size = (config if config is not None else provider_config).pool_size
+        self.retry = RetryHandler(retry, pool_size)
+        super().__init__()
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.save()
+        self.retry.close()
+        for provider in self._providers.values():
+            provider.close()
+
+    def rate_limits(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Returns the ``RateLimiter.snapshot`` of each endpoint by URL.
+        """
+        return _rate_limits(self._providers.values())
+
+    def make_request(
+        self,
+        method: Union[RPCEndpoint, str],
+        params: List[Any],
+    ) -> RPCResponse:
+        key = sticky_key(method, params)
+        # endpoints tried by the latest attempt, a hedge avoids them
+        tried: List[str] = []
+
+        def send_to(provider: GenLayerProvider) -> RPCResponse:
+            return provider.make_request(method, params)
+
+        def send() -> RPCResponse:
+            tried.clear()
+            return self._route([method], key, send_to, tried)
+
+        def hedge() -> RPCResponse:
+            return self._route([method], key, send_to, tried[:])
+
+        def send_with_retries() -> RPCResponse:
+            return self.retry.call([method], send, None if key is not None else hedge)
+
+        if self.cache is None:
+            return send_with_retries()
+        return self.cache.call(self._scope, method, params, send_with_retries)
+
+    def make_batch_request(
+        self,
+        requests: Sequence[Tuple[Union[RPCEndpoint, str], List[Any]]],
+    ) -> List[RPCResponse]:
+        if self.cache is None:
+            return self._send_batch(requests)
+        return self.cache.call_batch(self._scope, requests, self._send_batch)
+
+    def _send_batch(
+        self, requests: Sequence[Tuple[Union[RPCEndpoint, str], List[Any]]]
+    ) -> List[RPCResponse]:
+        methods = [method for method, _ in requests]
+        return self.retry.call(
+            methods,
+            lambda: self._route(
+                methods,
+                None,
+                lambda provider: provider.make_batch_request(requests),
+                [],
+            ),
+        )
+
+    def _route(
+        self,
+        methods: List[str],
+        key: Optional[str],
+        send: Callable[[GenLayerProvider], Any],
+        tried: List[str],
+    ) -> Any:
+        """
+        Sends with ``send`` to the best endpoint not ``tried`` yet. Failed
+        idempotent calls move on to the next endpoint; other calls may have
+        been executed already, so their error is raised. Only a
+        ``GenLayerError`` counts against the endpoint, not the cancellation
+        of a hedge that lost, which only ends a probe of the endpoint.
+        """
+        error: Optional[GenLayerError] = None
+        while len(tried) < self.router.attempts():
+            endpoint = self.router.select(key, tried)
+            tried.append(endpoint.url)
+            start = time.monotonic()
+            try:
+                response = send(self._providers[endpoint.url])
+            except GenLayerError as err:
+                self.router.record_failure(endpoint)
+                if not is_idempotent(self.retry.config, methods):
+                    raise
+                error = err
+                continue
+            except BaseException:
+                self.router.record_abandoned(endpoint)
+                raise
+            self.router.record_success(endpoint, time.monotonic() - start)
+            return response
+        raise _all_failed(error)
+
+
+class AsyncMultiEndpointProvider(AsyncBaseProvider):
+    """
+    The asyncio counterpart of ``MultiEndpointProvider``.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        config: Optional[ProviderConfig] = None,
+        routing: Optional[RoutingConfig] = None,
+        retry: Optional[RetryConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[JsonCodec] = None,
+        metrics: Optional[Metrics] = None,
+        rate_limit: Optional[RateLimitConfig] = None,
+    ) -> None:
+        self.router = EndpointRouter(urls, routing)
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else Metrics()
+        # cached responses are shared by the endpoints of one network
+        self._scope = " ".join(urls)
+        retry = retry if retry is not None else retry_config
+        single = _single_attempt(retry)
+        self._providers = {
+            url: AsyncGenLayerProvider(
+                url,
+                config,
+                single,
+                codec=codec,
+                metrics=self.metrics,
+                rate_limit=rate_limit,
+            )
+            for url in urls
+        }
+        self.retry = AsyncRetryHandler(retry)
+        super().__init__()
+
+    async def disconnect(self) -> None:
+        if self.cache is not None:
+            self.cache.save()
+        for provider in self._providers.values():
+            await provider.disconnect()
+
+    def rate_limits(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        return _rate_limits(self._providers.values())
+
+    async def make_request(
+        self,
+        method: Union[RPCEndpoint, str],
+        params: List[Any],
+    ) -> RPCResponse:
+        key = sticky_key(method, params)
+        tried: List[str] = []
+
+        def send_to(provider: AsyncGenLayerProvider) -> Any:
+            return provider.make_request(method, params)
+
+        def send() -> Any:
+            tried.clear()
+            return self._route([method], key, send_to, tried)
+
+        def hedge() -> Any:
+            return self._route([method], key, send_to, tried[:])
+
+        def send_with_retries() -> Any:
+            return self.retry.call([method], send, None if key is not None else hedge)
+
+        if self.cache is None:
+            return await send_with_retries()
+        return await self.cache.async_call(
+            self._scope, method, params, send_with_retries
+        )
+
+    async def make_batch_request(
+        self,
+        requests: Sequence[Tuple[Union[RPCEndpoint, str], List[Any]]],
+    ) -> List[RPCResponse]:
+        if self.cache is None:
+            return await self._send_batch(requests)
+        return await self.cache.async_call_batch(
+            self._scope, requests, self._send_batch
+        )
+
+    async def _send_batch(
+        self, requests: Sequence[Tuple[Union[RPCEndpoint, str], List[Any]]]
+    ) -> List[RPCResponse]:
+        methods = [method for method, _ in requests]
+        return await self.retry.call(
+            methods,
+            lambda: self._route(
+                methods,
+                None,
+                lambda provider: provider.make_batch_request(requests),
+                [],
+            ),
+        )
+
+    async def _route(
+        self,
+        methods: List[str],
+        key: Optional[str],
+        send: Callable[[AsyncGenLayerProvider], Any],
+        tried: List[str],
+    ) -> Any:
+        error: Optional[GenLayerError] = None
+        while len(tried) < self.router.attempts():
+            endpoint = self.router.select(key, tried)
+            tried.append(endpoint.url)
+            start = time.monotonic()
+            try:
+                response = await send(self._providers[endpoint.url])
+            except GenLayerError as err:
+                self.router.record_failure(endpoint)
+                if not is_idempotent(self.retry.config, methods):
+                    raise
+                error = err
+                continue
+            except BaseException:
+                self.router.record_abandoned(endpoint)
+                raise
+            self.router.record_success(endpoint, time.monotonic() - start)
+            return response
+        raise _all_failed(error)
@@ -0,0 +1,395 @@
+from web3.providers import BaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from urllib.parse import urlparse
+import itertools
+import logging
+import threading
+import time
+from genlayer_py.exceptions import GenLayerError, RpcTransportError
+from genlayer_py.config.provider import (
+    ProviderConfig,
+    RateLimitConfig,
+    RetryConfig,
+    provider_config,
+    retry_config,
+)
+from .cache import ResponseCache
+from .codec import JsonCodec, default_codec
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .provider import order_batch_responses, rpc_payload
+from .retry import RetryHandler, backoff_delay
+
+try:
+    from websockets.sync.client import connect
+    from websockets.exceptions import WebSocketException
+except ImportError:  # pragma: no cover - depends on the environment
+    connect = None
+    WebSocketException = OSError
+
+logger = logging.getLogger(__name__)
+
+# notifications kept for a subscription whose id is not known yet
+_MAX_EARLY_NOTIFICATIONS = 1000
+
+
+class Subscription:
+    """
+    An ``eth_subscribe`` subscription of a ``WebSocketProvider``; it keeps
+    its params so it can be made again on a new connection.
+    """
+
+    __slots__ = ("params", "callback", "on_reconnect", "id")
+
+    def __init__(
+        self,
+        params: List[Any],
+        callback: Callable[[Any], None],
+        on_reconnect: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.params = params
+        self.callback = callback
+        self.on_reconnect = on_reconnect
+        # the id given by the server, it changes on every connection
+        self.id: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return f"Subscription({self.params!r}, id={self.id!r})"
+
+
+class WebSocketProvider(BaseProvider):
+    """
+    A provider that sends JSON-RPC requests over a single WebSocket
+    connection, answered by a reader thread, and supports ``eth_subscribe``
+    subscriptions whose notifications are pushed to callbacks.
+
+    When the connection drops, requests in flight fail with
+    ``RpcTransportError`` (idempotent ones are retried as set in ``retry``)
+    and, as long as there are subscriptions, the provider reconnects with
+    backoff and subscribes again, calling their ``on_reconnect`` so callers
+    can catch up on what was missed. Subscriptions the node refuses to set
+    up again are logged as errors, and their ``on_reconnect`` is called all
+    the same.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        config: Optional[ProviderConfig] = None,
+        retry: Optional[RetryConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        codec: Optional[JsonCodec] = None,
+        metrics: Optional[Metrics] = None,
+        rate_limit: Optional[RateLimitConfig] = None,
+    ) -> None:
+        if connect is None:
+            raise GenLayerError(
+                "WebSocket endpoints need the websockets package, "
+                "install genlayer-py[websocket]"
+            )
+        self.url = url
+        self.config = config if config is not None else provider_config
+        self.cache = cache
+        self.codec = default_codec(codec)
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.rate_limiter = (
+            RateLimiter(rate_limit, url) if rate_limit is not None else None
+        )
+        retry = retry if retry is not None else retry_config
+        self.retry = RetryHandler(retry, 1)
+        self._retry_config = retry
+        proxies = self.config.proxies
+        if proxies is None:
+            # like requests, use the proxy set in the environment if any
+            self._proxy: Union[str, bool, None] = True
+        else:
+            scheme = "https" if urlparse(url).scheme == "wss" else "http"
+            self._proxy = proxies.get(scheme)
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._connection: Any = None
+        self._closed = False
+        self._reconnecting = False
+        # connections lost so far, to tell whether one dropped unnoticed
+        self._drops = 0
+        self._pending: Dict[Any, Future] = {}
+        self._subscriptions: List[Subscription] = []
+        self._by_id: Dict[str, Subscription] = {}
+        self._early: Dict[str, List[Any]] = {}
+        self._ids = itertools.count(1)
+        super().__init__()
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.save()
+        with self._lock:
+            self._closed = True
+            connection = self._connection
+            self._connection = None
+        if connection is not None:
+            connection.close()
+        self.retry.close()
+
+    def rate_limits(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        if self.rate_limiter is None:
+            return {}
+        return {self.url: self.rate_limiter.snapshot()}
+
+    def make_request(
+        self,
+        method: Union[RPCEndpoint, str],
+        params: List[Any],
+    ) -> RPCResponse:
+        def send() -> RPCResponse:
+            return self.retry.call(
+                [method],
+                lambda: self._request(rpc_payload(next(self._ids), method, params)),
+            )
+
+        if self.cache is None:
+            return send()
+        return self.cache.call(self.url, method, params, send)
+
+    def make_batch_request(
+        self,
+        requests: Sequence[Tuple[Union[RPCEndpoint, str], List[Any]]],
+    ) -> List[RPCResponse]:
+        """
+        Sends ``(method, params)`` calls as one JSON-RPC batch message, see
+        ``GenLayerProvider.make_batch_request``.
+        """
+        if len(requests) == 0:
+            return []
+        if self.cache is None:
+            return self._send_batch(requests)
+        return self.cache.call_batch(self.url, requests, self._send_batch)
+
+    def _send_batch(
+        self, requests: Sequence[Tuple[Union[RPCEndpoint, str], List[Any]]]
+    ) -> List[RPCResponse]:
+        def send() -> List[RPCResponse]:
+            payload = [
+                rpc_payload(next(self._ids), method, params)
+                for method, params in requests
+            ]
+            return order_batch_responses(payload, self._request(payload))
+
+        return self.retry.call([method for method, _ in requests], send)
+
+    def subscribe(
+        self,
+        params: List[Any],
+        callback: Callable[[Any], None],
+        on_reconnect: Optional[Callable[[], None]] = None,
+    ) -> Subscription:
+        """
+        Subscribes with ``eth_subscribe`` and ``params``, e.g.
+        ``["logs", {"address": ...}]``. ``callback`` gets the result of each
+        notification on the reader thread, so it should return quickly.
+        """
+        subscription = Subscription(params, callback, on_reconnect)
+        self._subscribe(subscription)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            self._by_id.pop(subscription.id, None)
+            connected = self._connection is not None
+        if not connected:
+            return
+        try:
+            self._request(
+                rpc_payload(next(self._ids), "eth_unsubscribe", [subscription.id])
+            )
+        except GenLayerError:
+            # the subscription is gone with the connection anyway
+            pass
+
+    def _subscribe(self, subscription: Subscription) -> None:
+        response = self._request(
+            rpc_payload(next(self._ids), "eth_subscribe", subscription.params)
+        )
+        if "error" in response:
+            raise GenLayerError(f"eth_subscribe failed: {response['error']}")
+        with self._lock:
+            subscription.id = response["result"]
+            self._by_id[subscription.id] = subscription
+            early = self._early.pop(subscription.id, [])
+        for result in early:
+            self._notify(subscription, result)
+
+    def _connect(self) -> Any:
+        with self._lock:
+            if self._closed:
+                raise GenLayerError("the WebSocket provider is closed")
+            if self._connection is None:
+                try:
+                    # entered like a context manager, which is the one way
+                    # to get a plain connection from every websockets version
+                    self._connection = connect(
+                        self.url,
+                        open_timeout=self.config.connect_timeout,
+                        compression="deflate" if self.config.compression else None,
+                        proxy=self._proxy,
+                        max_size=None,
+                    ).__enter__()
+                except (WebSocketException, OSError, TimeoutError) as err:
+                    raise RpcTransportError(str(err) or type(err).__name__) from err
+                threading.Thread(
+                    target=self._read,
+                    args=(self._connection,),
+                    name="genlayer-websocket",
+                    daemon=True,
+                ).start()
+            return self._connection
+
+    def _request(self, payload: Any) -> Any:
+        if self.rate_limiter is None:
+            return self._send(payload)
+        slot = self.rate_limiter.acquire(payload)
+        try:
+            return self._send(payload)
+        finally:
+            self.rate_limiter.release(slot)
+
+    def _send(self, payload: Any) -> Any:
+        connection = self._connect()
+        ids = (
+            [call["id"] for call in payload]
+            if isinstance(payload, list)
+            else [payload["id"]]
+        )
+        future: Future = Future()
+        with self._lock:
+            for request_id in ids:
+                self._pending[request_id] = future
+        data = self.codec.dumps(payload)
+        try:
+            # responses are parsed by the reader thread, so their size is
+            # not known here
+            with self.metrics.request(payload, len(data)) as timer:
+                try:
+                    with self._send_lock:
+                        connection.send(data.decode())
+                    return timer.response(
+                        future.result(timeout=self.config.read_timeout)
+                    )
+                except (WebSocketException, OSError) as err:
+                    raise RpcTransportError(str(err) or type(err).__name__) from err
+                except FutureTimeoutError as err:
+                    raise RpcTransportError("WebSocket request timed out") from err
+        finally:
+            with self._lock:
+                for request_id in ids:
+                    self._pending.pop(request_id, None)
+
+    def _read(self, connection: Any) -> None:
+        try:
+            for message in connection:
+                try:
+                    self._dispatch(self.codec.loads(message))
+                except ValueError as err:
+                    logger.warning(f"Invalid WebSocket message: {err}")
+        except (WebSocketException, OSError):
+            pass
+        self._disconnected(connection)
+
+    def _dispatch(self, message: Any) -> None:
+        if isinstance(message, list):
+            ids = [response.get("id") for response in message]
+        elif message.get("method") == "eth_subscription":
+            params = message["params"]
+            with self._lock:
+                subscription = self._by_id.get(params["subscription"])
+                if subscription is None:
+                    early = self._early.setdefault(params["subscription"], [])
+                    if len(early) < _MAX_EARLY_NOTIFICATIONS:
+                        early.append(params["result"])
+                    return
+            self._notify(subscription, params["result"])
+            return
+        else:
+            ids = [message.get("id")]
+        with self._lock:
+            future = next((self._pending[i] for i in ids if i in self._pending), None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    def _notify(self, subscription: Subscription, result: Any) -> None:
+        try:
+            subscription.callback(result)
+        except Exception:
+            logger.exception("WebSocket subscription callback failed")
+
+    def _disconnected(self, connection: Any) -> None:
+        with self._lock:
+            if self._connection is connection:
+                self._connection = None
+            self._drops += 1
+            pending = list(self._pending.values())
+            self._by_id.clear()
+            self._early.clear()
+            resubscribe = (
+                not self._closed
+                and not self._reconnecting
+                and bool(self._subscriptions)
+            )
+            if resubscribe:
+                self._reconnecting = True
+        error = RpcTransportError("WebSocket connection lost")
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+        if resubscribe:
+            self._resubscribe()
+
+    def _resubscribe(self) -> None:
+        try:
+            while True:
+                subscriptions, drops = self._subscribe_again()
+                with self._lock:
+                    # a drop of the new connection after it was subscribed
+                    # found this flag set and left the subscribing to us
+                    if self._drops == drops or self._closed or not self._subscriptions:
+                        self._reconnecting = False
+                        break
+        except BaseException:
+            with self._lock:
+                self._reconnecting = False
+            raise
+        for subscription in subscriptions:
+            if subscription.on_reconnect is not None:
+                try:
+                    subscription.on_reconnect()
+                except Exception:
+                    logger.exception("WebSocket reconnection callback failed")
+
+    def _subscribe_again(self) -> Tuple[List[Subscription], int]:
+        retry = 0
+        while True:
+            with self._lock:
+                if self._closed:
+                    return [], self._drops
+                subscriptions = list(self._subscriptions)
+                drops = self._drops
+                # a connection lost while subscribing again is retried here
+                self._by_id.clear()
+            try:
+                for subscription in subscriptions:
+                    self._subscribe(subscription)
+                return subscriptions, drops
+            except RpcTransportError as err:
+                logger.warning(f"WebSocket reconnection failed: {err}")
+            except GenLayerError as err:
+                # their notifications are lost, on_reconnect still tells the
+                # callers to catch up
+                logger.error(f"WebSocket subscriptions not restored: {err}")
+                return subscriptions, drops
+            time.sleep(backoff_delay(self._retry_config, retry))
+            retry += 1
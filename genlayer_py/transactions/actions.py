@@ -5,11 +5,23 @@ from web3.types import _Hash32
 from genlayer_py.config import transaction_config
 from genlayer_py.types import TransactionStatus, TRANSACTION_STATUS_NAME_TO_NUMBER
 from genlayer_py.exceptions import GenLayerError
-from typing import TYPE_CHECKING
+from genlayer_py.provider.metrics import instrumented
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
+from eth_abi.exceptions import DecodingError
+from eth_utils.abi import get_abi_output_types
+from hexbytes import HexBytes
 from genlayer_py.types import GenLayerTransaction, GenLayerRawTransaction
 import time
 import base64
 from genlayer_py.chains import localnet
+from .events import ConsensusEvents, consensus_events
+from .polling import (
+    Clock,
+    StatusCallback,
+    StatusReporter,
+    poll_intervals,
+    wait_timeout,
+)
 from genlayer_py.utils.jsonifier import (
     calldata_to_user_friendly_json,
     result_to_user_friendly_json,
@@ -20,66 +32,205 @@ if TYPE_CHECKING:
     from genlayer_py.client import GenLayerClient
 
 
+@instrumented
 def wait_for_transaction_receipt(
     self: GenLayerClient,
     transaction_hash: _Hash32,
     status: TransactionStatus = TransactionStatus.ACCEPTED,
     interval: int = transaction_config.wait_interval,
     retries: int = transaction_config.retries,
+    timeout: Optional[float] = None,
+    on_status: Optional[StatusCallback] = None,
+    clock: Optional[Clock] = None,
 ) -> GenLayerTransaction:
+    """
+    Waits for the transaction to reach ``status``. It is polled quickly at
+    first, then less and less often up to every ``interval`` ms, for
+    ``timeout`` seconds, by default ``interval`` times ``retries``.
+    ``on_status`` gets the transaction each time its status changes.
+    """
+    clock = clock if clock is not None else Clock()
+    timeout = wait_timeout(interval, retries, timeout)
+    reporter = StatusReporter(on_status)
+    events = consensus_events(self)
+    if events is not None:
+        return _wait_for_events(
+            self, events, transaction_hash, status, timeout, reporter, clock
+        )
 
-    attempts = 0
-    while attempts < retries:
+    deadline = clock.now() + timeout
+    for delay in poll_intervals(transaction_config, interval):
         transaction = self.get_transaction(transaction_hash=transaction_hash)
-        if transaction is None:
-            raise GenLayerError(f"Transaction {transaction_hash} not found")
-        transaction_status = str(transaction["status"])
-        finalized_status = TRANSACTION_STATUS_NAME_TO_NUMBER[
-            TransactionStatus.FINALIZED
-        ]
-        requested_status = TRANSACTION_STATUS_NAME_TO_NUMBER[status]
-
-        if transaction_status == requested_status or (
-            status == TransactionStatus.ACCEPTED
-            and transaction_status == finalized_status
-        ):
+        reporter.update(transaction)
+        if _has_status(transaction_hash, transaction, status):
             return transaction
-        time.sleep(interval / 1000)
-        attempts += 1
+        remaining = deadline - clock.now()
+        if remaining <= 0:
+            break
+        clock.sleep(min(delay, remaining))
     raise GenLayerError(
-        f"Transaction {transaction_hash} not finalized after {retries} retries"
+        f"Transaction {transaction_hash} not finalized after {timeout}s"
     )
 
 
+def _wait_for_events(
+    self: GenLayerClient,
+    events: ConsensusEvents,
+    transaction_hash: _Hash32,
+    status: TransactionStatus,
+    timeout: float,
+    reporter: StatusReporter,
+    clock: Clock,
+) -> GenLayerTransaction:
+    # the transaction is only fetched again when an event about it arrives
+    deadline = clock.now() + timeout
+    waiter = events.watch(str(transaction_hash))
+    try:
+        while True:
+            transaction = self.get_transaction(transaction_hash=transaction_hash)
+            reporter.update(transaction)
+            if _has_status(transaction_hash, transaction, status):
+                return transaction
+            remaining = deadline - clock.now()
+            if remaining <= 0 or not waiter.wait(remaining):
+                raise GenLayerError(
+                    f"Transaction {transaction_hash} not finalized after {timeout}s"
+                )
+    finally:
+        events.unwatch(waiter)
+
+
+def _has_status(
+    transaction_hash: _Hash32,
+    transaction: Optional[GenLayerTransaction],
+    status: TransactionStatus,
+) -> bool:
+    if transaction is None:
+        raise GenLayerError(f"Transaction {transaction_hash} not found")
+    transaction_status = str(transaction["status"])
+    finalized_status = TRANSACTION_STATUS_NAME_TO_NUMBER[TransactionStatus.FINALIZED]
+    requested_status = TRANSACTION_STATUS_NAME_TO_NUMBER[status]
+    return transaction_status == requested_status or (
+        status == TransactionStatus.ACCEPTED and transaction_status == finalized_status
+    )
+
+
+@instrumented
 def get_transaction(
     self: GenLayerClient,
     transaction_hash: _Hash32,
+    lazy_calldata: bool = False,
 ) -> GenLayerTransaction:
     if self.chain.id == localnet.id:
         transaction = self.provider.make_request(
             method="eth_getTransactionByHash", params=[transaction_hash]
         )["result"]
-        localnet_status = (
-            TransactionStatus.PENDING
-            if transaction["status"] == "ACTIVATED"
-            else transaction["status"]
-        )
-        transaction["status"] = int(TRANSACTION_STATUS_NAME_TO_NUMBER[localnet_status])
-        transaction["status_name"] = localnet_status
-        return _decode_localnet_transaction(transaction)
+        return _from_localnet_transaction(transaction, lazy=lazy_calldata)
     # Decode for testnet
-    consensus_data_contract = self.w3.eth.contract(
+    transaction = (
+        _consensus_data_contract(self)
+        .functions.getTransactionData(transaction_hash, int(time.time()))
+        .call()
+    )
+    raw_transaction = GenLayerRawTransaction.from_transaction_data(transaction)
+    return raw_transaction.decode(lazy_calldata=lazy_calldata)
+
+
+def _get_transactions(
+    self: GenLayerClient,
+    transaction_hashes: Sequence[_Hash32],
+    lazy_calldata: bool = False,
+) -> List[Union[Optional[GenLayerTransaction], GenLayerError]]:
+    """
+    Fetches transactions as one JSON-RPC batch. Each result is the
+    transaction, None if it is not found, or the error of its call.
+    """
+    if self.chain.id == localnet.id:
+        calls = [("eth_getTransactionByHash", [h]) for h in transaction_hashes]
+    else:
+        contract = _consensus_data_contract(self)
+        timestamp = int(time.time())
+        calls = [
+            (
+                "eth_call",
+                [
+                    {
+                        "to": contract.address,
+                        "data": contract.encode_abi(
+                            "getTransactionData", args=[h, timestamp]
+                        ),
+                    },
+                    "latest",
+                ],
+            )
+            for h in transaction_hashes
+        ]
+    responses = self.provider.make_batch_request(calls)
+    results: List[Union[Optional[GenLayerTransaction], GenLayerError]] = []
+    for transaction_hash, response in zip(transaction_hashes, responses):
+        try:
+            results.append(
+                _decode_transaction_response(
+                    self, transaction_hash, response, lazy_calldata
+                )
+            )
+        except GenLayerError as err:
+            results.append(err)
+    return results
+
+
+def _decode_transaction_response(
+    self: GenLayerClient,
+    transaction_hash: _Hash32,
+    response: Dict[str, Any],
+    lazy_calldata: bool,
+) -> Optional[GenLayerTransaction]:
+    if response.get("error") is not None:
+        raise GenLayerError(
+            f"Transaction {transaction_hash} could not be fetched: "
+            f"{response['error'].get('message')}"
+        )
+    result = response.get("result")
+    if result is None:
+        return None
+    if self.chain.id == localnet.id:
+        return _from_localnet_transaction(result, lazy=lazy_calldata)
+    function = _consensus_data_contract(self).get_function_by_name("getTransactionData")
+    try:
+        (transaction,) = self.w3.codec.decode(
+            get_abi_output_types(function.abi), HexBytes(result)
+        )
+    except DecodingError as err:
+        raise GenLayerError(
+            f"Transaction {transaction_hash} could not be decoded: {err}"
+        ) from err
+    raw_transaction = GenLayerRawTransaction.from_transaction_data(transaction)
+    return raw_transaction.decode(lazy_calldata=lazy_calldata)
+
+
+def _consensus_data_contract(self: GenLayerClient) -> Any:
+    return self.w3.eth.contract(
         address=self.chain.consensus_data_contract["address"],
         abi=self.chain.consensus_data_contract["abi"],
     )
-    transaction = consensus_data_contract.functions.getTransactionData(
-        transaction_hash, int(time.time())
-    ).call()
-    raw_transaction = GenLayerRawTransaction.from_transaction_data(transaction)
-    return raw_transaction.decode()
 
 
-def _decode_localnet_transaction(tx: GenLayerTransaction) -> GenLayerTransaction:
+def _from_localnet_transaction(
+    transaction: GenLayerTransaction, lazy: bool = False
+) -> GenLayerTransaction:
+    localnet_status = (
+        TransactionStatus.PENDING
+        if transaction["status"] == "ACTIVATED"
+        else transaction["status"]
+    )
+    transaction["status"] = int(TRANSACTION_STATUS_NAME_TO_NUMBER[localnet_status])
+    transaction["status_name"] = localnet_status
+    return _decode_localnet_transaction(transaction, lazy=lazy)
+
+
+def _decode_localnet_transaction(
+    tx: GenLayerTransaction, lazy: bool = False
+) -> GenLayerTransaction:
     if "data" not in tx or tx["data"] is None:
         return tx
 
@@ -91,13 +242,15 @@ def _decode_localnet_transaction(tx: GenLayerTransaction) -> GenLayerTransaction
             )
             for receipt in receipts:
                 if "result" in receipt:
-                    receipt["result"] = result_to_user_friendly_json(receipt["result"])
+                    receipt["result"] = result_to_user_friendly_json(
+                        receipt["result"], lazy=lazy
+                    )
 
                 if "calldata" in receipt:
                     receipt["calldata"] = {
                         "base64": receipt["calldata"],
                         **calldata_to_user_friendly_json(
-                            b64_to_array(receipt["calldata"])
+                            b64_to_array(receipt["calldata"]), lazy=lazy
                         ),
                     }
 
@@ -107,7 +260,7 @@ def _decode_localnet_transaction(tx: GenLayerTransaction) -> GenLayerTransaction
                         try:
                             decoded_value = base64.b64decode(value).decode("utf-8")
                             decoded_outputs[key] = result_to_user_friendly_json(
-                                decoded_value
+                                decoded_value, lazy=lazy
                             )
                         except (ValueError, UnicodeDecodeError) as e:
                             logging.warning(f"Error decoding eq_output {key}: {str(e)}")
@@ -117,7 +270,9 @@ def _decode_localnet_transaction(tx: GenLayerTransaction) -> GenLayerTransaction
         if "calldata" in tx.get("data", {}):
             tx["data"]["calldata"] = {
                 "base64": tx["data"]["calldata"],
-                **calldata_to_user_friendly_json(b64_to_array(tx["data"]["calldata"])),
+                **calldata_to_user_friendly_json(
+                    b64_to_array(tx["data"]["calldata"]), lazy=lazy
+                ),
             }
 
     except Exception as e:
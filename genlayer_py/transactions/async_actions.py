@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from web3.types import _Hash32
+from genlayer_py.config import transaction_config
+from genlayer_py.types import TransactionStatus
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.provider.metrics import instrumented
+from typing import TYPE_CHECKING, Optional
+from genlayer_py.types import GenLayerTransaction, GenLayerRawTransaction
+from genlayer_py.chains import localnet
+from .actions import _consensus_data_contract, _from_localnet_transaction, _has_status
+from .polling import (
+    AsyncClock,
+    StatusCallback,
+    StatusReporter,
+    poll_intervals,
+    wait_timeout,
+)
+
+if TYPE_CHECKING:
+    from genlayer_py.client import AsyncGenLayerClient
+
+
+@instrumented
+async def wait_for_transaction_receipt(
+    self: AsyncGenLayerClient,
+    transaction_hash: _Hash32,
+    status: TransactionStatus = TransactionStatus.ACCEPTED,
+    interval: int = transaction_config.wait_interval,
+    retries: int = transaction_config.retries,
+    timeout: Optional[float] = None,
+    on_status: Optional[StatusCallback] = None,
+    clock: Optional[AsyncClock] = None,
+) -> GenLayerTransaction:
+    clock = clock if clock is not None else AsyncClock()
+    timeout = wait_timeout(interval, retries, timeout)
+    reporter = StatusReporter(on_status)
+    deadline = clock.now() + timeout
+    for delay in poll_intervals(transaction_config, interval):
+        transaction = await self.get_transaction(transaction_hash=transaction_hash)
+        reporter.update(transaction)
+        if _has_status(transaction_hash, transaction, status):
+            return transaction
+        remaining = deadline - clock.now()
+        if remaining <= 0:
+            break
+        await clock.sleep(min(delay, remaining))
+    raise GenLayerError(
+        f"Transaction {transaction_hash} not finalized after {timeout}s"
+    )
+
+
+@instrumented
+async def get_transaction(
+    self: AsyncGenLayerClient,
+    transaction_hash: _Hash32,
+    lazy_calldata: bool = False,
+) -> GenLayerTransaction:
+    if self.chain.id == localnet.id:
+        transaction = (
+            await self.provider.make_request(
+                method="eth_getTransactionByHash", params=[transaction_hash]
+            )
+        )["result"]
+        return _from_localnet_transaction(transaction, lazy=lazy_calldata)
+    # Decode for testnet
+    transaction = (
+        await _consensus_data_contract(self)
+        .functions.getTransactionData(transaction_hash, int(time.time()))
+        .call()
+    )
+    raw_transaction = GenLayerRawTransaction.from_transaction_data(transaction)
+    return raw_transaction.decode(lazy_calldata=lazy_calldata)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+from eth_utils import event_abi_to_log_topic
+import threading
+from genlayer_py.types import TransactionStatus
+from genlayer_py.provider.websocket import Subscription, WebSocketProvider
+
+if TYPE_CHECKING:
+    from genlayer_py.client import GenLayerClient
+
+# consensus main contract events and the status they announce
+CONSENSUS_EVENTS = {
+    "NewTransaction": TransactionStatus.PENDING,
+    "TransactionAccepted": TransactionStatus.ACCEPTED,
+    "TransactionFinalized": TransactionStatus.FINALIZED,
+    "TransactionUndetermined": TransactionStatus.UNDETERMINED,
+    "TransactionLeaderTimeout": TransactionStatus.LEADER_TIMEOUT,
+    "TransactionCancelled": TransactionStatus.CANCELED,
+}
+
+
+def consensus_event_topics(abi: List[Dict[str, Any]]) -> Dict[str, TransactionStatus]:
+    """
+    Maps the topic of each ``CONSENSUS_EVENTS`` event in ``abi`` to its
+    status.
+    """
+    topics = {}
+    for item in abi:
+        if item.get("type") == "event" and item.get("name") in CONSENSUS_EVENTS:
+            topic = "0x" + event_abi_to_log_topic(item).hex()
+            topics[topic] = CONSENSUS_EVENTS[item["name"]]
+    return topics
+
+
+class TransactionWaiter:
+    """
+    Set when a consensus event about its transaction arrives, or when the
+    subscription was made again after a reconnection.
+    """
+
+    __slots__ = ("transaction_id", "statuses", "_event")
+
+    def __init__(self, transaction_id: str) -> None:
+        self.transaction_id = transaction_id
+        # statuses announced since the waiter was created
+        self.statuses: List[TransactionStatus] = []
+        self._event = threading.Event()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        woken = self._event.wait(timeout)
+        self._event.clear()
+        return woken
+
+    def set(self, status: Optional[TransactionStatus] = None) -> None:
+        if status is not None:
+            self.statuses.append(status)
+        self._event.set()
+
+
+class ConsensusEvents:
+    """
+    A ``logs`` subscription to the consensus main contract events of a
+    WebSocket provider, waking the waiters of the transaction each event is
+    about.
+    """
+
+    def __init__(self, provider: WebSocketProvider, contract: Dict[str, Any]) -> None:
+        self.provider = provider
+        self.address = contract["address"]
+        self.topics = consensus_event_topics(contract["abi"])
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._waiters: Dict[str, Set[TransactionWaiter]] = {}
+        self._subscription: Optional[Subscription] = None
+
+    def start(self) -> None:
+        # not under self._lock: notifications that came before the
+        # subscription id was known are delivered to _on_log by subscribe
+        with self._start_lock:
+            if self._subscription is not None:
+                return
+            subscription = self.provider.subscribe(
+                ["logs", {"address": self.address, "topics": [list(self.topics)]}],
+                self._on_log,
+                self._on_reconnect,
+            )
+            with self._lock:
+                self._subscription = subscription
+
+    def stop(self) -> None:
+        with self._lock:
+            subscription, self._subscription = self._subscription, None
+        if subscription is not None:
+            self.provider.unsubscribe(subscription)
+
+    def watch(self, transaction_id: str) -> TransactionWaiter:
+        """
+        Returns a waiter for ``transaction_id``, to be passed to ``unwatch``
+        once done. Register it before checking the transaction so no event
+        is missed in between.
+        """
+        self.start()
+        waiter = TransactionWaiter(transaction_id.lower())
+        with self._lock:
+            self._waiters.setdefault(waiter.transaction_id, set()).add(waiter)
+        return waiter
+
+    def unwatch(self, waiter: TransactionWaiter) -> None:
+        with self._lock:
+            waiters = self._waiters.get(waiter.transaction_id)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._waiters[waiter.transaction_id]
+
+    def _on_log(self, log: Dict[str, Any]) -> None:
+        topics = log.get("topics") or []
+        if len(topics) < 2:
+            return
+        status = self.topics.get(str(topics[0]).lower())
+        if status is None:
+            return
+        with self._lock:
+            waiters = list(self._waiters.get(str(topics[1]).lower(), ()))
+        for waiter in waiters:
+            waiter.set(status)
+
+    def _on_reconnect(self) -> None:
+        # events may have been missed while disconnected
+        with self._lock:
+            waiters = [w for ws in self._waiters.values() for w in ws]
+        for waiter in waiters:
+            waiter.set()
+
+
+def consensus_events(self: GenLayerClient) -> Optional[ConsensusEvents]:
+    """
+    Returns the consensus events of a client connected over WebSocket, None
+    for other providers.
+    """
+    if not isinstance(self.provider, WebSocketProvider):
+        return None
+    contract = self.chain.consensus_main_contract
+    if contract is None:
+        return None
+    events = getattr(self, "_consensus_events", None)
+    if events is None or events.address != contract["address"]:
+        if events is not None:
+            events.stop()
+        events = ConsensusEvents(self.provider, contract)
+        self._consensus_events = events
+    return events
@@ -0,0 +1,63 @@
+from typing import Any, Callable, Iterator, Optional
+import asyncio
+import time
+from genlayer_py.config.transactions import TransactionConfig
+
+StatusCallback = Callable[[Any], None]
+
+
+class Clock:
+    """
+    The time source of ``wait_for_transaction_receipt``, replace it to run
+    waits without sleeping, e.g. in tests.
+    """
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class AsyncClock(Clock):
+    async def sleep(self, seconds: float) -> None:  # type: ignore[override]
+        await asyncio.sleep(seconds)
+
+
+def poll_intervals(config: TransactionConfig, interval: int) -> Iterator[float]:
+    """
+    Yields the seconds to wait before each new poll, starting at
+    ``config.poll_interval`` and growing by ``config.poll_backoff`` up to
+    ``interval`` milliseconds.
+    """
+    cap = interval / 1000
+    delay = min(config.poll_interval / 1000, cap)
+    while True:
+        yield delay
+        delay = min(delay * config.poll_backoff, cap)
+
+
+def wait_timeout(interval: int, retries: int, timeout: Optional[float]) -> float:
+    # the deadline the fixed interval polling used to give
+    return timeout if timeout is not None else interval * retries / 1000
+
+
+class StatusReporter:
+    """
+    Calls ``callback`` with a transaction whenever its status differs from
+    the one seen before.
+    """
+
+    __slots__ = ("callback", "status")
+
+    def __init__(self, callback: Optional[StatusCallback]) -> None:
+        self.callback = callback
+        self.status: Any = None
+
+    def update(self, transaction: Any) -> None:
+        if self.callback is None or transaction is None:
+            return
+        status = transaction.get("status")
+        if status != self.status:
+            self.status = status
+            self.callback(transaction)
@@ -0,0 +1,491 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, InvalidStateError
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+import heapq
+import itertools
+import logging
+import threading
+from web3.types import _Hash32
+from genlayer_py.config import transaction_config
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.types import GenLayerTransaction, TransactionStatus
+from .actions import _get_transactions, _has_status
+from .events import consensus_event_topics
+from .polling import Clock, StatusCallback, StatusReporter, poll_intervals
+
+if TYPE_CHECKING:
+    from genlayer_py.client import GenLayerClient
+
+logger = logging.getLogger(__name__)
+
+
+class _Watch:
+    __slots__ = (
+        "transaction_hash",
+        "status",
+        "timeout",
+        "deadline",
+        "future",
+        "reporter",
+        "delays",
+    )
+
+    def __init__(
+        self,
+        transaction_hash: _Hash32,
+        status: TransactionStatus,
+        timeout: float,
+        deadline: float,
+        reporter: StatusReporter,
+        delays: Iterator[float],
+    ) -> None:
+        self.transaction_hash = transaction_hash
+        self.status = status
+        self.timeout = timeout
+        self.deadline = deadline
+        self.future: Future = Future()
+        self.reporter = reporter
+        self.delays = delays
+
+    def resolve(
+        self,
+        transaction: Optional[GenLayerTransaction] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        # the owner of the future may have cancelled it meanwhile
+        try:
+            if error is not None:
+                self.future.set_exception(error)
+            else:
+                self.future.set_result(transaction)
+        except InvalidStateError:
+            pass
+
+
+class TransactionWatcher:
+    """
+    Waits for many transactions from one background thread. Each watched
+    transaction is polled on its own schedule, like in
+    ``wait_for_transaction_receipt``, and those due together are fetched
+    as JSON-RPC batches of up to ``batch_size``. The batches go through the
+    rate limits of the client's provider, if any, in the class of their
+    method: ``poll`` for the ``eth_getTransactionByHash`` calls on localnet,
+    ``read`` for the ``eth_call`` calls on other networks, where they share
+    the limits of contract reads. On top of those limits, which are
+    optional and shared with every other call, the watcher sends at most
+    ``batch_rate`` batches a second, ``transaction_config.watcher_batch_rate``
+    by default, so that a large backlog is spread out rather than sent back
+    to back.
+
+    ``watch`` returns a future per transaction, resolved with the
+    transaction once it reaches its own status, or failed with
+    ``GenLayerError`` when it is not found, can not be fetched or times out.
+    """
+
+    def __init__(
+        self,
+        client: GenLayerClient,
+        batch_size: int = 100,
+        interval: int = transaction_config.wait_interval,
+        clock: Optional[Clock] = None,
+        batch_rate: Optional[float] = None,
+    ) -> None:
+        if batch_size < 1:
+            raise GenLayerError(f"batch_size must be positive, got {batch_size}")
+        if batch_rate is None:
+            batch_rate = transaction_config.watcher_batch_rate
+        if batch_rate <= 0:
+            raise GenLayerError(f"batch_rate must be positive, got {batch_rate}")
+        self.client = client
+        self.batch_size = batch_size
+        self.interval = interval
+        self.batch_rate = batch_rate
+        self.clock = clock if clock is not None else Clock()
+        self._next_batch_at: Optional[float] = None
+        self._condition = threading.Condition()
+        # (due time, order, watch), the order breaks ties
+        self._due: List[tuple] = []
+        self._order = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __enter__(self) -> "TransactionWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def watch(
+        self,
+        transaction_hash: _Hash32,
+        status: TransactionStatus = TransactionStatus.ACCEPTED,
+        timeout: Optional[float] = None,
+        on_status: Optional[StatusCallback] = None,
+    ) -> Future:
+        """
+        Returns a future of the transaction once it reaches ``status``, in
+        ``timeout`` seconds, by default the interval times
+        ``transaction_config.retries``. ``on_status`` is called on the
+        watcher thread each time the status of the transaction changes.
+        """
+        if timeout is None:
+            timeout = self.interval * transaction_config.retries / 1000
+        now = self.clock.now()
+        watch = _Watch(
+            transaction_hash,
+            status,
+            timeout,
+            now + timeout,
+            StatusReporter(on_status),
+            poll_intervals(transaction_config, self.interval),
+        )
+        with self._condition:
+            if self._closed:
+                raise GenLayerError("the transaction watcher is closed")
+            heapq.heappush(self._due, (now, next(self._order), watch))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="genlayer-watcher", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return watch.future
+
+    def watch_many(
+        self,
+        transaction_hashes: Iterable[_Hash32],
+        status: TransactionStatus = TransactionStatus.ACCEPTED,
+        timeout: Optional[float] = None,
+    ) -> List[Future]:
+        return [self.watch(h, status, timeout) for h in transaction_hashes]
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._due)
+
+    def _drain(self) -> List[_Watch]:
+        due, self._due = self._due, []
+        return [watch for _, _, watch in due]
+
+    def close(self) -> None:
+        """
+        Stops the watcher thread and cancels the futures still pending.
+        """
+        with self._condition:
+            self._closed = True
+            watches = self._drain()
+            thread = self._thread
+            self._condition.notify()
+        for watch in watches:
+            watch.future.cancel()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    due = self._next_due()
+                    delay = None if due is None else due - self.clock.now()
+                    if delay is not None and delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                work = self._take_due(self.clock.now())
+            self._process(work)
+
+    def _next_due(self) -> Optional[float]:
+        return self._due[0][0] if self._due else None
+
+    def _take_due(self, now: float) -> Any:
+        batch: List[_Watch] = []
+        while self._due and self._due[0][0] <= now and len(batch) < self.batch_size:
+            _, _, watch = heapq.heappop(self._due)
+            # futures cancelled by their owner are dropped
+            if not watch.future.cancelled():
+                batch.append(watch)
+        return batch
+
+    def _process(self, batch: List[_Watch]) -> None:
+        if not batch:
+            return
+        try:
+            self._poll(batch)
+        except Exception as err:  # pragma: no cover - defensive
+            logger.exception("Transaction watcher poll failed")
+            for watch in batch:
+                watch.resolve(error=err)
+
+    def _pace(self) -> bool:
+        """
+        Waits for the turn of the next batch, returns False if the watcher
+        was closed meanwhile.
+        """
+        with self._condition:
+            while not self._closed:
+                now = self.clock.now()
+                if self._next_batch_at is None or self._next_batch_at <= now:
+                    self._next_batch_at = now + 1 / self.batch_rate
+                    return True
+                self._condition.wait(self._next_batch_at - now)
+            return False
+
+    def _poll(self, batch: List[_Watch]) -> None:
+        if not self._pace():
+            self._reschedule(batch, None)
+            return
+        # a transaction watched more than once is fetched once
+        hashes = list(dict.fromkeys(watch.transaction_hash for watch in batch))
+        try:
+            fetched = _get_transactions(self.client, hashes)
+        except GenLayerError as err:
+            # the whole batch failed, it is tried again until the deadlines
+            self._reschedule(batch, err)
+            return
+        results: Dict[_Hash32, object] = dict(zip(hashes, fetched))
+        retry: List[_Watch] = []
+        for watch in batch:
+            result = results[watch.transaction_hash]
+            try:
+                if isinstance(result, GenLayerError):
+                    raise result
+                watch.reporter.update(result)
+                if _has_status(watch.transaction_hash, result, watch.status):
+                    watch.resolve(result)
+                    continue
+            except GenLayerError as err:
+                watch.resolve(error=err)
+                continue
+            retry.append(watch)
+        self._reschedule(retry, None)
+
+    def _reschedule(self, batch: List[_Watch], error: Optional[GenLayerError]) -> None:
+        now = self.clock.now()
+        with self._condition:
+            for watch in batch:
+                if self._closed:
+                    watch.future.cancel()
+                    continue
+                remaining = watch.deadline - now
+                if remaining <= 0:
+                    watch.resolve(
+                        error=error
+                        or GenLayerError(
+                            f"Transaction {watch.transaction_hash} not finalized "
+                            f"after {watch.timeout}s"
+                        )
+                    )
+                    continue
+                self._wait_again(watch, now, remaining)
+
+    def _wait_again(self, watch: _Watch, now: float, remaining: float) -> None:
+        due = now + min(next(watch.delays), remaining)
+        heapq.heappush(self._due, (due, next(self._order), watch))
+
+
+class LogTransactionWatcher(TransactionWatcher):
+    """
+    A ``TransactionWatcher`` that follows the consensus main contract
+    events instead of polling each transaction. A transaction is fetched
+    once when it is watched, in case it is already done, then waits for
+    an event announcing its status. All waiting transactions are checked
+    at once by one ``eth_getLogs`` query per range of up to ``block_range``
+    new blocks, and a transaction is fetched again only to return it once
+    the event is seen. ``on_status`` only gets these fetched transactions.
+    """
+
+    def __init__(
+        self,
+        client: GenLayerClient,
+        batch_size: int = 100,
+        interval: int = transaction_config.wait_interval,
+        clock: Optional[Clock] = None,
+        block_range: int = 1000,
+        batch_rate: Optional[float] = None,
+    ) -> None:
+        contract = client.chain.consensus_main_contract
+        if contract is None:
+            raise GenLayerError(
+                "Watching transaction events needs the consensus main contract"
+            )
+        super().__init__(client, batch_size, interval, clock, batch_rate)
+        self.address = contract["address"]
+        self.topics = consensus_event_topics(contract["abi"])
+        self.block_range = block_range
+        # watches waiting for an event, by lowercase transaction id
+        self._waiting: Dict[str, List[_Watch]] = {}
+        self._from_block: Optional[int] = None
+        self._scan_at: Optional[float] = None
+        self._scan_delays = poll_intervals(transaction_config, interval)
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._due) + sum(map(len, self._waiting.values()))
+
+    def _drain(self) -> List[_Watch]:
+        watches = super()._drain()
+        for waiting in self._waiting.values():
+            watches.extend(waiting)
+        self._waiting.clear()
+        return watches
+
+    def _next_due(self) -> Optional[float]:
+        due = super()._next_due()
+        if self._waiting and self._scan_at is not None:
+            due = self._scan_at if due is None else min(due, self._scan_at)
+        return due
+
+    def _take_due(self, now: float) -> Tuple[List[_Watch], bool]:
+        scan = (
+            bool(self._waiting) and self._scan_at is not None and self._scan_at <= now
+        )
+        return super()._take_due(now), scan
+
+    def _process(self, work: Tuple[List[_Watch], bool]) -> None:
+        batch, scan = work
+        if batch and self._from_block is None:
+            # events from this block on are scanned, the first fetch of the
+            # transactions covers what happened before
+            try:
+                self._from_block = self._block_number()
+            except GenLayerError as err:
+                self._reschedule(batch, err)
+                batch = []
+        super()._process(batch)
+        if scan:
+            try:
+                self._scan()
+            except GenLayerError as err:
+                logger.warning(f"Transaction event scan failed: {err}")
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Transaction event scan failed")
+            with self._condition:
+                self._scan_at = self.clock.now() + next(self._scan_delays)
+                self._expire(self.clock.now())
+                if not self._waiting:
+                    # nothing waits for events, the next watch starts the
+                    # scan from the head again rather than from here
+                    self._from_block = None
+
+    def _wait_again(self, watch: _Watch, now: float, remaining: float) -> None:
+        if not self._waiting:
+            self._scan_delays = poll_intervals(transaction_config, self.interval)
+            self._scan_at = now + next(self._scan_delays)
+        self._waiting.setdefault(_transaction_key(watch.transaction_hash), []).append(
+            watch
+        )
+
+    def _scan(self) -> None:
+        head = self._block_number()
+        reached: Dict[str, Set[TransactionStatus]] = {}
+        while self._from_block is not None and self._from_block <= head:
+            to_block = min(head, self._from_block + self.block_range - 1)
+            logs = _result(
+                self.client.provider.make_request(
+                    "eth_getLogs",
+                    [
+                        {
+                            "fromBlock": hex(self._from_block),
+                            "toBlock": hex(to_block),
+                            "address": self.address,
+                            "topics": [list(self.topics)],
+                        }
+                    ],
+                )
+            )
+            for log in logs or []:
+                topics = log.get("topics") or []
+                if len(topics) < 2:
+                    continue
+                status = self.topics.get(str(topics[0]).lower())
+                if status is not None:
+                    reached.setdefault(str(topics[1]).lower(), set()).add(status)
+            self._from_block = to_block + 1
+
+        done: List[_Watch] = []
+        with self._condition:
+            for key, statuses in reached.items():
+                waiting = self._waiting.get(key)
+                if not waiting:
+                    continue
+                for watch in list(waiting):
+                    if TransactionStatus.CANCELED in statuses:
+                        watch.resolve(
+                            error=GenLayerError(
+                                f"Transaction {watch.transaction_hash} was cancelled"
+                            )
+                        )
+                    elif any(_reaches(s, watch.status) for s in statuses):
+                        done.append(watch)
+                    else:
+                        continue
+                    waiting.remove(watch)
+                if not waiting:
+                    del self._waiting[key]
+        # the final fetch, batched, returns the transactions
+        for start in range(0, len(done), self.batch_size):
+            super()._process(done[start : start + self.batch_size])
+
+    def _expire(self, now: float) -> None:
+        for key in list(self._waiting):
+            waiting = self._waiting[key]
+            for watch in list(waiting):
+                if watch.future.cancelled() or watch.deadline <= now:
+                    watch.resolve(
+                        error=GenLayerError(
+                            f"Transaction {watch.transaction_hash} not finalized "
+                            f"after {watch.timeout}s"
+                        )
+                    )
+                    waiting.remove(watch)
+            if not waiting:
+                del self._waiting[key]
+
+    def _block_number(self) -> int:
+        result = _result(self.client.provider.make_request("eth_blockNumber", []))
+        return int(result, 16) if isinstance(result, str) else int(result)
+
+
+def _result(response: Dict[str, Any]) -> Any:
+    if response.get("error") is not None:
+        raise GenLayerError(f"RPC call failed: {response['error'].get('message')}")
+    return response.get("result")
+
+
+def _reaches(event_status: TransactionStatus, status: TransactionStatus) -> bool:
+    # like _has_status, a finalized transaction is accepted too
+    return event_status == status or (
+        status == TransactionStatus.ACCEPTED
+        and event_status == TransactionStatus.FINALIZED
+    )
+
+
+def _transaction_key(transaction_hash: _Hash32) -> str:
+    if isinstance(transaction_hash, str):
+        return transaction_hash.lower()
+    return "0x" + bytes(transaction_hash).hex()
+
+
+def transaction_watcher(self: GenLayerClient, logs: bool = False) -> TransactionWatcher:
+    """
+    Returns the transaction watcher of a client, a ``LogTransactionWatcher``
+    with ``logs``, created on first use.
+    """
+    watchers = self.__dict__.setdefault("_transaction_watchers", {})
+    watcher = watchers.get(logs)
+    if watcher is None:
+        watcher = LogTransactionWatcher(self) if logs else TransactionWatcher(self)
+        watchers[logs] = watcher
+    return watcher
@@ -1,4 +1,5 @@
-from typing import Dict, Any, TypedDict, List
+from typing import Dict, Any, TypedDict, List, Union
+from eth_typing import Address, ChecksumAddress
 
 
 class ContractMethodBase(TypedDict):
@@ -14,3 +15,13 @@ class ContractMethod:
 class ContractSchema(TypedDict):
     ctor: ContractMethodBase
     methods: Dict[str, ContractMethod]
+
+
+class _ContractReadBase(TypedDict):
+    address: Union[Address, ChecksumAddress]
+    function_name: str
+
+
+class ContractRead(_ContractReadBase, total=False):
+    args: List[Any]
+    kwargs: Dict[str, Any]
@@ -350,7 +350,7 @@ class GenLayerRawTransaction:
             last_round=cls.LastRound.from_transaction_data(tx_data[20]),
         )
 
-    def decode(self) -> GenLayerTransaction:
+    def decode(self, lazy_calldata: bool = False) -> GenLayerTransaction:
         return {
             "current_timestamp": str(self.current_timestamp),
             "sender": self.sender,
@@ -373,12 +373,14 @@ class GenLayerRawTransaction:
             "read_state_block_range": self.read_state_block_range.decode(),
             "num_of_rounds": str(self.num_of_rounds),
             "last_round": self.last_round.decode(),
-            "tx_data_decoded": self._decode_input_data(),
+            "tx_data_decoded": self._decode_input_data(lazy_calldata),
             "status_name": TRANSACTION_STATUS_NUMBER_TO_NAME[str(self.status)].value,
             "result_name": TRANSACTION_RESULT_NUMBER_TO_NAME[str(self.result)].value,
         }
 
-    def _decode_input_data(self) -> Union[DecodedDeployData, DecodedCallData, None]:
+    def _decode_input_data(
+        self, lazy_calldata: bool = False
+    ) -> Union[DecodedDeployData, DecodedCallData, None]:
         if not self.tx_data or self.tx_data == "0x" or len(self.tx_data) <= 2:
             return None
 
@@ -389,7 +391,9 @@ class GenLayerRawTransaction:
                 code = Web3.to_hex(rlp_decoded_array[0])
                 constructor_args = rlp_decoded_array[1]
                 if rlp_decoded_array[1] and rlp_decoded_array[2] != "0x":
-                    constructor_args = calldata.decode(rlp_decoded_array[1])
+                    constructor_args = calldata.decode(
+                        rlp_decoded_array[1], lazy=lazy_calldata
+                    )
                 else:
                     constructor_args = None
                 leader_only = rlp_decoded_array[2] == b"\x01"
@@ -402,7 +406,9 @@ class GenLayerRawTransaction:
                 }
             elif len(rlp_decoded_array) == 2:
                 if rlp_decoded_array[0] and rlp_decoded_array[0] != "0x":
-                    call_data = calldata.decode(rlp_decoded_array[0])
+                    call_data = calldata.decode(
+                        rlp_decoded_array[0], lazy=lazy_calldata
+                    )
                 else:
                     call_data = None
                 leader_only = rlp_decoded_array[1] == b"\x01"
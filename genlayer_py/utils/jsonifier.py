@@ -7,10 +7,13 @@ def b64_to_array(b64: str) -> bytearray:
     return bytearray(base64.b64decode(b64))
 
 
-def calldata_to_user_friendly_json(cd: bytearray) -> Dict[str, Any]:
+def calldata_to_user_friendly_json(cd: bytearray, lazy: bool = False) -> Dict[str, Any]:
+    if lazy:
+        # the readable form needs every value, lazy callers get a view instead
+        return {"decoded": calldata.decode(cd, lazy=True)}
     return {
         "raw": list(cd),
-        "readable": calldata.to_str(calldata.decode(cd)),
+        "readable": calldata.decode_to_str(cd),
     }
 
 
@@ -24,7 +27,7 @@ RESULT_CODES = {
 }
 
 
-def result_to_user_friendly_json(cd64: str) -> Dict[str, Any]:
+def result_to_user_friendly_json(cd64: str, lazy: bool = False) -> Dict[str, Any]:
     raw = b64_to_array(cd64)
 
     code = RESULT_CODES.get(raw[0])
@@ -39,7 +42,7 @@ def result_to_user_friendly_json(cd64: str) -> Dict[str, Any]:
             # Decoding UTF-8 string for payload
             payload = raw[1:].decode("utf-8")
         elif raw[0] == 0:
-            payload = calldata_to_user_friendly_json(raw[1:])
+            payload = calldata_to_user_friendly_json(raw[1:], lazy=lazy)
 
     return {
         "raw": cd64,
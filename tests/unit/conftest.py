@@ -0,0 +1,218 @@
+import dataclasses
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from genlayer_py.chains import localnet
+from genlayer_py.client import GenLayerClient
+
+
+class RpcServer:
+    """
+    A local JSON-RPC server. ``handler`` maps a request payload to the
+    response body, the payloads and client ports seen are recorded. Batches
+    are answered call by call, leaving out calls whose response is None.
+    With ``compress`` set, responses are gzipped for clients that accept it.
+    """
+
+    def __init__(self) -> None:
+        self.requests = []
+        self.batches = []
+        self.ports = set()
+        self.compress = False
+        self.compressed = 0
+        self.handler = lambda payload: {
+            "jsonrpc": "2.0",
+            "id": payload["id"],
+            "result": payload["method"],
+        }
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                payload = json.loads(body)
+                server.ports.add(self.client_address[1])
+                status = 200
+                if isinstance(payload, list):
+                    server.batches.append(payload)
+                    server.requests.extend(payload)
+                    response = [server.handler(p) for p in payload]
+                    response = [r for r in response if r is not None]
+                else:
+                    server.requests.append(payload)
+                    response = server.handler(payload)
+                    if isinstance(response, tuple):
+                        status, response = response
+                data = json.dumps(response).encode()
+                accepted = self.headers.get("Accept-Encoding", "")
+                gzipped = server.compress and "gzip" in accepted
+                if gzipped:
+                    data = gzip.compress(data)
+                    server.compressed += 1
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if gzipped:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        # clients that gave up on a slow response are expected
+        self._httpd.handle_error = lambda request, client_address: None
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def rpc_server():
+    server = RpcServer()
+    yield server
+    server.close()
+
+
+def _chain_at(*urls, chain=localnet):
+    return dataclasses.replace(chain, rpc_urls={"default": {"http": list(urls)}})
+
+
+@pytest.fixture
+def chain_at():
+    """
+    Makes a copy of a chain, localnet by default, whose RPC endpoints are
+    the given URLs, e.g. ``chain_at(rpc_server.url)``.
+    """
+    return _chain_at
+
+
+@pytest.fixture
+def localnet_client():
+    """
+    Makes a ``GenLayerClient`` on localnet served by a local server, e.g.
+    ``localnet_client(rpc_server, account)``.
+    """
+
+    def make(server, *args, **kwargs):
+        return GenLayerClient(_chain_at(server.url), *args, **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def rpc_servers():
+    servers = []
+
+    def make():
+        server = RpcServer()
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.close()
+
+
+class WsRpcServer:
+    """
+    A local JSON-RPC server over WebSocket. Requests are answered by
+    ``handler`` like ``RpcServer`` does, ``eth_subscribe`` and
+    ``eth_unsubscribe`` are handled here; ``push`` notifies every
+    subscription and ``drop`` closes the open connections.
+    """
+
+    def __init__(self) -> None:
+        from websockets.sync.server import serve
+
+        self.requests = []
+        self.subscriptions = {}
+        self.connections = set()
+        self.handler = lambda payload: {
+            "jsonrpc": "2.0",
+            "id": payload["id"],
+            "result": payload["method"],
+        }
+        self._lock = threading.Lock()
+        self._next_subscription = 0
+        self._server = serve(self._serve, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self._server.socket.getsockname()[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _answer(self, connection, payload):
+        self.requests.append(payload)
+        if payload["method"] == "eth_subscribe":
+            with self._lock:
+                self._next_subscription += 1
+                subscription = hex(self._next_subscription)
+                self.subscriptions[subscription] = (connection, payload["params"])
+            return {"jsonrpc": "2.0", "id": payload["id"], "result": subscription}
+        if payload["method"] == "eth_unsubscribe":
+            with self._lock:
+                found = self.subscriptions.pop(payload["params"][0], None)
+            return {"jsonrpc": "2.0", "id": payload["id"], "result": bool(found)}
+        return self.handler(payload)
+
+    def _serve(self, connection):
+        with self._lock:
+            self.connections.add(connection)
+        try:
+            for message in connection:
+                payload = json.loads(message)
+                if isinstance(payload, list):
+                    response = [self._answer(connection, p) for p in payload]
+                else:
+                    response = self._answer(connection, payload)
+                connection.send(json.dumps(response))
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self.connections.discard(connection)
+                for key, (owner, _) in list(self.subscriptions.items()):
+                    if owner is connection:
+                        del self.subscriptions[key]
+
+    def push(self, result) -> None:
+        with self._lock:
+            subscriptions = list(self.subscriptions.items())
+        for subscription, (connection, _) in subscriptions:
+            message = {
+                "jsonrpc": "2.0",
+                "method": "eth_subscription",
+                "params": {"subscription": subscription, "result": result},
+            }
+            try:
+                connection.send(json.dumps(message))
+            except Exception:
+                pass
+
+    def drop(self) -> None:
+        with self._lock:
+            connections = list(self.connections)
+        for connection in connections:
+            connection.close()
+
+    def close(self) -> None:
+        self._server.shutdown()
+
+
+@pytest.fixture
+def ws_server():
+    server = WsRpcServer()
+    yield server
+    server.close()
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from eth_account import Account
+from genlayer_py.abi import calldata
+from genlayer_py.client import AsyncGenLayerClient, GenLayerClient
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.provider import AsyncGenLayerProvider
+from genlayer_py.types import TransactionStatus
+
+
+def respond(payload, result):
+    return {"jsonrpc": "2.0", "id": payload["id"], "result": result}
+
+
+def test_async_provider(rpc_server):
+    async def run():
+        provider = AsyncGenLayerProvider(rpc_server.url)
+        single = await provider.make_request("eth_chainId", [])
+        batch = await provider.make_batch_request([("a", []), ("b", [])])
+        assert await provider.is_connected()
+        await provider.disconnect()
+        return single, batch
+
+    single, batch = asyncio.run(run())
+    assert single["result"] == "eth_chainId"
+    assert [r["result"] for r in batch] == ["a", "b"]
+    assert len(rpc_server.batches) == 1
+
+
+def test_async_provider_errors(rpc_server):
+    rpc_server.handler = lambda payload: (500, "boom")
+
+    async def run():
+        provider = AsyncGenLayerProvider(rpc_server.url)
+        try:
+            await provider.make_request("eth_chainId", [])
+        finally:
+            await provider.disconnect()
+
+    with pytest.raises(GenLayerError, match="boom"):
+        asyncio.run(run())
+
+
+def test_async_client_matches_sync_client(rpc_server, chain_at):
+    def handler(payload):
+        method = payload["method"]
+        if method == "gen_call":
+            data = payload["params"][0]["data"]
+            return respond(payload, calldata.encode([data[-8:]]).hex())
+        if method == "eth_getTransactionCount":
+            return respond(payload, "0x7")
+        if method == "eth_getTransactionByHash":
+            return respond(
+                payload, {"hash": payload["params"][0], "status": "ACCEPTED"}
+            )
+        if method == "sim_getConsensusContract":
+            return respond(payload, {"address": "0x01", "abi": []})
+        return respond(payload, None)
+
+    rpc_server.handler = handler
+    account = Account.create()
+    chain = chain_at(rpc_server.url)
+    sync_client = GenLayerClient(chain, account)
+
+    async def run():
+        async with AsyncGenLayerClient(chain, account) as client:
+            reads = await asyncio.gather(
+                *(client.read_contract("0x01", "get", [i]) for i in range(20))
+            )
+            batched = await client.read_contracts(
+                [
+                    {"address": "0x01", "function_name": "get", "args": [i]}
+                    for i in range(20)
+                ],
+                batch_size=6,
+            )
+            nonce = await client.get_current_nonce(account.address)
+            receipt = await client.wait_for_transaction_receipt(
+                "0xab", status=TransactionStatus.ACCEPTED, interval=0
+            )
+            return reads, batched, nonce, receipt
+
+    reads, batched, nonce, receipt = asyncio.run(run())
+    expected = [sync_client.read_contract("0x01", "get", [i]) for i in range(20)]
+    assert reads == expected and batched == expected
+    assert nonce == 7
+    assert receipt == sync_client.get_transaction("0xab")
+    assert receipt["status_name"] == TransactionStatus.ACCEPTED
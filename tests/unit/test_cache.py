@@ -0,0 +1,142 @@
+import asyncio
+import dataclasses
+from genlayer_py.config.provider import cache_config
+from genlayer_py.provider import (
+    AsyncGenLayerProvider,
+    GenLayerProvider,
+    MultiEndpointProvider,
+    ResponseCache,
+)
+from genlayer_py.provider.cache import cache_key
+
+
+def transaction_server(server, statuses):
+    def handler(payload):
+        return {
+            "jsonrpc": "2.0",
+            "id": payload["id"],
+            "result": {"hash": payload["params"][0], "status": statuses.pop(0)},
+        }
+
+    server.handler = handler
+
+
+def test_cache_key_is_canonical():
+    assert cache_key("s", "m", [{"a": 1, "b": "0xAB"}]) == cache_key(
+        "s", "m", [{"b": "0xab", "a": 1}]
+    )
+    assert cache_key("s", "m", ["x"]) != cache_key("t", "m", ["x"])
+
+
+def test_serves_cached_methods_only(rpc_server):
+    provider = GenLayerProvider(rpc_server.url, cache=ResponseCache())
+    for _ in range(3):
+        assert provider.make_request("eth_chainId", [])["result"] == "eth_chainId"
+        provider.make_request("eth_blockNumber", [])
+    assert [r["method"] for r in rpc_server.requests] == [
+        "eth_chainId",
+        "eth_blockNumber",
+        "eth_blockNumber",
+        "eth_blockNumber",
+    ]
+    assert provider.cache.hits == 2
+
+
+def test_returns_copies(rpc_server):
+    transaction_server(rpc_server, ["FINALIZED"])
+    provider = GenLayerProvider(rpc_server.url, cache=ResponseCache())
+    provider.make_request("eth_getTransactionByHash", ["0x01"])["result"]["x"] = 1
+    cached = provider.make_request("eth_getTransactionByHash", ["0x01"])
+    assert "x" not in cached["result"]
+
+
+def test_never_caches_pending_transactions(rpc_server):
+    transaction_server(rpc_server, ["PENDING", "ACCEPTED", "FINALIZED", "unused"])
+    provider = GenLayerProvider(rpc_server.url, cache=ResponseCache())
+    statuses = [
+        provider.make_request("eth_getTransactionByHash", ["0x01"])["result"]["status"]
+        for _ in range(4)
+    ]
+    assert statuses == ["PENDING", "ACCEPTED", "FINALIZED", "FINALIZED"]
+    assert len(rpc_server.requests) == 3
+
+
+def test_ttl_and_size_eviction(rpc_server):
+    now = [0.0]
+    cache = ResponseCache(
+        dataclasses.replace(
+            cache_config, ttls={"sim_getConsensusContract": 10.0, "m": None}
+        ),
+        clock=lambda: now[0],
+    )
+    provider = GenLayerProvider(rpc_server.url, cache=cache)
+    provider.make_request("sim_getConsensusContract", ["ConsensusMain"])
+    now[0] = 9.0
+    provider.make_request("sim_getConsensusContract", ["ConsensusMain"])
+    assert len(rpc_server.requests) == 1
+    now[0] = 10.0
+    provider.make_request("sim_getConsensusContract", ["ConsensusMain"])
+    assert len(rpc_server.requests) == 2
+
+    small = ResponseCache(
+        dataclasses.replace(cache_config, max_bytes=200, ttls={"m": None})
+    )
+    for i in range(10):
+        small.put(cache_key("s", "m", [i]), {"id": 1, "result": "x" * 40})
+    assert 0 < len(small) < 10
+    assert small.get(cache_key("s", "m", [9])) is not None
+    assert small.get(cache_key("s", "m", [0])) is None
+
+
+def test_batches_send_only_missing_calls(rpc_server):
+    provider = GenLayerProvider(rpc_server.url, cache=ResponseCache())
+    provider.make_request("eth_chainId", [])
+    responses = provider.make_batch_request(
+        [("eth_blockNumber", []), ("eth_chainId", []), ("gen_call", [{}])]
+    )
+    assert [r["result"] for r in responses] == [
+        "eth_blockNumber",
+        "eth_chainId",
+        "gen_call",
+    ]
+    assert [r["method"] for r in rpc_server.batches[0]] == [
+        "eth_blockNumber",
+        "gen_call",
+    ]
+
+
+def test_persists_to_file(rpc_server, tmp_path):
+    path = str(tmp_path / "rpc-cache.json")
+    provider = GenLayerProvider(
+        rpc_server.url,
+        cache=ResponseCache(dataclasses.replace(cache_config, path=path)),
+    )
+    provider.make_request("gen_getContractSchemaForCode", ["0x00"])
+    provider.close()
+
+    reloaded = GenLayerProvider(
+        rpc_server.url,
+        cache=ResponseCache(dataclasses.replace(cache_config, path=path)),
+    )
+    response = reloaded.make_request("gen_getContractSchemaForCode", ["0x00"])
+    assert response["result"] == "gen_getContractSchemaForCode"
+    assert len(rpc_server.requests) == 1
+
+
+def test_multi_endpoint_and_async_providers(rpc_servers):
+    first, second = rpc_servers(), rpc_servers()
+    provider = MultiEndpointProvider([first.url, second.url], cache=ResponseCache())
+    for _ in range(3):
+        provider.make_request("eth_chainId", [])
+    assert len(first.requests) + len(second.requests) == 1
+
+    async def run():
+        provider = AsyncGenLayerProvider(first.url, cache=ResponseCache())
+        for _ in range(3):
+            await provider.make_request("eth_chainId", [])
+        await provider.make_batch_request([("eth_chainId", [])])
+        await provider.disconnect()
+
+    count = len(first.requests)
+    asyncio.run(run())
+    assert len(first.requests) == count + 1
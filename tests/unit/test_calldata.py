@@ -0,0 +1,401 @@
+import array
+import collections
+import dataclasses
+import enum
+import sys
+import pytest
+from typing import List, NamedTuple, Optional
+from genlayer_py.abi import calldata
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.types import CalldataAddress, TransactionStatus
+
+ADDRESS = CalldataAddress(bytes(range(20)))
+
+SAMPLES = [
+    None,
+    True,
+    False,
+    0,
+    1,
+    -1,
+    127,
+    128,
+    -129,
+    2**256 - 1,
+    -(2**256),
+    "",
+    "hello",
+    "ünïcödé",
+    b"",
+    b"\x00\x01\x02",
+    ADDRESS,
+    [],
+    {},
+    [1, "a", [None, True], {"x": b"\xff"}],
+    {"a": 1, "b": {"c": [ADDRESS, -5]}, "d": "e" * 300},
+]
+
+
+@pytest.mark.parametrize("value", SAMPLES)
+def test_encode_decode_roundtrip(value):
+    assert calldata.decode(calldata.encode(value)) == value
+
+
+def test_decode_deep_nesting_beyond_recursion_limit():
+    depth = sys.getrecursionlimit() * 2
+    encoded = bytes([(1 << 3) | 5]) * depth + bytes([(7 << 3) | 1])
+    res = calldata.decode(encoded)
+    for _ in range(depth):
+        assert isinstance(res, list) and len(res) == 1
+        res = res[0]
+    assert res == 7
+
+
+def test_decode_max_depth():
+    encoded = calldata.encode([[[1]]])
+    assert calldata.decode(encoded, max_depth=3) == [[[1]]]
+    with pytest.raises(GenLayerError):
+        calldata.decode(encoded, max_depth=2)
+
+
+def test_decode_max_size():
+    encoded = calldata.encode("x" * 100)
+    assert calldata.decode(encoded, max_size=len(encoded)) == "x" * 100
+    with pytest.raises(GenLayerError):
+        calldata.decode(encoded, max_size=len(encoded) - 1)
+
+
+def test_decode_errors():
+    with pytest.raises(GenLayerError, match="unparsed end"):
+        calldata.decode(calldata.encode(1) + b"\x00")
+    with pytest.raises(GenLayerError, match="invalid type"):
+        calldata.decode(b"\x07")
+    with pytest.raises(GenLayerError, match="Unknown special"):
+        calldata.decode(bytes([4 << 3]))
+    with pytest.raises(IndexError):
+        calldata.decode(b"\x80")
+    # map keys must be sorted and unique
+    unsorted = bytes([(2 << 3) | 6, 1]) + b"b" + b"\x00" + bytes([1]) + b"a" + b"\x00"
+    with pytest.raises(AssertionError):
+        calldata.decode(unsorted)
+    duplicated = bytes([(2 << 3) | 6, 1]) + b"a" + b"\x00" + bytes([1]) + b"a" + b"\x00"
+    with pytest.raises(AssertionError):
+        calldata.decode(duplicated)
+
+
+def _reference_uleb128(i: int) -> bytes:
+    out = bytearray()
+    while True:
+        cur = i & 0x7F
+        i >>= 7
+        if i == 0:
+            out.append(cur)
+            return bytes(out)
+        out.append(cur | 0x80)
+
+
+@pytest.mark.parametrize("bits", [0, 1, 7, 63, 64, 65, 191, 192, 256, 449, 1000, 8191])
+def test_big_int_encoding_matches_reference(bits):
+    for value in (2**bits - 1, 2**bits, 0x5A5A5A5A5A5A5A5A % (2**bits + 1) << bits):
+        for signed in (value, -value - 1):
+            tagged = (signed << 3) | 1 if signed >= 0 else ((-signed - 1) << 3) | 2
+            encoded = calldata.encode(signed)
+            assert encoded == _reference_uleb128(tagged)
+            assert calldata.decode(encoded) == signed
+
+
+def test_lazy_decode_views():
+    value = {
+        "a": [1, 2, {"x": "y"}],
+        "b": {"c": ADDRESS, "d": b"\x01\x02"},
+        "e": "text",
+    }
+    view = calldata.decode(calldata.encode(value), lazy=True)
+    assert isinstance(view, calldata.CalldataMapView)
+    assert len(view) == 3
+    assert view["e"] == "text"
+    assert "z" not in view
+    assert isinstance(view["a"], calldata.CalldataSequenceView)
+    assert view["a"][-1]["x"] == "y"
+    assert view["a"][:2] == [1, 2]
+    assert view["b"]["c"] == ADDRESS
+    assert list(view) == ["a", "b", "e"]
+    assert view == value
+    assert view.to_eager() == value
+    assert calldata.decode(calldata.encode(5), lazy=True) == 5
+
+
+def test_lazy_decode_errors():
+    with pytest.raises(GenLayerError, match="unparsed end"):
+        calldata.decode(calldata.encode([1]) + b"\x00", lazy=True)
+    with pytest.raises(GenLayerError):
+        calldata.decode(calldata.encode([[1]]), lazy=True, max_depth=1)
+    unsorted = bytes([(2 << 3) | 6, 1]) + b"b" + b"\x00" + bytes([1]) + b"a" + b"\x00"
+    view = calldata.decode(unsorted, lazy=True)
+    with pytest.raises(AssertionError):
+        list(view)
+
+
+def _rebuild(events):
+    stack = [[]]
+    keys = []
+    for event, value in events:
+        if event == calldata.CalldataEvent.KEY:
+            keys.append(value)
+            continue
+        if event == calldata.CalldataEvent.START_MAP:
+            item = {}
+        elif event == calldata.CalldataEvent.START_ARRAY:
+            item = []
+        elif event in (
+            calldata.CalldataEvent.END_MAP,
+            calldata.CalldataEvent.END_ARRAY,
+        ):
+            item = stack.pop()
+        else:
+            item = value
+        parent = stack[-1]
+        if event in (
+            calldata.CalldataEvent.START_MAP,
+            calldata.CalldataEvent.START_ARRAY,
+        ):
+            stack.append(item)
+        elif isinstance(parent, dict):
+            parent[keys.pop()] = item
+        else:
+            parent.append(item)
+    return stack[0][0]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1000])
+def test_stream_parser_matches_decode(chunk_size):
+    value = SAMPLES[-2:] + [{"z": 1, "é": "ünï", "日本": ["語"]}]
+    encoded = calldata.encode(value)
+    chunks = [encoded[i : i + chunk_size] for i in range(0, len(encoded), chunk_size)]
+    assert _rebuild(calldata.iter_events(chunks)) == value
+    calldata.verify(chunks)
+
+
+def test_stream_parser_errors():
+    encoded = calldata.encode({"a": [1, "x"]})
+    with pytest.raises(GenLayerError, match="unexpected end"):
+        list(calldata.iter_events([encoded[:-1]]))
+    with pytest.raises(GenLayerError, match="unparsed end"):
+        calldata.verify([encoded, b"\x00"])
+    with pytest.raises(GenLayerError, match="invalid type"):
+        calldata.verify([b"\x07"])
+    with pytest.raises(GenLayerError):
+        calldata.verify([encoded], max_depth=1)
+    unsorted = bytes([(2 << 3) | 6, 1]) + b"b" + b"\x00" + bytes([1]) + b"a" + b"\x00"
+    with pytest.raises(AssertionError):
+        calldata.verify([unsorted])
+    with pytest.raises(UnicodeDecodeError):
+        calldata.verify([bytes([(2 << 3) | 4]), b"\xff\xfe"])
+    # a character cut short by ASCII in a later chunk
+    with pytest.raises(UnicodeDecodeError):
+        calldata.verify([bytes([(2 << 3) | 4]) + b"\xc3", b"a"])
+    with pytest.raises(UnicodeDecodeError):
+        calldata.verify([bytes([(1 << 3) | 6, 1]) + b"\xff" + b"\x00"])
+
+
+@pytest.mark.parametrize("value", SAMPLES)
+def test_decode_to_str_matches_to_str(value):
+    encoded = calldata.encode(value)
+    assert calldata.decode_to_str(encoded) == calldata.to_str(calldata.decode(encoded))
+
+
+def test_decode_to_str_notation():
+    encoded = calldata.encode({"kéy": [ADDRESS, b"\x0a\xff", -3, 'q"']})
+    assert calldata.decode_to_str(encoded) == (
+        '{"k\\u00e9y":[addr#' + ADDRESS.as_bytes.hex() + ',b#0aff,-3,"q\\""]}'
+    )
+    with pytest.raises(GenLayerError, match="unparsed end"):
+        calldata.decode_to_str(encoded + b"\x00")
+
+
+@dataclasses.dataclass
+class _Point:
+    y: int
+    x: int
+    label: Optional[str] = None
+
+
+class _Color(enum.IntEnum):
+    RED = 1
+
+
+class _Pair(NamedTuple):
+    first: int
+    second: str
+
+
+def test_encode_dispatch_on_subclasses():
+    assert calldata.encode(_Point(y=2, x=1)) == calldata.encode(
+        {"x": 1, "y": 2, "label": None}
+    )
+    assert calldata.encode([_Point(1, 2, "p")]) == calldata.encode(
+        [{"x": 2, "y": 1, "label": "p"}]
+    )
+    assert calldata.encode(_Color.RED) == calldata.encode(1)
+    assert calldata.encode(TransactionStatus.PENDING) == calldata.encode("PENDING")
+    assert calldata.encode(_Pair(1, "a")) == calldata.encode([1, "a"])
+    assert calldata.encode(collections.OrderedDict(b=1, a=2)) == calldata.encode(
+        {"a": 2, "b": 1}
+    )
+    with pytest.raises(GenLayerError, match="invalid type"):
+        calldata.encode(object())
+    with pytest.raises(GenLayerError, match="key is not string"):
+        calldata.encode({1: 1})
+
+
+@pytest.mark.parametrize(
+    "value",
+    SAMPLES
+    + [
+        b"\x01" * 300,
+        ["ünïcödé" * 40, _Point(1, -2)],
+        array.array("q", [1, -2, 2**40]),
+    ],
+)
+def test_encoded_size(value):
+    assert calldata.encoded_size(value) == len(calldata.encode(value))
+
+
+def test_encode_into():
+    # large parts are copied as they are, between runs of small ones
+    value = {"method": "m", "args": [1, "two", b"\x03" * 2000, 4, b"\x05" * 3000]}
+    encoded = calldata.encode(value)
+    assert calldata.encoded_size(value) == len(encoded)
+    buffer = bytearray(len(encoded) + 4)
+    end = calldata.encode_into(value, buffer, 2)
+    assert end == len(encoded) + 2
+    assert buffer[2:end] == encoded
+    with pytest.raises(GenLayerError):
+        calldata.encode_into(value, bytearray(len(encoded) - 1))
+    # a typed buffer is written byte by byte
+    words = array.array("I", [0] * len(encoded))
+    assert calldata.encode_into(value, words) == len(encoded)
+    assert words.tobytes()[: len(encoded)] == encoded
+
+
+@dataclasses.dataclass
+class _Segment:
+    start: _Point
+    points: List[_Point]
+    end: Optional[_Point] = None
+    tag: bytes = b""
+
+
+def test_from_calldata_rebuilds_nested_types():
+    segment = _Segment(_Point(1, 2), [_Point(3, 4, "a")], None, b"\x01")
+    encoded = calldata.encode(segment)
+    assert calldata.decode(encoded, into=_Segment) == segment
+    assert calldata.decode(calldata.encode([segment]), into=List[_Segment]) == [segment]
+    assert calldata.from_calldata(_Pair, [1, "a"]) == _Pair(1, "a")
+
+
+def test_register_type():
+    class Vector(NamedTuple):
+        b: int
+        a: int
+
+    class Money:
+        def __init__(self, cents: int) -> None:
+            self.cents = cents
+
+    calldata.register_type(Vector)
+    assert calldata.encode(Vector(1, 2)) == calldata.encode({"a": 2, "b": 1})
+    assert calldata.decode(calldata.encode(Vector(1, 2)), into=Vector) == Vector(1, 2)
+
+    calldata.register_type(Money, encode=lambda m: m.cents, decode=lambda v: Money(v))
+    assert calldata.encode([Money(5)]) == calldata.encode([5])
+    assert calldata.decode(calldata.encode(Money(7)), into=Money).cents == 7
+
+    with pytest.raises(GenLayerError, match="no encoder"):
+        calldata.register_type(object)
+
+
+@pytest.mark.parametrize("bits", [3, 20, 59, 60, 61, 70])
+def test_int_arrays_encode_like_lists(bits):
+    values = [(-1) ** i * ((1 << bits) - 1 - i) for i in range(100)]
+    encoded = calldata.encode(values)
+    if bits < 63:
+        assert calldata.encode(array.array("q", values)) == encoded
+    np = pytest.importorskip("numpy")
+    if bits < 63:
+        assert calldata.encode(np.array(values, dtype=np.int64)) == encoded
+    decoded = calldata.decode(encoded, numpy_arrays=True)
+    assert isinstance(decoded, np.ndarray) == (bits <= 60)
+    assert list(decoded) == values
+
+
+def test_numpy_arrays_decode_option():
+    np = pytest.importorskip("numpy")
+    with pytest.raises(GenLayerError, match="invalid type"):
+        calldata.encode(array.array("d", [1.0, 2.0]))
+    assert calldata.encode(np.array([[1, 2], [3, 4]])) == calldata.encode(
+        [[1, 2], [3, 4]]
+    )
+    assert calldata.encode([np.int64(5), np.uint8(3)]) == calldata.encode([5, 3])
+    value = {"ids": [1, 2, 3], "mixed": [1, "a"], "empty": []}
+    decoded = calldata.decode(calldata.encode(value), numpy_arrays=True)
+    assert decoded["ids"].tolist() == [1, 2, 3]
+    assert decoded["mixed"] == [1, "a"] and decoded["empty"] == []
+    with pytest.raises(IndexError):
+        calldata.decode(calldata.encode([1, 2, 300])[:-1], numpy_arrays=True)
+
+
+def test_encode_many_decode_many():
+    values = [{"i": i, "raw": b"\x01" * i, "addr": ADDRESS} for i in range(50)]
+    encoded = list(calldata.encode_many(values))
+    assert encoded == [calldata.encode(v) for v in values]
+    assert list(calldata.decode_many(encoded)) == values
+    assert list(calldata.encode_many(iter(values), processes=2, chunk_size=7)) == (
+        encoded
+    )
+    decoded = list(calldata.decode_many(encoded, processes=2, chunk_size=7))
+    assert decoded == values
+    assert type(decoded[1]["raw"]) is bytes
+    with pytest.raises(GenLayerError, match="unparsed end"):
+        list(calldata.decode_many([encoded[0] + b"\x00"], processes=1))
+    with pytest.raises(GenLayerError):
+        calldata.encode_many(values, processes=1, chunk_size=0)
+
+
+@pytest.mark.parametrize(
+    "method,args,kwargs",
+    [
+        ("get", None, None),
+        ("transfer", [ADDRESS, 10**20, "memo", b"\x01"], None),
+        ("update", [], {"b": 1, "a": [1, 2]}),
+        (None, ["x" * 1000], {"k": None}),
+    ],
+)
+def test_prepared_call_matches_envelope(method, args, kwargs):
+    from genlayer_py.contracts.actions import make_calldata_object
+
+    expected = calldata.encode(make_calldata_object(method, args, kwargs))
+    assert calldata.prepare_call(method).encode(args, kwargs) == expected
+    assert calldata.prepare_call(method).encode(args, kwargs) == expected
+
+
+def test_cache_counters_and_size():
+    from genlayer_py.config import calldata_config
+
+    size = calldata_config.cache_size
+    calldata.set_cache_size(2)
+    try:
+        calldata.prepare_call("a")
+        calldata.prepare_call("a")
+        calldata.prepare_call("b")
+        calldata.prepare_call("c")
+        info = calldata.cache_info()["methods"]
+        assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 3, 2, 2)
+        calldata.prepare_call("x").encode(["same", "same"])
+        assert calldata.cache_info()["values"].hits == 1
+        calldata.clear_caches()
+        assert calldata.cache_info()["values"].currsize == 0
+        with pytest.raises(GenLayerError):
+            calldata.set_cache_size(0)
+    finally:
+        calldata.set_cache_size(size)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import pytest
+from genlayer_py.chains import testnet_asimov
+from genlayer_py.client import AsyncGenLayerClient, GenLayerClient
+from genlayer_py.exceptions import GenLayerError, RpcTransportError
+from genlayer_py.provider import GenLayerProvider, Metrics, RequestHooks
+from genlayer_py.provider.metrics import instrumented
+
+
+class RecordingHooks(RequestHooks):
+    def __init__(self):
+        self.events = []
+
+    def before_request(self, method, params):
+        self.events.append(("before", method, params))
+        return len(self.events)
+
+    def after_request(
+        self, method, context, seconds, request_bytes, response_bytes, error
+    ):
+        self.events.append(
+            ("after", method, context, request_bytes, response_bytes, error)
+        )
+
+
+def test_percentiles():
+    metrics = Metrics()
+    for ms in range(1, 101):
+        metrics.record("eth_call", ms / 1000)
+    stats = metrics.snapshot()["eth_call"]
+    assert stats["count"] == 100
+    assert stats["max"] == 0.1
+    assert stats["mean"] == pytest.approx(0.0505)
+    # histogram buckets are at most 25% wide
+    for name, expected in [("p50", 0.05), ("p95", 0.095), ("p99", 0.099)]:
+        assert expected <= stats[name] <= expected * 1.25
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_provider_records_requests_and_calls_hooks(rpc_server):
+    hooks = RecordingHooks()
+    provider = GenLayerProvider(rpc_server.url, metrics=Metrics(hooks))
+    response = provider.make_request("eth_chainId", [])
+    provider.make_batch_request([("eth_call", [1]), ("eth_call", [2])])
+    rpc_server.handler = lambda payload: (500, {"error": "down"})
+    with pytest.raises(RpcTransportError):
+        provider.make_request("sim_getConsensusContract", ["x"])
+    provider.close()
+
+    stats = provider.metrics.snapshot()
+    assert stats["eth_chainId"]["count"] == 1
+    assert stats["eth_chainId"]["response_bytes"] == len(json.dumps(response))
+    assert stats["eth_chainId"]["request_bytes"] > 0
+    assert stats["batch"]["count"] == 1
+    # every attempt is recorded
+    failed = stats["sim_getConsensusContract"]
+    assert failed["count"] == failed["errors"] == 3
+
+    assert hooks.events[0] == ("before", "eth_chainId", [])
+    after = hooks.events[1]
+    assert after[:3] == ("after", "eth_chainId", 1)
+    assert isinstance(hooks.events[-1][-1], RpcTransportError)
+
+
+def test_json_rpc_errors_are_counted(rpc_server):
+    hooks = RecordingHooks()
+    provider = GenLayerProvider(rpc_server.url, metrics=Metrics(hooks))
+    rpc_server.handler = lambda payload: {
+        "jsonrpc": "2.0",
+        "id": payload["id"],
+        "error": {"code": 3, "message": "execution reverted"},
+    }
+    for _ in range(3):
+        assert "error" in provider.make_request("gen_call", [{}])
+    provider.make_batch_request([("eth_call", [1]), ("eth_call", [2])])
+    provider.close()
+
+    stats = provider.metrics.snapshot()
+    assert stats["gen_call"]["count"] == stats["gen_call"]["errors"] == 3
+    assert stats["batch"]["errors"] == 1
+    error = hooks.events[-1][-1]
+    assert isinstance(error, GenLayerError) and "execution reverted" in str(error)
+
+
+def test_client_metrics_include_actions(rpc_server, localnet_client, chain_at):
+    client = localnet_client(rpc_server)
+    client.get_contract_schema_for_code(b"code")
+    stats = client.metrics()
+    assert stats["get_contract_schema_for_code"]["count"] == 1
+    assert stats["gen_getContractSchemaForCode"]["count"] == 1
+    assert {"p50", "p95", "p99"} <= set(stats["gen_getContractSchemaForCode"])
+
+    client = GenLayerClient(chain_at(rpc_server.url, chain=testnet_asimov))
+    with pytest.raises(GenLayerError):
+        client.get_contract_schema_for_code(b"code")
+    assert client.metrics()["get_contract_schema_for_code"]["errors"] == 1
+
+
+def test_async_client_metrics(rpc_server, chain_at):
+    hooks = RecordingHooks()
+    chain = chain_at(rpc_server.url)
+
+    async def main():
+        async with AsyncGenLayerClient(chain, hooks=hooks) as client:
+            await client.get_contract_schema_for_code(b"code")
+            return client.metrics()
+
+    stats = asyncio.run(main())
+    assert stats["get_contract_schema_for_code"]["count"] == 1
+    assert stats["gen_getContractSchemaForCode"]["response_bytes"] > 0
+    methods = [event[1] for event in hooks.events if event[0] == "before"]
+    assert methods == ["get_contract_schema_for_code", "gen_getContractSchemaForCode"]
+
+
+def test_instrumented_without_metrics():
+    class Client:
+        provider = object()
+
+    @instrumented
+    def action(self, value):
+        return value
+
+    assert action(Client(), 1) == 1
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import rlp
+from eth_account import Account
+from hexbytes import HexBytes
+from genlayer_py.accounts.nonce import AsyncNonceManager, NonceManager
+from genlayer_py.exceptions import GenLayerError
+
+CONTRACT = "0x" + "01" * 20
+
+
+def test_nonces_are_fetched_once_and_handed_out_locally():
+    manager = NonceManager()
+    fetches = []
+    lock = threading.Lock()
+
+    def fetch(address):
+        with lock:
+            fetches.append(address)
+        return 5
+
+    with ThreadPoolExecutor(8) as executor:
+        leases = list(executor.map(lambda _: manager.acquire("0xAB", fetch), range(50)))
+    assert sorted(nonce for nonce, _ in leases) == list(range(5, 55))
+    assert fetches == ["0xAB"]
+
+    # unsent nonces are reused lowest first, then the sequence goes on
+    manager.release("0xab", 9, 0)
+    manager.release("0xab", 7, 0)
+    assert [manager.acquire("0xab", fetch) for _ in range(3)] == [
+        (7, 0),
+        (9, 0),
+        (55, 0),
+    ]
+    assert manager.snapshot()["0xab"] == {
+        "next": 56,
+        "gaps": [],
+        "issued": 53,
+        "generation": 0,
+    }
+
+    manager.reset("0xab")
+    assert manager.acquire("0xab", lambda address: 70) == (70, 1)
+
+
+def test_releases_from_before_a_reset_are_ignored():
+    manager = NonceManager()
+    (first, generation), _ = [manager.acquire("0xab", lambda _: 5) for _ in range(2)]
+    manager.reset("0xab")
+    assert manager.acquire("0xab", lambda _: 7) == (7, 1)
+    # nonce 5 may be used by the node already, it is not handed out again
+    manager.release("0xab", first, generation)
+    assert manager.acquire("0xab", lambda _: 7) == (8, 1)
+
+
+def test_async_nonces():
+    manager = AsyncNonceManager()
+    fetches = []
+
+    async def fetch(address):
+        fetches.append(address)
+        await asyncio.sleep(0.01)
+        return 3
+
+    async def run():
+        return await asyncio.gather(
+            *(manager.acquire("0xab", fetch) for _ in range(20))
+        )
+
+    assert sorted(asyncio.run(run())) == [(nonce, 0) for nonce in range(3, 23)]
+    assert len(fetches) == 1
+
+
+def test_client_pipelines_sends_and_resyncs(rpc_server, localnet_client, monkeypatch):
+    account = Account.create()
+    state = {"count": 4, "sent": [], "reject": None}
+
+    def handler(payload):
+        method, params = payload["method"], payload["params"]
+        if method == "eth_getTransactionCount":
+            return {
+                "jsonrpc": "2.0",
+                "id": payload["id"],
+                "result": hex(state["count"]),
+            }
+        if method == "eth_estimateGas":
+            return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x5208"}
+        # a legacy transaction, the nonce comes first
+        nonce = int.from_bytes(rlp.decode(HexBytes(params[0]))[0], "big")
+        if state["reject"] is not None:
+            error = {"code": -32000, "message": state["reject"]}
+            return {"jsonrpc": "2.0", "id": payload["id"], "error": error}
+        state["sent"].append(nonce)
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x" + "ab" * 32}
+
+    rpc_server.handler = handler
+    client = localnet_client(rpc_server, account, nonce_manager=NonceManager())
+
+    def send(i):
+        return client.write_contract(
+            CONTRACT, "update", args=[i], wait_for_receipt=False
+        )
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(send, range(8)))
+    assert sorted(state["sent"]) == list(range(4, 12))
+    counts = [
+        r for r in rpc_server.requests if r["method"] == "eth_getTransactionCount"
+    ]
+    assert len(counts) == 1
+
+    # a failed send leaves a gap that the next send fills
+    state["reject"] = "insufficient funds for gas"
+    with pytest.raises(GenLayerError, match="insufficient funds"):
+        send(0)
+    state["reject"] = None
+    send(0)
+    assert state["sent"][-1] == 12
+
+    # the node being ahead makes the next send fetch the nonce again
+    state["reject"], state["count"] = "nonce too low", 20
+    with pytest.raises(GenLayerError, match="nonce too low"):
+        send(0)
+    state["reject"] = None
+    send(0)
+    assert state["sent"][-1] == 20
+
+    # as does a transaction that could not be signed
+    def refuse(transaction):
+        raise ValueError("unsupported transaction")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(account, "sign_transaction", refuse)
+        with pytest.raises(ValueError):
+            send(0)
+    send(0)
+    assert state["sent"][-1] == 21
@@ -0,0 +1,124 @@
+import threading
+import time
+import pytest
+from eth_account import Account
+from web3 import Web3
+from genlayer_py.chains import localnet
+from genlayer_py.contracts.pending import PendingTransaction
+from genlayer_py.exceptions import GenLayerError
+
+TX_HASH = "0x" + "ab" * 32
+TX_ID = "0x" + "cd" * 32
+BLOCK_HASH = "0x" + "11" * 32
+CONTRACT = "0x" + "01" * 20
+
+
+class Node:
+    """
+    Accepts a raw transaction and returns its receipt, with a NewTransaction
+    log for ``TX_ID``, once ``mined`` is set.
+    """
+
+    def __init__(self, account):
+        self.account = account
+        self.mined = False
+        self.status = "ACCEPTED"
+
+    def receipt(self):
+        address = localnet.consensus_main_contract["address"]
+        topic = Web3.keccak(text="NewTransaction(bytes32,address,address)").hex()
+        log = {
+            "address": address,
+            "blockHash": BLOCK_HASH,
+            "blockNumber": "0x1",
+            "data": "0x",
+            "logIndex": "0x0",
+            "removed": False,
+            "topics": [
+                "0x" + topic.removeprefix("0x"),
+                TX_ID,
+                "0x" + "00" * 12 + address[2:].lower(),
+                "0x" + "00" * 12 + self.account.address[2:].lower(),
+            ],
+            "transactionHash": TX_HASH,
+            "transactionIndex": "0x0",
+        }
+        return {
+            "blockHash": BLOCK_HASH,
+            "blockNumber": "0x1",
+            "contractAddress": None,
+            "cumulativeGasUsed": "0x5208",
+            "effectiveGasPrice": "0x0",
+            "from": self.account.address,
+            "gasUsed": "0x5208",
+            "logs": [log],
+            "logsBloom": "0x" + "00" * 256,
+            "status": "0x1",
+            "to": address,
+            "transactionHash": TX_HASH,
+            "transactionIndex": "0x0",
+            "type": "0x0",
+        }
+
+    def handler(self, payload):
+        method = payload["method"]
+        result = None
+        if method == "eth_getTransactionCount":
+            result = "0x0"
+        elif method == "eth_estimateGas":
+            result = "0x5208"
+        elif method == "eth_sendRawTransaction":
+            result = TX_HASH
+        elif method == "eth_getTransactionReceipt" and self.mined:
+            result = self.receipt()
+        elif method == "eth_getTransactionByHash":
+            result = {"hash": payload["params"][0], "status": self.status}
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": result}
+
+
+def test_write_contract_returns_before_the_receipt(rpc_server, localnet_client):
+    account = Account.create()
+    node = Node(account)
+    rpc_server.handler = node.handler
+    client = localnet_client(rpc_server, account)
+
+    pending = client.write_contract(
+        CONTRACT, "update", args=[1], wait_for_receipt=False
+    )
+    assert isinstance(pending, PendingTransaction)
+    assert pending.tx_hash == TX_HASH
+    assert not pending.done()
+    with pytest.raises(GenLayerError, match="not mined yet"):
+        pending.transaction_id(timeout=0.2)
+
+    node.mined = True
+    future = pending.resolve_in_background()
+    assert future.result(5) == TX_ID
+    assert pending.done()
+    assert pending.transaction_id() == TX_ID
+    assert pending.wait(interval=0)["hash"] == TX_ID
+    # the blocking mode is unchanged
+    assert client.write_contract(CONTRACT, "update", args=[1]) == TX_ID
+
+
+def test_wait_timeout_covers_the_receipt(rpc_server, localnet_client):
+    account = Account.create()
+    node = Node(account)
+    node.status = "PENDING"
+    rpc_server.handler = node.handler
+    client = localnet_client(rpc_server, account)
+    pending = client.write_contract(
+        CONTRACT, "update", args=[1], wait_for_receipt=False
+    )
+    threading.Timer(0.6, setattr, (node, "mined", True)).start()
+    start = time.monotonic()
+    with pytest.raises(GenLayerError, match="not finalized"):
+        pending.wait(interval=50, timeout=1.0)
+    # not 0.6s for the receipt plus 1s for the status
+    assert time.monotonic() - start < 1.4
+
+    PendingTransaction(client, TX_HASH).resolve_in_background()
+    resolver = client._resolver
+    client.close()
+    assert resolver._shutdown
+    assert "_resolver" not in client.__dict__
@@ -0,0 +1,167 @@
+import asyncio
+import dataclasses
+import threading
+import time
+import pytest
+from genlayer_py.config.provider import provider_config
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.provider import (
+    AsyncGenLayerProvider,
+    GenLayerProvider,
+    JsonCodec,
+    OrjsonCodec,
+    has_orjson,
+)
+
+CONFIG = dataclasses.replace(
+    provider_config, pool_size=4, connect_timeout=5, read_timeout=5
+)
+
+
+def test_make_request_reuses_connections(rpc_server):
+    provider = GenLayerProvider(rpc_server.url, CONFIG)
+    for _ in range(5):
+        assert provider.make_request("eth_chainId", [])["result"] == "eth_chainId"
+    assert len(rpc_server.ports) == 1
+    assert rpc_server.requests[0]["params"] == []
+    provider.close()
+
+
+def test_make_request_without_keep_alive(rpc_server):
+    provider = GenLayerProvider(
+        rpc_server.url, dataclasses.replace(CONFIG, keep_alive=False)
+    )
+    for _ in range(3):
+        provider.make_request("eth_chainId", [])
+    assert len(rpc_server.ports) == 3
+
+
+def test_make_request_shared_across_threads(rpc_server):
+    provider = GenLayerProvider(
+        rpc_server.url, dataclasses.replace(CONFIG, pool_size=2)
+    )
+    errors = []
+
+    def work():
+        try:
+            for _ in range(10):
+                provider.make_request("eth_blockNumber", [])
+        except Exception as err:  # pragma: no cover
+            errors.append(err)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(rpc_server.requests) == 40
+
+
+def test_make_request_errors(rpc_server):
+    provider = GenLayerProvider(
+        rpc_server.url, dataclasses.replace(CONFIG, read_timeout=0.1)
+    )
+    rpc_server.handler = lambda payload: (500, "boom")
+    with pytest.raises(GenLayerError, match="boom"):
+        provider.make_request("eth_chainId", [])
+
+    def slow(payload):
+        time.sleep(0.5)
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": None}
+
+    rpc_server.handler = slow
+    with pytest.raises(GenLayerError):
+        provider.make_request("eth_chainId", [])
+
+
+def test_make_batch_request(rpc_server):
+    provider = GenLayerProvider(rpc_server.url, CONFIG)
+    assert provider.make_batch_request([]) == []
+
+    def handler(payload):
+        if payload["method"] == "bad":
+            return {"jsonrpc": "2.0", "id": payload["id"], "error": {"message": "x"}}
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": payload["params"]}
+
+    rpc_server.handler = handler
+    responses = provider.make_batch_request([("a", [1]), ("bad", []), ("c", [3])])
+    assert [r.get("result") for r in responses] == [[1], None, [3]]
+    assert responses[1]["error"]["message"] == "x"
+    assert len(rpc_server.batches) == 1
+
+    rpc_server.handler = lambda payload: (
+        None if payload["method"] == "lost" else (handler(payload))
+    )
+    with pytest.raises(GenLayerError, match="no response"):
+        provider.make_batch_request([("a", []), ("lost", [])])
+
+
+def test_read_contracts(rpc_server):
+    from eth_account import Account
+    from genlayer_py.abi import calldata
+    from genlayer_py.chains import localnet
+    from genlayer_py.client import GenLayerClient
+
+    def handler(payload):
+        data = payload["params"][0]["data"]
+        if payload["params"][0]["to"] == "0xbad":
+            return {"jsonrpc": "2.0", "id": payload["id"], "error": {"message": "no"}}
+        result = calldata.encode({"len": len(data)})
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": result.hex()}
+
+    rpc_server.handler = handler
+    client = GenLayerClient(localnet, Account.create())
+    client.provider = GenLayerProvider(rpc_server.url, CONFIG)
+    reads = [{"address": "0x01", "function_name": "get", "args": [i]} for i in range(5)]
+    results = client.read_contracts(reads, batch_size=2)
+    assert len(rpc_server.batches) == 3
+    assert all(set(r) == {"len"} for r in results)
+    assert results == [client.read_contract("0x01", "get", [i]) for i in range(5)]
+
+    reads.append({"address": "0xbad", "function_name": "get"})
+    with pytest.raises(GenLayerError, match="no"):
+        client.read_contracts(reads)
+    results = client.read_contracts(reads, return_exceptions=True)
+    assert isinstance(results[-1], GenLayerError)
+    assert results[:5] == [client.read_contract("0x01", "get", [i]) for i in range(5)]
+
+
+CODECS = [JsonCodec()] + ([OrjsonCodec()] if has_orjson() else [])
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_codecs_keep_wide_integers(codec):
+    value = {"a": [2**64, -(2**63) - 1, 2**200, 1.5, "0x1234567890123456789012"]}
+    assert codec.loads(codec.dumps(value)) == value
+    assert type(codec.loads(codec.dumps(value))["a"][2]) is int
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_compressed_responses(rpc_server, codec):
+    rpc_server.compress = True
+    rpc_server.handler = lambda payload: {
+        "jsonrpc": "2.0",
+        "id": payload["id"],
+        "result": {"data": "ab" * 10000, "big": 2**70},
+    }
+    provider = GenLayerProvider(rpc_server.url, CONFIG, codec=codec)
+    result = provider.make_request("eth_getTransactionByHash", ["0x01"])["result"]
+    assert result == {"data": "ab" * 10000, "big": 2**70}
+    assert rpc_server.compressed == 1
+
+    async def run():
+        provider = AsyncGenLayerProvider(rpc_server.url, CONFIG, codec=codec)
+        try:
+            return await provider.make_request("eth_getTransactionByHash", ["0x01"])
+        finally:
+            await provider.disconnect()
+
+    assert asyncio.run(run())["result"]["big"] == 2**70
+    assert rpc_server.compressed == 2
+
+    uncompressed = GenLayerProvider(
+        rpc_server.url, dataclasses.replace(CONFIG, compression=False)
+    )
+    uncompressed.make_request("eth_getTransactionByHash", ["0x01"])
+    assert rpc_server.compressed == 2
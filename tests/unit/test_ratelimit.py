@@ -0,0 +1,128 @@
+import asyncio
+import dataclasses
+import threading
+import time
+from genlayer_py.config.provider import RateLimit, rate_limit_config
+from genlayer_py.provider import (
+    AsyncGenLayerProvider,
+    GenLayerProvider,
+    MultiEndpointProvider,
+    RateLimiter,
+)
+
+UNLIMITED = RateLimit(rate=None, burst=1, max_in_flight=None)
+LIMITS = {"read": UNLIMITED, "write": UNLIMITED, "poll": UNLIMITED}
+
+
+def slow(server, seconds):
+    active = [0]
+    server.peak = 0
+    lock = threading.Lock()
+    default = server.handler
+
+    def handler(payload):
+        with lock:
+            active[0] += 1
+            server.peak = max(server.peak, active[0])
+        time.sleep(seconds)
+        with lock:
+            active[0] -= 1
+        return default(payload)
+
+    server.handler = handler
+
+
+def test_token_bucket_spaces_requests(rpc_server):
+    config = dataclasses.replace(
+        rate_limit_config,
+        limits=dict(LIMITS, read=RateLimit(rate=20.0, burst=1, max_in_flight=None)),
+    )
+    provider = GenLayerProvider(rpc_server.url, rate_limit=config)
+    start = time.monotonic()
+    for _ in range(5):
+        provider.make_request("eth_call", [])
+    assert time.monotonic() - start >= 0.19
+    # other method classes are not held back
+    start = time.monotonic()
+    provider.make_request("eth_sendRawTransaction", ["0x00"])
+    assert time.monotonic() - start < 0.05
+    provider.close()
+
+
+def test_requests_in_flight_are_capped_and_served_in_order(rpc_server):
+    slow(rpc_server, 0.05)
+    config = dataclasses.replace(
+        rate_limit_config,
+        limits=dict(LIMITS, read=RateLimit(rate=None, burst=1, max_in_flight=1)),
+    )
+    provider = GenLayerProvider(rpc_server.url, rate_limit=config)
+    threads = []
+    for i in range(5):
+        thread = threading.Thread(target=provider.make_request, args=("eth_call", [i]))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.01)
+    assert provider.rate_limits()[rpc_server.url]["read"]["queued"] >= 2
+    for thread in threads:
+        thread.join()
+    assert rpc_server.peak == 1
+    assert [r["params"][0] for r in rpc_server.requests] == list(range(5))
+    stats = provider.rate_limits()[rpc_server.url]["read"]
+    assert stats["requests"] == 5 and stats["queued"] == stats["in_flight"] == 0
+    assert stats["max_wait"] >= 0.1
+    provider.close()
+
+
+def test_batches_count_as_their_calls():
+    config = dataclasses.replace(
+        rate_limit_config,
+        limits=dict(LIMITS, write=RateLimit(rate=1.0, burst=3, max_in_flight=None)),
+    )
+    limiter = RateLimiter(config, "http://node")
+    batch = [
+        {"method": "eth_call", "params": []},
+        {"method": "eth_sendRawTransaction", "params": []},
+    ]
+    limiter.release(limiter.acquire(batch))
+    stats = limiter.snapshot()
+    assert stats["write"]["requests"] == 1
+    assert stats["read"]["requests"] == 0
+    assert limiter._buckets["write"].tokens < 1.1
+
+
+def test_limits_are_per_endpoint(rpc_servers):
+    first, second = rpc_servers(), rpc_servers()
+    slow_limit = RateLimit(rate=10.0, burst=1, max_in_flight=None)
+    config = dataclasses.replace(
+        rate_limit_config, limits=LIMITS, endpoints={first.url: {"read": slow_limit}}
+    )
+    provider = MultiEndpointProvider([first.url, second.url], rate_limit=config)
+    for _ in range(10):
+        provider.make_request("eth_call", [])
+    limits = provider.rate_limits()
+    assert limits[first.url]["read"]["requests"] >= 1
+    assert limits[second.url]["read"]["requests"] >= 1
+    buckets = {url: p.rate_limiter._buckets for url, p in provider._providers.items()}
+    assert buckets[first.url]["read"].limit is slow_limit
+    assert buckets[second.url]["read"].limit is UNLIMITED
+    provider.close()
+
+
+def test_async_requests_in_flight_are_capped(rpc_server):
+    slow(rpc_server, 0.05)
+    config = dataclasses.replace(
+        rate_limit_config,
+        limits=dict(LIMITS, read=RateLimit(rate=None, burst=1, max_in_flight=2)),
+    )
+
+    async def main():
+        provider = AsyncGenLayerProvider(rpc_server.url, rate_limit=config)
+        await asyncio.gather(
+            *(provider.make_request("eth_call", [i]) for i in range(6))
+        )
+        await provider.disconnect()
+        return provider.rate_limits()[rpc_server.url]["read"]
+
+    stats = asyncio.run(main())
+    assert rpc_server.peak == 2
+    assert stats["requests"] == 6
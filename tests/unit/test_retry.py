@@ -0,0 +1,197 @@
+import asyncio
+import dataclasses
+import threading
+import time
+import pytest
+from genlayer_py.config.provider import retry_config
+from genlayer_py.exceptions import GenLayerError, RpcTransportError
+from genlayer_py.provider import (
+    AsyncGenLayerProvider,
+    AsyncMultiEndpointProvider,
+    GenLayerProvider,
+    MultiEndpointProvider,
+)
+from genlayer_py.provider.retry import LatencyTracker, backoff_delay
+
+RETRY = dataclasses.replace(retry_config, base_delay=0.001, max_delay=0.01)
+
+
+def flaky(server, failures, status=503):
+    default = server.handler
+    count = [0]
+
+    def handler(payload):
+        count[0] += 1
+        if count[0] <= failures:
+            return status, {"error": "unavailable"}
+        return default(payload)
+
+    server.handler = handler
+
+
+def test_backoff_grows_and_is_capped():
+    config = dataclasses.replace(RETRY, base_delay=0.1, max_delay=0.5)
+    for retry, ceiling in [(0, 0.1), (1, 0.2), (2, 0.4), (5, 0.5)]:
+        delays = [backoff_delay(config, retry) for _ in range(50)]
+        assert all(0.0 <= d <= ceiling for d in delays)
+        assert len(set(delays)) > 1
+
+
+def test_retries_idempotent_methods(rpc_server):
+    flaky(rpc_server, 2)
+    provider = GenLayerProvider(rpc_server.url, retry=RETRY)
+    assert provider.make_request("gen_call", [{}])["result"] == "gen_call"
+    assert len(rpc_server.requests) == 3
+
+
+def test_gives_up_after_max_attempts(rpc_server):
+    flaky(rpc_server, 5)
+    provider = GenLayerProvider(
+        rpc_server.url, retry=dataclasses.replace(RETRY, max_attempts=3)
+    )
+    with pytest.raises(RpcTransportError) as info:
+        provider.make_request("eth_getTransactionByHash", ["0x01"])
+    assert info.value.status == 503
+    assert len(rpc_server.requests) == 3
+
+
+def test_does_not_retry_writes_or_client_errors(rpc_server):
+    flaky(rpc_server, 1)
+    provider = GenLayerProvider(rpc_server.url, retry=RETRY)
+    with pytest.raises(GenLayerError):
+        provider.make_request("eth_sendRawTransaction", ["0x00"])
+    assert len(rpc_server.requests) == 1
+
+    flaky(rpc_server, 1, status=400)
+    with pytest.raises(RpcTransportError):
+        provider.make_request("gen_call", [{}])
+    assert len(rpc_server.requests) == 2
+
+
+def test_retries_batches_of_idempotent_calls(rpc_server):
+    default = rpc_server.handler
+    failed = []
+
+    def handler(payload):
+        if not failed:
+            failed.append(payload)
+            raise RuntimeError("drop the connection")
+        return default(payload)
+
+    rpc_server.handler = handler
+    provider = GenLayerProvider(rpc_server.url, retry=RETRY)
+    responses = provider.make_batch_request([("gen_call", [{}]), ("eth_chainId", [])])
+    assert [r["result"] for r in responses] == ["gen_call", "eth_chainId"]
+
+
+def test_latency_tracker_quantile():
+    tracker = LatencyTracker(
+        dataclasses.replace(RETRY, hedge_min_samples=10, hedge_quantile=0.9)
+    )
+    for i in range(9):
+        tracker.record("gen_call", i / 100)
+    assert tracker.hedge_delay("gen_call") is None
+    tracker.record("gen_call", 0.09)
+    assert tracker.hedge_delay("gen_call") == 0.09
+    assert tracker.hedge_delay("eth_chainId") is None
+
+
+def slow_first_of(server, after, delay):
+    default = server.handler
+    lock = threading.Lock()
+    count = [0]
+
+    def handler(payload):
+        with lock:
+            count[0] += 1
+            slow = count[0] == after + 1
+        if slow:
+            time.sleep(delay)
+        return default(payload)
+
+    server.handler = handler
+
+
+def test_hedges_slow_requests(rpc_server):
+    default = rpc_server.handler
+
+    def handler(payload):
+        if len(rpc_server.requests) == 6:
+            # the first attempt of the last call is slow and then fails
+            time.sleep(0.3)
+            return 500, b"overloaded"
+        return default(payload)
+
+    rpc_server.handler = handler
+    provider = GenLayerProvider(
+        rpc_server.url,
+        retry=dataclasses.replace(RETRY, hedge=True, hedge_min_samples=5),
+    )
+    for _ in range(5):
+        provider.make_request("gen_call", [{}])
+    assert provider.make_request("gen_call", [{}])["result"] == "gen_call"
+    assert len(rpc_server.requests) == 7
+    # the hedged call is not taken as a usual latency
+    assert len(provider.retry.latencies._samples["gen_call"]) == 5
+    provider.close()
+
+
+def test_hedges_to_another_endpoint(rpc_servers):
+    first, second = rpc_servers(), rpc_servers()
+    for server in (first, second):
+        server.handler = lambda p, d=server.handler: (time.sleep(0.3), d(p))[1]
+    provider = MultiEndpointProvider(
+        [first.url, second.url],
+        retry=dataclasses.replace(RETRY, hedge=True, hedge_min_samples=1),
+    )
+    provider.retry.latencies.record("gen_call", 0.01)
+    start = time.monotonic()
+    provider.make_request("gen_call", [{}])
+    assert time.monotonic() - start < 0.5
+    # the hedge went to the endpoint the first request did not use
+    assert len(first.requests) == 1 and len(second.requests) == 1
+    provider.close()
+
+
+def test_async_retries_and_hedges(rpc_server):
+    flaky(rpc_server, 1)
+
+    async def run():
+        provider = AsyncGenLayerProvider(
+            rpc_server.url,
+            retry=dataclasses.replace(RETRY, hedge=True, hedge_min_samples=3),
+        )
+        try:
+            for _ in range(3):
+                await provider.make_request("gen_call", [{}])
+            assert len(rpc_server.requests) == 4
+            slow_first_of(rpc_server, after=0, delay=1.0)
+            start = time.monotonic()
+            await provider.make_request("gen_call", [{}])
+            assert time.monotonic() - start < 0.5
+        finally:
+            await provider.disconnect()
+
+    asyncio.run(run())
+
+
+def test_cancelled_hedges_are_not_endpoint_failures(rpc_servers):
+    slow, fast = rpc_servers(), rpc_servers()
+    slow.handler = lambda p, d=slow.handler: (time.sleep(0.3), d(p))[1]
+
+    async def run():
+        provider = AsyncMultiEndpointProvider(
+            [slow.url, fast.url],
+            retry=dataclasses.replace(RETRY, hedge=True, hedge_min_samples=1),
+        )
+        provider.retry.latencies.record("gen_call", 0.01)
+        try:
+            for _ in range(10):
+                await provider.make_request("gen_call", [{}])
+        finally:
+            await provider.disconnect()
+        return provider.router.endpoints
+
+    endpoints = asyncio.run(run())
+    assert slow.requests
+    assert all(e.healthy and e.error_rate == 0 for e in endpoints)
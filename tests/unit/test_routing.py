@@ -0,0 +1,134 @@
+import dataclasses
+import socket
+import time
+import pytest
+from genlayer_py.config.provider import routing_config
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.provider import MultiEndpointProvider
+from genlayer_py.provider.routing import EndpointRouter, sticky_key
+
+
+def closed_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+ROUTING = dataclasses.replace(
+    routing_config, failure_threshold=2, cooldown=30.0, latency_smoothing=0.5
+)
+
+
+def test_spreads_requests_and_prefers_fast_endpoints(rpc_servers):
+    fast, slow = rpc_servers(), rpc_servers()
+    default = slow.handler
+
+    def slow_handler(payload):
+        time.sleep(0.02)
+        return default(payload)
+
+    slow.handler = slow_handler
+    provider = MultiEndpointProvider([fast.url, slow.url], routing=ROUTING)
+    for _ in range(60):
+        assert provider.make_request("eth_chainId", [])["result"] == "eth_chainId"
+    assert len(slow.requests) >= 1
+    assert len(fast.requests) > 2 * len(slow.requests)
+
+
+def test_failover_and_circuit_breaker(rpc_server):
+    now = [0.0]
+    down = closed_url()
+    provider = MultiEndpointProvider([down, rpc_server.url], routing=ROUTING)
+    provider.router._clock = lambda: now[0]
+    for _ in range(10):
+        provider.make_request("eth_chainId", [])
+    endpoints = {e.url: e for e in provider.router.endpoints}
+    assert not endpoints[down].healthy
+    assert endpoints[down].failures == 2
+    assert len(rpc_server.requests) == 10
+
+    now[0] = 31.0
+    assert provider.router.select() is endpoints[down]
+    assert provider.router.select() is endpoints[rpc_server.url]
+    provider.router.record_success(endpoints[down], 0.01)
+    assert endpoints[down].healthy
+
+
+def test_interrupted_probe_is_not_a_failure(rpc_server):
+    now = [0.0]
+    down = closed_url()
+    provider = MultiEndpointProvider([down, rpc_server.url], routing=ROUTING)
+    provider.router._clock = lambda: now[0]
+    for _ in range(4):
+        provider.make_request("eth_chainId", [])
+    endpoint = next(e for e in provider.router.endpoints if e.url == down)
+    assert not endpoint.healthy
+
+    def interrupt(_):
+        raise KeyboardInterrupt
+
+    now[0] = 31.0
+    with pytest.raises(KeyboardInterrupt):
+        provider._route(["eth_chainId"], None, interrupt, [])
+    assert not endpoint.probing
+    assert endpoint.failures == 2
+    assert provider.router.select() is endpoint
+
+
+def test_all_endpoints_failing():
+    provider = MultiEndpointProvider([closed_url(), closed_url()])
+    with pytest.raises(GenLayerError, match="all RPC endpoints failed"):
+        provider.make_request("eth_chainId", [])
+
+
+def test_writes_do_not_fail_over(rpc_servers):
+    servers = [rpc_servers(), rpc_servers()]
+    for server in servers:
+        server.handler = lambda payload: (503, "unavailable")
+    provider = MultiEndpointProvider(
+        [s.url for s in servers],
+        routing=dataclasses.replace(ROUTING, failure_threshold=10),
+    )
+    for _ in range(4):
+        with pytest.raises(GenLayerError, match="unavailable"):
+            provider.make_request("sim_fundAccount", ["0xabc", 1])
+    # each write may have been executed, it reached a single endpoint
+    assert sum(len(s.requests) for s in servers) == 4
+    # reads do
+    with pytest.raises(GenLayerError, match="all RPC endpoints failed"):
+        provider.make_request("eth_chainId", [])
+    assert all(any(r["method"] == "eth_chainId" for r in s.requests) for s in servers)
+
+
+def test_nonce_sensitive_calls_are_sticky(rpc_servers):
+    servers = [rpc_servers() for _ in range(3)]
+    provider = MultiEndpointProvider([s.url for s in servers], routing=ROUTING)
+    for _ in range(20):
+        provider.make_request("eth_getTransactionCount", ["0xAbC", "pending"])
+        provider.make_request("eth_estimateGas", [{"from": "0xabc"}])
+    assert sorted(len(s.requests) for s in servers) == [0, 0, 40]
+
+
+def test_sticky_key():
+    from eth_account import Account
+
+    account = Account.create()
+    tx = account.sign_transaction(
+        {"to": account.address, "nonce": 0, "gas": 21000, "gasPrice": 1, "value": 0}
+    )
+    raw = tx.raw_transaction.hex()
+    assert sticky_key("eth_sendRawTransaction", [raw]) == account.address.lower()
+    assert sticky_key("eth_getTransactionCount", ["0xAB"]) == "0xab"
+    assert sticky_key("eth_blockNumber", []) is None
+    assert sticky_key("eth_sendRawTransaction", ["0x00"]) is None
+    with pytest.raises(GenLayerError):
+        EndpointRouter([])
+
+
+def test_client_uses_every_configured_endpoint(chain_at):
+    from genlayer_py.client import AsyncGenLayerClient, GenLayerClient
+    from genlayer_py.provider import AsyncMultiEndpointProvider
+
+    chain = chain_at("http://127.0.0.1:1", "http://127.0.0.1:2")
+    assert isinstance(GenLayerClient(chain).provider, MultiEndpointProvider)
+    assert isinstance(AsyncGenLayerClient(chain).provider, AsyncMultiEndpointProvider)
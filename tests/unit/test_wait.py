@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.transactions import actions, async_actions
+from genlayer_py.transactions.polling import AsyncClock, Clock
+from genlayer_py.types import TransactionStatus
+
+
+class FakeClock(Clock):
+    def __init__(self):
+        self.time = 0.0
+        self.sleeps = []
+
+    def now(self):
+        return self.time
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.time += seconds
+
+
+class FakeAsyncClock(FakeClock, AsyncClock):
+    async def sleep(self, seconds):
+        FakeClock.sleep(self, seconds)
+
+
+class FakeClient:
+    """
+    Answers get_transaction with the status of ``timeline`` at the time of
+    ``clock``, ``timeline`` being ``(since, status)`` pairs.
+    """
+
+    provider = None
+
+    def __init__(self, clock, timeline):
+        self.clock = clock
+        self.timeline = timeline
+        self.polls = 0
+
+    def get_transaction(self, transaction_hash):
+        self.polls += 1
+        status = [s for since, s in self.timeline if since <= self.clock.time][-1]
+        return {"hash": transaction_hash, "status": status}
+
+
+class FakeAsyncClient(FakeClient):
+    async def get_transaction(self, transaction_hash):
+        return FakeClient.get_transaction(self, transaction_hash)
+
+
+def test_polls_fast_then_backs_off_up_to_interval():
+    clock = FakeClock()
+    client = FakeClient(clock, [(0, "1"), (0.2, "3"), (20, "5")])
+    changes = []
+    receipt = actions.wait_for_transaction_receipt(
+        client, "0xab", on_status=lambda tx: changes.append(tx["status"]), clock=clock
+    )
+    assert receipt["status"] == "5"
+    assert clock.sleeps[0] == pytest.approx(0.05)
+    assert clock.sleeps[1] == pytest.approx(0.075)
+    assert max(clock.sleeps) == pytest.approx(3.0)
+    # confirmed within one capped interval of the status change
+    assert 20 <= clock.time < 23
+    assert changes == ["1", "3", "5"]
+    assert client.polls == len(clock.sleeps) + 1
+
+
+def test_times_out_on_the_deadline():
+    clock = FakeClock()
+    client = FakeClient(clock, [(0, "1")])
+    with pytest.raises(GenLayerError, match="after 10"):
+        actions.wait_for_transaction_receipt(
+            client, "0xab", status=TransactionStatus.FINALIZED, timeout=10, clock=clock
+        )
+    assert clock.time == pytest.approx(10)
+
+
+def test_default_timeout_is_interval_times_retries():
+    clock = FakeClock()
+    client = FakeClient(clock, [(0, "1")])
+    with pytest.raises(GenLayerError):
+        actions.wait_for_transaction_receipt(
+            client, "0xab", interval=100, retries=5, clock=clock
+        )
+    assert clock.time == pytest.approx(0.5)
+    assert max(clock.sleeps) <= 0.1
+
+
+def test_async_wait():
+    clock = FakeAsyncClock()
+    client = FakeAsyncClient(clock, [(0, "1"), (1, "7")])
+    receipt = asyncio.run(
+        async_actions.wait_for_transaction_receipt(client, "0xab", clock=clock)
+    )
+    assert receipt["status"] == "7"
+    assert 1 <= clock.time < 2
@@ -0,0 +1,182 @@
+import time
+import pytest
+from genlayer_py.chains import localnet
+from genlayer_py.exceptions import GenLayerError
+from genlayer_py.transactions.events import consensus_event_topics
+from genlayer_py.transactions.watcher import LogTransactionWatcher, TransactionWatcher
+from genlayer_py.types import TransactionStatus
+
+
+def serve_statuses(server, statuses):
+    """
+    Answers eth_getTransactionByHash with the next status of ``statuses``
+    for the hash, staying on the last one, or None for unknown hashes.
+    """
+    polls = {}
+
+    def handler(payload):
+        tx_hash = payload["params"][0]
+        result = None
+        if tx_hash in statuses:
+            index = min(polls.get(tx_hash, 0), len(statuses[tx_hash]) - 1)
+            polls[tx_hash] = polls.get(tx_hash, 0) + 1
+            result = {"hash": tx_hash, "status": statuses[tx_hash][index]}
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": result}
+
+    server.handler = handler
+    return polls
+
+
+def tx(i):
+    return "0x" + f"{i:064x}"
+
+
+def test_futures_resolve_at_their_own_status(rpc_server, localnet_client):
+    statuses = {
+        tx(i): ["PENDING", "PROPOSING", "ACCEPTED", "FINALIZED"] for i in range(50)
+    }
+    polls = serve_statuses(rpc_server, statuses)
+    client = localnet_client(rpc_server)
+    with TransactionWatcher(
+        client, batch_size=20, interval=20, batch_rate=1000
+    ) as watcher:
+        accepted = watcher.watch_many([tx(i) for i in range(25)])
+        finalized = watcher.watch_many(
+            [tx(i) for i in range(25, 50)], status=TransactionStatus.FINALIZED
+        )
+        assert all(f.result(5)["status_name"] == "ACCEPTED" for f in accepted)
+        assert all(f.result(5)["status_name"] == "FINALIZED" for f in finalized)
+    assert all(polls[tx(i)] == 3 for i in range(25))
+    assert all(polls[tx(i)] == 4 for i in range(25, 50))
+    # polled in batches, a request each
+    assert rpc_server.batches
+    assert max(len(batch) for batch in rpc_server.batches) == 20
+    assert len(rpc_server.requests) == sum(len(b) for b in rpc_server.batches)
+
+
+def test_errors_and_timeouts_fail_their_future_only(rpc_server, localnet_client):
+    serve_statuses(rpc_server, {tx(1): ["PENDING"], tx(2): ["PENDING", "ACCEPTED"]})
+    client = localnet_client(rpc_server)
+    with TransactionWatcher(client, interval=20) as watcher:
+        missing = watcher.watch(tx(0))
+        stuck = watcher.watch(tx(1), timeout=0.2)
+        changes = []
+        done = watcher.watch(tx(2), on_status=lambda t: changes.append(t["status"]))
+        with pytest.raises(GenLayerError, match="not found"):
+            missing.result(5)
+        with pytest.raises(GenLayerError, match="not finalized after 0.2s"):
+            stuck.result(5)
+        assert done.result(5)["status_name"] == "ACCEPTED"
+        assert changes == [1, 5]
+
+
+def test_batches_are_paced(rpc_server, localnet_client):
+    serve_statuses(rpc_server, {tx(i): ["ACCEPTED"] for i in range(10)})
+    default = rpc_server.handler
+    sent = []
+
+    def handler(payload):
+        sent.append(time.monotonic())
+        return default(payload)
+
+    rpc_server.handler = handler
+    client = localnet_client(rpc_server)
+    with TransactionWatcher(client, batch_size=2, batch_rate=20) as watcher:
+        for future in watcher.watch_many([tx(i) for i in range(10)]):
+            assert future.result(5)["status_name"] == "ACCEPTED"
+    # five batches of two, at least 50ms apart
+    starts = sent[::2]
+    assert len(starts) == 5
+    assert all(b - a >= 0.045 for a, b in zip(starts, starts[1:]))
+
+
+def test_close_cancels_pending_futures(rpc_server, localnet_client):
+    serve_statuses(rpc_server, {tx(1): ["PENDING"]})
+    client = localnet_client(rpc_server)
+    watcher = client.transaction_watcher()
+    assert watcher is client.transaction_watcher()
+    (future,) = client.watch_transactions([tx(1)])
+    watcher.close()
+    assert future.cancelled()
+    with pytest.raises(GenLayerError):
+        watcher.watch(tx(1))
+
+
+class Chain:
+    """
+    Blocks advance on each eth_blockNumber; transaction i is accepted in
+    block ``accepted[i]`` and announced by a TransactionAccepted log.
+    """
+
+    def __init__(self, accepted, cancelled=()):
+        topics = consensus_event_topics(localnet.consensus_main_contract["abi"])
+        self.topic = {status: topic for topic, status in topics.items()}
+        self.accepted = accepted
+        self.cancelled = set(cancelled)
+        self.block = 1
+        self.fetches = {}
+        self.scans = []
+
+    def handler(self, payload):
+        method, params = payload["method"], payload["params"]
+        if method == "eth_blockNumber":
+            self.block += 1
+            result = hex(self.block)
+        elif method == "eth_getLogs":
+            start, end = int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16)
+            self.scans.append((start, end))
+            result = []
+            for tx_id, block in self.accepted.items():
+                if start <= block <= end:
+                    status = (
+                        TransactionStatus.CANCELED
+                        if tx_id in self.cancelled
+                        else TransactionStatus.ACCEPTED
+                    )
+                    result.append({"topics": [self.topic[status], tx_id]})
+        else:
+            tx_id = params[0]
+            self.fetches[tx_id] = self.fetches.get(tx_id, 0) + 1
+            status = "PENDING"
+            if self.block >= self.accepted[tx_id]:
+                status = "CANCELED" if tx_id in self.cancelled else "ACCEPTED"
+            result = {"hash": tx_id, "status": status}
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": result}
+
+
+def test_logs_confirm_transactions(rpc_server, localnet_client):
+    accepted = {tx(i): 4 + i % 5 for i in range(30)}
+    accepted[tx(99)] = 0
+    chain = Chain(accepted, cancelled=[tx(7)])
+    rpc_server.handler = chain.handler
+    client = localnet_client(rpc_server)
+    with LogTransactionWatcher(
+        client, interval=20, block_range=2, batch_rate=1000
+    ) as watcher:
+        futures = watcher.watch_many(accepted)
+        for tx_id, future in zip(accepted, futures):
+            if tx_id == tx(7):
+                with pytest.raises(GenLayerError, match="cancelled"):
+                    future.result(5)
+            else:
+                assert future.result(5)["status_name"] == "ACCEPTED"
+    # fetched when watched and once its event is seen, never polled
+    assert chain.fetches[tx(99)] == 1
+    assert chain.fetches[tx(7)] == 1
+    assert all(chain.fetches[tx(i)] == 2 for i in range(30) if i != 7)
+    # block ranges are scanned once each, in order, at most 2 blocks a query
+    assert all(end - start < 2 for start, end in chain.scans)
+    assert all(b[0] == a[1] + 1 for a, b in zip(chain.scans, chain.scans[1:]))
+
+
+def test_logs_scan_from_the_head_after_an_idle_gap(rpc_server, localnet_client):
+    chain = Chain({tx(1): 4, tx(2): 100_004})
+    rpc_server.handler = chain.handler
+    client = localnet_client(rpc_server)
+    with LogTransactionWatcher(client, interval=20, block_range=2) as watcher:
+        assert watcher.watch(tx(1)).result(5)["status_name"] == "ACCEPTED"
+        scans = len(chain.scans)
+        # nothing is watched while the chain moves on
+        chain.block = 100_000
+        assert watcher.watch(tx(2)).result(5)["status_name"] == "ACCEPTED"
+    assert all(start > 100_000 for start, _ in chain.scans[scans:])
@@ -0,0 +1,210 @@
+import json
+import threading
+import time
+import pytest
+from genlayer_py.chains import localnet
+from genlayer_py.exceptions import GenLayerError, RpcTransportError
+from genlayer_py.provider import ResponseCache, WebSocketProvider
+from genlayer_py.transactions.events import ConsensusEvents, consensus_event_topics
+from genlayer_py.types import TransactionStatus
+
+TX_ID = "0x" + "ab" * 32
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def topic_of(status):
+    topics = consensus_event_topics(localnet.consensus_main_contract["abi"])
+    return next(topic for topic, s in topics.items() if s == status)
+
+
+def test_requests_and_batches(ws_server):
+    provider = WebSocketProvider(ws_server.url)
+    assert provider.make_request("eth_chainId", [])["result"] == "eth_chainId"
+    batch = provider.make_batch_request([("a", []), ("b", [])])
+    assert [r["result"] for r in batch] == ["a", "b"]
+    provider.close()
+
+
+def test_concurrent_requests_share_the_connection(ws_server):
+    provider = WebSocketProvider(ws_server.url)
+    results = []
+
+    def work(i):
+        results.append(provider.make_request("eth_call", [i])["id"])
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(results)) == 20
+    assert len(ws_server.connections) == 1
+    provider.close()
+
+
+def test_subscriptions_survive_reconnection(ws_server):
+    provider = WebSocketProvider(ws_server.url)
+    received = []
+    reconnected = threading.Event()
+    provider.subscribe(["logs", {}], received.append, reconnected.set)
+    ws_server.push({"n": 1})
+    wait_until(lambda: received == [{"n": 1}])
+
+    ws_server.drop()
+    assert reconnected.wait(5)
+    ws_server.push({"n": 2})
+    wait_until(lambda: received == [{"n": 1}, {"n": 2}])
+    assert len(ws_server.subscriptions) == 1
+    provider.close()
+
+
+def test_connection_lost_right_after_subscribing_again(ws_server, monkeypatch):
+    provider = WebSocketProvider(ws_server.url)
+    subscribe = provider._subscribe
+    calls = []
+
+    def subscribe_then_drop(subscription):
+        subscribe(subscription)
+        calls.append(subscription)
+        if len(calls) == 2:
+            # the new connection goes away before the resubscription ends
+            ws_server.drop()
+            wait_until(lambda: provider._drops == 2)
+
+    monkeypatch.setattr(provider, "_subscribe", subscribe_then_drop)
+    received = []
+    reconnected = threading.Event()
+    provider.subscribe(["logs", {}], received.append, reconnected.set)
+    ws_server.drop()
+    assert reconnected.wait(5)
+    assert len(calls) == 3
+    ws_server.push({"n": 1})
+    wait_until(lambda: received == [{"n": 1}])
+    provider.close()
+
+
+def test_subscriptions_not_restored_still_reconnect(ws_server, monkeypatch, caplog):
+    provider = WebSocketProvider(ws_server.url)
+    reconnected = threading.Event()
+    provider.subscribe(["logs", {}], lambda result: None, reconnected.set)
+
+    def refuse(subscription):
+        raise GenLayerError("eth_subscribe failed: unsupported")
+
+    monkeypatch.setattr(provider, "_subscribe", refuse)
+    ws_server.drop()
+    # callers are told to catch up, and the loss is logged as an error
+    assert reconnected.wait(5)
+    assert any(
+        r.levelname == "ERROR" and "not restored" in r.getMessage()
+        for r in caplog.records
+    )
+    provider.close()
+
+
+def test_unsubscribe(ws_server):
+    provider = WebSocketProvider(ws_server.url)
+    received = []
+    subscription = provider.subscribe(["logs", {}], received.append)
+    provider.unsubscribe(subscription)
+    assert ws_server.subscriptions == {}
+    provider.close()
+
+
+def test_lost_connection_fails_pending_requests(ws_server):
+    def slow(payload):
+        time.sleep(0.3)
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": None}
+
+    ws_server.handler = slow
+    provider = WebSocketProvider(ws_server.url)
+    provider.make_request("eth_chainId", [])
+    threading.Timer(0.1, ws_server.drop).start()
+    with pytest.raises(RpcTransportError):
+        provider.make_request("eth_sendRawTransaction", ["0x00"])
+    provider.close()
+
+
+def test_cache(ws_server, localnet_client):
+    client = localnet_client(ws_server, cache=ResponseCache())
+    for _ in range(3):
+        client.provider.make_request("eth_chainId", [])
+    client.provider.make_batch_request([("eth_chainId", []), ("eth_blockNumber", [])])
+    assert [r["method"] for r in ws_server.requests] == [
+        "eth_chainId",
+        "eth_blockNumber",
+    ]
+    client.initialize_consensus_smart_contract(force_reset=True)
+    client.initialize_consensus_smart_contract(force_reset=True)
+    assert len(ws_server.requests) == 4
+    client.provider.close()
+
+
+def test_wait_for_transaction_receipt_is_woken_by_events(ws_server, localnet_client):
+    status = ["PENDING"]
+
+    def handler(payload):
+        result = {"hash": payload["params"][0], "status": status[0]}
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": result}
+
+    ws_server.handler = handler
+    client = localnet_client(ws_server)
+    assert isinstance(client.provider, WebSocketProvider)
+
+    def finalize():
+        wait_until(lambda: len(ws_server.subscriptions) == 1)
+        # an event about another transaction does not wake the waiter
+        ws_server.push({"topics": [topic_of("ACCEPTED"), "0x" + "cd" * 32]})
+        time.sleep(0.1)
+        status[0] = "ACCEPTED"
+        ws_server.push({"topics": [topic_of("ACCEPTED"), TX_ID.upper()[2:]]})
+        ws_server.push({"topics": [topic_of("ACCEPTED"), TX_ID]})
+
+    threading.Thread(target=finalize).start()
+    start = time.monotonic()
+    receipt = client.wait_for_transaction_receipt(
+        TX_ID, status=TransactionStatus.ACCEPTED
+    )
+    assert time.monotonic() - start < 2
+    assert receipt["status_name"] == TransactionStatus.ACCEPTED
+    fetches = [r for r in ws_server.requests if r["method"] != "eth_subscribe"]
+    assert len(fetches) == 2
+    client.provider.close()
+
+
+def test_events_delivered_before_the_subscription_id(ws_server):
+    answer = ws_server._answer
+
+    def answer_after_a_log(connection, payload):
+        response = answer(connection, payload)
+        if payload["method"] == "eth_subscribe":
+            # the log goes out before the subscription id is known
+            notification = {
+                "jsonrpc": "2.0",
+                "method": "eth_subscription",
+                "params": {
+                    "subscription": response["result"],
+                    "result": {"topics": [topic_of("ACCEPTED"), TX_ID]},
+                },
+            }
+            connection.send(json.dumps(notification))
+        return response
+
+    ws_server._answer = answer_after_a_log
+    provider = WebSocketProvider(ws_server.url)
+    events = ConsensusEvents(provider, localnet.consensus_main_contract)
+    watched = []
+    thread = threading.Thread(
+        target=lambda: watched.append(events.watch(TX_ID)), daemon=True
+    )
+    thread.start()
+    thread.join(5)
+    assert watched, "watch deadlocked on an early notification"
+    events.stop()
+    provider.close()